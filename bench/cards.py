@@ -0,0 +1,110 @@
+"""
+Card rendering benchmark for e-bot.
+
+Measures how many `CardPyramid` renders, as done for every prompt in
+`RideTheBus`, and how many hand renders can be done per second. "pyramid" renders
+pyramids repeatedly at a fixed position, "pyramid walk" renders a new pyramid at
+every position as it is uncovered.
+
+Also measures how many Ride the Bus hands per second can be judged, and have the
+odds of every answer computed.
+
+Run from the repository root with
+```
+python bench/cards.py
+```
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=import-error,wrong-import-position
+from games import busengine  # noqa: E402
+from games.ridethebus import CardPyramid  # noqa: E402
+from utils.frenchdeck import FrenchDeck  # noqa: E402
+
+
+def _pyramids(count: int) -> list:
+    """Pyramids in every reachable state, so that all code paths are rendered."""
+    random.seed(0)
+    pyramids = []
+    while len(pyramids) < count:
+        pyramid = CardPyramid(FrenchDeck())
+        steps = random.randint(0, 9)
+        for _ in range(steps):
+            pyramid.advance()
+        pyramids.append(pyramid)
+    return pyramids
+
+
+def rate(func, seconds: float) -> float:
+    """Calls of `func` per second, over roughly `seconds` of wall time."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=max(1, int(seconds / 0.2)), number=number))
+    return number / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=2.0, help="time per case")
+    args = parser.parse_args()
+
+    pyramids = _pyramids(100)
+    deck = FrenchDeck()
+    hand = [deck.deal() for _ in range(4)]
+
+    def walk():
+        # a new pyramid rendered at every position, as in a game of Ride the Bus
+        pyramid = CardPyramid(deck)
+        renders = [str(pyramid)]
+        while pyramid.advance():
+            renders.append(str(pyramid))
+        return renders
+
+    random.seed(1)
+    hands = [random.sample(range(52), random.randint(2, 4)) for _ in range(100)]
+
+    def all_odds():
+        # uncached, as for hands not seen before
+        return [
+            busengine._odds.__wrapped__(question, tuple(hand))
+            for hand in hands
+            for question in busengine.QUESTIONS
+        ]
+
+    cards = [hand[-1] for hand in hands]
+
+    def judge():
+        return [
+            busengine.judge_batch(question, ["red"] * len(hands), hands, cards)
+            for question in busengine.QUESTIONS
+        ]
+
+    # name -> (function, renders per call)
+    cases = {
+        "pyramid": (lambda: [str(p) for p in pyramids], len(pyramids)),
+        "pyramid sparse": (lambda: [p.sparse() for p in pyramids], len(pyramids)),
+        "pyramid walk": (walk, 10),
+        "hand of 4": (lambda: [FrenchDeck.to_string(*hand) for _ in range(100)], 100),
+    }
+    for name, (func, renders) in cases.items():
+        print(f"{name:16s} {rate(func, args.seconds) * renders:12,.0f} renders/s")
+
+    # name -> (function, hands per call)
+    cases = {
+        "odds": (all_odds, len(hands) * len(busengine.QUESTIONS)),
+        "judge": (judge, len(hands) * len(busengine.QUESTIONS)),
+    }
+    for name, (func, count) in cases.items():
+        print(f"{name:16s} {rate(func, args.seconds) * count:12,.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Memory benchmark of the client caches of e-bot, per 1000 guilds.
+
+For each cache profile, a fresh interpreter creates the bot and feeds its
+connection state synthetic `GUILD_CREATE` and `MESSAGE_CREATE` payloads, as the
+gateway would send them for the profile's intents, then reports the growth in
+resident set size (RSS). No connection to discord is made.
+
+Profiles:
+    - `default`: default intents plus message content, and default caches
+    - `low_memory`: :func:`ebot.low_memory_options`
+
+Run from the repository root with
+```
+python bench/memory.py --guilds 1000
+```
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+
+PROFILES = {"default": False, "low_memory": True}
+
+_MEASURE = """
+import sys, gc, json, os
+sys.path.insert(0, {src!r})
+import discord
+import ebot
+
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * PAGE
+
+CHANNELS, ROLES, EMOJIS, STICKERS, VOICE, MESSAGES, AUTHORS = (
+    {channels}, 15, 40, 5, 3, {messages}, 25
+)
+JOINED = "2020-01-01T00:00:00+00:00"
+
+def user(uid):
+    return {{"id": str(uid), "username": f"user{{uid}}", "discriminator": "0",
+             "avatar": None, "global_name": None}}
+
+def member(uid):
+    return {{"user": user(uid), "roles": [], "joined_at": JOINED, "deaf": False,
+             "mute": False, "flags": 0}}
+
+def guild(i, intents):
+    gid = (i + 1) << 22
+    users = [gid + 10_000 + a for a in range(AUTHORS)]
+    voice = [
+        {{"user_id": str(u), "channel_id": str(gid + 1), "session_id": "s",
+          "deaf": False, "mute": False, "self_deaf": False, "self_mute": False,
+          "self_video": False, "suppress": False, "member": member(u)}}
+        for u in users[:VOICE]
+    ] if intents.voice_states else []
+    return {{
+        "id": str(gid), "name": f"guild{{i}}", "owner_id": str(users[0]),
+        "member_count": 100, "large": False, "features": [], "threads": [],
+        "presences": [],
+        "roles": [
+            {{"id": str(gid + r), "name": f"role{{r}}", "permissions": "0",
+              "position": r, "color": 0, "hoist": False, "managed": False,
+              "mentionable": False}}
+            for r in range(ROLES)
+        ],
+        "channels": [
+            {{"id": str(gid + 100 + c), "type": 0, "name": f"channel-{{c}}",
+              "position": c, "permission_overwrites": [], "topic": None}}
+            for c in range(CHANNELS)
+        ],
+        "emojis": [
+            {{"id": str(gid + 1000 + e), "name": f"emoji{{e}}", "roles": [],
+              "require_colons": True, "managed": False, "animated": False,
+              "available": True}}
+            for e in range(EMOJIS)
+        ],
+        "stickers": [
+            {{"id": str(gid + 2000 + s), "name": f"sticker{{s}}", "description": "",
+              "tags": "x", "type": 2, "format_type": 1, "available": True,
+              "guild_id": str(gid)}}
+            for s in range(STICKERS)
+        ],
+        "voice_states": voice,
+        "members": [member(1)] + [v["member"] for v in voice],
+    }}, users
+
+def message(gid, n, author):
+    return {{
+        "id": str(gid + 100_000 + n), "channel_id": str(gid + 100 + n % CHANNELS),
+        "guild_id": str(gid), "author": user(author),
+        "member": {{k: v for k, v in member(author).items() if k != "user"}},
+        "content": "an average sort of message, of a few words " * 2,
+        "timestamp": JOINED, "edited_timestamp": None, "tts": False,
+        "mention_everyone": False, "mentions": [], "mention_roles": [],
+        "attachments": [], "embeds": [], "pinned": False, "type": 0,
+    }}
+
+bot = ebot.EBot([], low_memory={low_memory})
+state = bot._connection
+state.dispatch = lambda *args, **kwargs: None
+state.user = discord.ClientUser(state=state, data=user(1))
+
+gc.collect()
+before = rss()
+for i in range({guilds}):
+    data, users = guild(i, state._intents)
+    state.parse_guild_create(data)
+    for n in range(MESSAGES):
+        state.parse_message_create(message(int(data["id"]), n, users[n % AUTHORS]))
+gc.collect()
+after = rss()
+
+print(json.dumps({{
+    "rss": after - before,
+    "guilds": len(state._guilds),
+    "users": len(state._users),
+    "members": sum(len(g._members) for g in state._guilds.values()),
+    "messages": len(state._messages or ()),
+    "emojis": len(state._emojis),
+}}))
+"""
+
+
+def measure(low_memory: bool, guilds: int, channels: int, messages: int) -> dict:
+    snippet = _MEASURE.format(
+        src=SRC,
+        low_memory=low_memory,
+        guilds=guilds,
+        channels=channels,
+        messages=messages,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", snippet],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().split("\n")[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--guilds", type=int, default=1000, help="guilds to create")
+    parser.add_argument("--channels", type=int, default=30, help="channels per guild")
+    parser.add_argument("--messages", type=int, default=50, help="messages per guild")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {
+        name: measure(low_memory, args.guilds, args.channels, args.messages)
+        for name, low_memory in PROFILES.items()
+    }
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(
+        f"{args.guilds} guilds, {args.channels} channels and {args.messages}"
+        " messages each"
+    )
+    for name, r in results.items():
+        per_thousand = r["rss"] / r["guilds"] * 1000 / 2**20
+        print(
+            f"  {name:12s} {per_thousand:8.1f}MiB RSS per 1000 guilds"
+            f"  ({r['users']} users, {r['members']} members,"
+            f" {r['messages']} messages, {r['emojis']} emojis cached)"
+        )
+    default, low = results["default"]["rss"], results["low_memory"]["rss"]
+    if default:
+        print(f"\nlow_memory saves {(default - low) / default * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
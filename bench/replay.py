@@ -0,0 +1,59 @@
+"""
+Replays a logged game session headlessly, at full speed.
+
+Game sessions are logged to `data/sessions/<session id>.jsonl`. The replay checks
+that the game still makes the same choices for the same player inputs, and
+reports how long the game logic took without any waiting:
+```
+python bench/replay.py data/sessions/<session id>.jsonl [--profile]
+```
+Exits with status 1 if the replay diverges from the log.
+"""
+
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=import-error,wrong-import-position
+from abstracts.replay import replay  # noqa: E402
+from utils.eventlog import read_events  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("log", help="session log to replay")
+    parser.add_argument(
+        "--profile", action="store_true", help="print the top functions by time"
+    )
+    args = parser.parse_args()
+
+    events = read_events(args.log)
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    result = asyncio.run(replay(events))
+    if profiler:
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+    inputs = sum(1 for event in events if event["kind"] == "input")
+    print(
+        f"{result.game} session {result.session_id}: "
+        f"{len(result.events)} events, {inputs} inputs, "
+        f"replayed in {result.seconds * 1000:.1f} ms"
+    )
+    if result.divergence:
+        print(f"Diverged: {result.divergence}")
+        sys.exit(1)
+    print("Replay matches the log.")
+
+
+if __name__ == "__main__":
+    main()
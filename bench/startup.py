@@ -0,0 +1,206 @@
+"""
+Startup and import-time benchmarks for e-bot.
+
+Measures, each in a fresh interpreter so that nothing is already cached in
+`sys.modules`:
+    - import time and memory of `discord`, and on top of that of `ebot`,
+      `cogs.*`, `games.*`, `interactive.*` and `utils.lookups`
+    - time spent in each cog's `setup`, and the time for the bot to reach
+      `on_ready`, with the discord gateway replaced by a local stub
+
+Results are appended to `bench/results/startup.jsonl`, tagged with the version in
+`eversion`, so that regressions can be tracked across releases.
+
+Run from the repository root with
+```
+python bench/startup.py --repeat 5
+```
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "src")
+RESULTS = os.path.join(ROOT, "bench", "results", "startup.jsonl")
+
+sys.path.insert(0, SRC)
+
+# pylint: disable=import-error,wrong-import-position
+import eversion  # noqa: E402
+
+# imported before timing, so that each module is charged only for its own cost;
+# `discord` itself is benchmarked separately
+_PRELOAD = "import asyncio, discord, discord.ext.commands"
+
+# snippet run in a fresh interpreter to time a single import
+_IMPORT_TIME = """
+import sys, time, importlib, json
+sys.path.insert(0, {src!r})
+{preload}
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps(time.perf_counter() - start))
+"""
+
+# as above, but tracing allocations; kept separate as tracing distorts timings
+_IMPORT_MEMORY = """
+import sys, tracemalloc, importlib, json
+sys.path.insert(0, {src!r})
+{preload}
+tracemalloc.start()
+importlib.import_module({module!r})
+current, peak = tracemalloc.get_traced_memory()
+print(json.dumps([current, peak]))
+"""
+
+# time cog setup and startup to `on_ready`, with the gateway stubbed out
+_STARTUP = """
+import sys, time, asyncio, json
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import ebot
+
+class StubGatewayBot(ebot.EBot):
+    async def wait_until_ready(self):
+        ...
+
+    async def change_presence(self, **kwargs):
+        ...
+
+async def main():
+    bot = StubGatewayBot([])
+    await bot.setup_hook()
+    await bot.on_ready()
+    ready = time.perf_counter() - start
+    await bot.close()
+    return bot.cog_timings, ready
+
+cogs, ready = asyncio.run(main())
+print(json.dumps({{"cogs": cogs, "ready": ready}}))
+"""
+
+
+def _run(snippet: str, **kwargs):
+    out = subprocess.run(
+        [sys.executable, "-c", snippet.format(src=SRC, **kwargs)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().split("\n")[-1])
+
+
+def _modules() -> list:
+    """Modules to benchmark."""
+    modules = ["ebot", "interactive", "utils.lookups"]
+    for package in ["cogs", "games", "interactive"]:
+        for file in sorted(os.listdir(os.path.join(SRC, package))):
+            if file.endswith(".py") and file != "__init__.py":
+                modules.append(f"{package}.{file[:-3]}")
+    return modules
+
+
+def bench_imports(repeat: int) -> dict:
+    """Median import time (seconds) and traced memory (bytes) per module."""
+    results = {}
+    for module in ["discord", *_modules()]:
+        preload = "" if module == "discord" else _PRELOAD
+        times = [
+            _run(_IMPORT_TIME, module=module, preload=preload) for _ in range(repeat)
+        ]
+        current, peak = _run(_IMPORT_MEMORY, module=module, preload=preload)
+        results[module] = {
+            "seconds": statistics.median(times),
+            "memory": current,
+            "peak_memory": peak,
+        }
+    return results
+
+
+def bench_startup(repeat: int) -> dict:
+    """Median cog load time (seconds) per cog, and median time to `on_ready`."""
+    runs = [_run(_STARTUP) for _ in range(repeat)]
+    cogs = {
+        cog: statistics.median(run["cogs"][cog] for run in runs if cog in run["cogs"])
+        for cog in runs[0]["cogs"].keys()
+    }
+    return {"cogs": cogs, "ready": statistics.median(run["ready"] for run in runs)}
+
+
+def _version() -> str:
+    rc = f"-rc{eversion.RELEASE_CANDIDATE}" if eversion.RELEASE_CANDIDATE else ""
+    return f"{eversion.MAJOR_VERSION}.{eversion.MINOR_VERSION}.{eversion.PATCH_VERSION}{rc}"
+
+
+def _last_result():
+    if not os.path.exists(RESULTS):
+        return None
+    with open(RESULTS, "r") as f:
+        lines = [line for line in f.read().split("\n") if line]
+    return json.loads(lines[-1]) if lines else None
+
+
+def _delta(new: float, old) -> str:
+    if not old:
+        return ""
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+
+def report(result: dict, previous: dict):
+    prev_imports = previous["imports"] if previous else {}
+    prev_cogs = previous["startup"]["cogs"] if previous else {}
+
+    print(f"e-bot {result['version']} on Python {result['python']}")
+    print("\nImports:")
+    for module, r in sorted(result["imports"].items(), key=lambda i: -i[1]["seconds"]):
+        old = prev_imports.get(module, {}).get("seconds")
+        print(
+            f"  {module:32s} {r['seconds'] * 1000:8.1f}ms{_delta(r['seconds'], old):8s}"
+            f" {r['memory'] / 1024:8.0f}KiB"
+        )
+
+    print("\nCog load (import + setup):")
+    for cog, seconds in sorted(result["startup"]["cogs"].items(), key=lambda i: -i[1]):
+        print(
+            f"  {cog:32s} {seconds * 1000:8.1f}ms{_delta(seconds, prev_cogs.get(cog))}"
+        )
+
+    ready = result["startup"]["ready"]
+    old_ready = previous["startup"]["ready"] if previous else None
+    print(f"\nTime to ready: {ready * 1000:.1f}ms{_delta(ready, old_ready)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument(
+        "--no-save", action="store_true", help=f"don't append results to {RESULTS}"
+    )
+    args = parser.parse_args()
+
+    previous = _last_result()
+    result = {
+        "version": _version(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "imports": bench_imports(args.repeat),
+        "startup": bench_startup(args.repeat),
+    }
+    report(result, previous)
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(RESULTS), exist_ok=True)
+        with open(RESULTS, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,45 @@
 import os
 import json
 import logging
-import discord
 
-from ebot import EBot
+from ebot import EBot, ShardedEBot
+from utils.logs import setup_logging
+from utils.shards import parse_shard_ids
+
+
+def make_bot(admins: list) -> EBot:
+    """Bot configured by the environment: `SHARD_COUNT`, either `auto` or a number
+    of shards, runs a sharded bot, and `SHARD_IDS`, e.g. `0-3,6`, the shards this
+    process runs out of `SHARD_COUNT`. `LOW_MEMORY=1` trims the intents and caches,
+    see :func:`ebot.low_memory_options`."""
+    kwargs = {}
+    if "LOW_MEMORY" in os.environ:
+        kwargs["low_memory"] = os.environ["LOW_MEMORY"] not in ("", "0")
+
+    shard_count = os.environ.get("SHARD_COUNT", "")
+    if not shard_count:
+        return EBot(admins, **kwargs)
+    if shard_count == "auto":
+        return ShardedEBot(admins, **kwargs)
+
+    shard_ids = os.environ.get("SHARD_IDS", "")
+    return ShardedEBot(
+        admins,
+        **kwargs,
+        shard_count=int(shard_count),
+        shard_ids=parse_shard_ids(shard_ids) if shard_ids else None,
+    )
 
 
 if __name__ == "__main__":
-    discord.utils.setup_logging()
+    log_listener = setup_logging()
     logging.info("Starting ebot...")
 
     admins = json.loads(os.environ["ADMIN_USERS"])
     assert isinstance(admins, list)
-    bot = EBot(admins)
-    bot.run(os.environ["DISCORD_TOKEN"])
+    bot = make_bot(admins)
+    try:
+        # logging already configured, don't let discord.py replace the handlers
+        bot.run(os.environ["DISCORD_TOKEN"], log_handler=None)
+    finally:
+        log_listener.stop()
@@ -1,2 +1,12 @@
-from abstracts.egamefactory import EGameFactory
 from abstracts.guilddispatch import GuildDispatch
+from abstracts.lazyfactory import LazyFactory, command_choices
+
+
+def __getattr__(name):
+    # `EGameFactory` pulls in `interactive`, so only import it when a game needs it
+    # pylint: disable=import-outside-toplevel
+    if name == "EGameFactory":
+        from abstracts.egamefactory import EGameFactory
+
+        return EGameFactory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
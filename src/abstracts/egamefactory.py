@@ -2,22 +2,43 @@
 import logging
 import asyncio
 import os
+import random
+import uuid
 
-from typing import Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 
 from functools import wraps
 from itertools import count
 from collections import defaultdict
 
 import discord
-from discord.app_commands import Choice
 
-from utils import dmerge
+from utils import corpus, fileio, promptschedule
+from utils.channelindex import CHANNELS, ChannelNotFound
+from utils.eventlog import EventLog, normalize, session_path
+from utils.guildconfig import GUILD_CONFIG, SETTINGS
+from utils.leaderboard import LEADERBOARD, Leaderboard
 from utils.lookups import EMOJI_FORWARD
-
-from interactive import InteractionPipeline, ChoiceInteraction, GatherPlayersView
-
-from econfig import PATH_EXTENSION, SCRAPE_MAXIMUM
+from utils.logs import Payload
+from utils.metrics import METRICS
+from utils.scoretable import ScoreTable
+
+from abstracts.lazyfactory import command_choices
+from abstracts.replay import ReplayError, ReplayUser
+from interactive import (
+    InteractionPipeline,
+    ChoiceInteraction,
+    GatherPlayersView,
+    PipelineResult,
+)
+
+from econfig import (
+    PATH_EXTENSION,
+    PLAYER_GATHER_TIMEOUT,
+    SCRAPE_CONCURRENCY,
+    SCRAPE_MAXIMUM,
+    SCRAPE_PROGRESS_INTERVAL,
+)
 
 
 def replace_rules(content: str) -> str:
@@ -27,6 +48,13 @@ def replace_rules(content: str) -> str:
     )
 
 
+def _enumerate(items: List[str]) -> str:
+    """`items` as an English list, e.g. `a, b, and c`."""
+    if len(items) > 1:
+        items = [*items[:-1], f"and {items[-1]}"]
+    return ", ".join(items)
+
+
 class EGameFactory:
     """E Game Factory Superclass
 
@@ -35,17 +63,58 @@ class EGameFactory:
     """
 
     has_scrape = None
+    # label -> channel name, scraped into the `file_<label>` attribute
+    scrape_channels: Dict[str, str] = {}
+
+    # defaults of the settings guilds can change, see `configure`
+    response_timeout = 31
+    player_gather_timeout = PLAYER_GATHER_TIMEOUT
+    scrape_maximum = SCRAPE_MAXIMUM
+
+    # file path -> lock held while scraping into it
+    _scrape_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    # guild id -> limit on the channels scraped at once
+    _scrape_limits: Dict[int, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    )
 
-    def __init__(self, interaction: discord.Interaction, logger_name: str):
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        logger_name: str,
+        session_id: Optional[str] = None,
+    ):
         """
         `logger_name` should just be `__name__` of instancing module. Used
         only for logging purposes.
+
+        `session_id` identifies this game instance, e.g. in logs, and seeds
+        `self.rng`, which all random choices of the game must be drawn from. Pass
+        the id of a previous session to replay its random choices; a new id is
+        generated if not given.
         """
         self.logging = logging.getLogger(logger_name)
+        self.session_id = session_id if session_id else uuid.uuid4().hex
+        self.rng = random.Random(self.session_id)
 
         self.guild = interaction.guild
         self.channel: discord.TextChannel = interaction.channel
 
+        # settings of this guild, applied over the class defaults
+        self.configure(GUILD_CONFIG.overrides(self.guild.id))
+
+        # state transitions and player inputs, see `record` and `_input`
+        self.events = EventLog(session_path(self.session_id))
+        # logged inputs to use instead of asking the players, set when replaying
+        self.replay_inputs: Optional[Deque[dict]] = None
+        self.record(
+            "session",
+            game=f"{type(self).__module__}.{type(self).__name__}",
+            session_id=self.session_id,
+            guild_id=self.guild.id,
+            config=self.config,
+        )
+
         # players property
         self._players: Dict[int, discord.User] = {}  # index by id
         self._player_symbols: Dict[int, str] = {}  # id to emoji
@@ -59,8 +128,13 @@ class EGameFactory:
         # state
         self.state = {
             "running": False,
-            "scores": defaultdict(int),
-        }  # scores index pid -> score
+            "scores": ScoreTable(),
+        }  # scores index pid -> score, kept in rank order
+
+        # persistent scores, or `None` to not keep them, e.g. when replaying
+        self.leaderboard: Optional[Leaderboard] = LEADERBOARD
+        # scores since the last save to the leaderboard, see `_save_scores`
+        self._round_scores: Dict[int, int] = defaultdict(int)
 
         # adjust file locations
         for file_path in [attr for attr in dir(self) if attr.startswith("file_")]:
@@ -72,6 +146,26 @@ class EGameFactory:
                 ),
             )
 
+    def configure(self, overrides: Dict[str, int], live: bool = False):
+        """Apply a guild's overrides of :data:`utils.guildconfig.SETTINGS` that this
+        game has, as attributes; settings not overridden take the class default.
+
+        :param live: Only apply the settings that can change during a game.
+        """
+        self.config = overrides
+        game = type(self).__name__
+        for name, setting in SETTINGS.items():
+            if not hasattr(type(self), name) or (live and not setting.live):
+                continue
+            value = overrides.get(f"{game}.{name}", overrides.get(name, None))
+            setattr(self, name, getattr(type(self), name) if value is None else value)
+
+    def _prefetch_files(self):
+        """Start reading the scraped files in the background, so that they are
+        likely ready by the time :meth:`_read_file` is called."""
+        for file_path in [attr for attr in dir(self) if attr.startswith("file_")]:
+            fileio.prefetch(self.__getattribute__(file_path))
+
     def embed(
         self, text: str, colour: discord.Colour = discord.Colour.blue(), **kwargs
     ):
@@ -91,29 +185,97 @@ class EGameFactory:
 
     @classmethod
     def choices(cls):
-        command_names = ["start", "stop", "scrape" if cls.has_scrape else None]
-        return [
-            Choice(name=name, value=name) for name in command_names if name is not None
-        ]
+        return command_choices(cls.has_scrape)
 
     def _add_score(self, pid: int, value: int):
         """TODO"""
         self.logging.info(f"Adding score {value} for player {pid}")
+        self.record("score", pid=pid, value=value)
         self.state["scores"][pid] += value
+        self._round_scores[pid] += value
+
+    async def _save_scores(self):
+        """Add the scores since the last save to the leaderboard, as one round
+        played by every current player. Called at the end of each round."""
+        scores = {pid: self._round_scores.get(pid, 0) for pid in self.players}
+        # players who left before the round ended keep what they scored
+        scores.update(self._round_scores)
+        self._round_scores = defaultdict(int)
+
+        if self.leaderboard is None:
+            return
+        names = {pid: user.name for pid, user in self.players.items()}
+        try:
+            await self.leaderboard.add_scores(
+                self.guild.id, type(self).__name__, scores, names
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            # losing a round of scores should not end the game
+            self.logging.error(f"Error saving scores to the leaderboard {e}")
+
+    def record(self, kind: str, **fields):
+        """Record a state transition of the game in the session event log.
+
+        :param kind: Name of the transition.
+        :param fields: JSON serialisable details, e.g. the cards dealt.
+        """
+        self.events.record(kind, **fields)
+
+    async def _input(
+        self,
+        kind: str,
+        wait: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = normalize,
+        decode: Callable[[Any], Any] = lambda value: value,
+    ) -> Any:
+        """Wait for input from the players, and record it in the event log. When
+        replaying, the next logged input is returned instead.
+
+        The game must not draw from `self.rng` inside `wait`, as it is not called
+        when replaying.
+
+        :param kind: Name of the input.
+        :param wait: Asks the players, e.g. by sending a view and waiting on it.
+        :param encode: Converts the result of `wait` to JSON serialisable data.
+        :param decode: Converts logged data back to the form `wait` returns.
+
+        :raises ReplayError: If the next logged input is not of `kind`.
+        """
+        if self.replay_inputs is None:
+            value = await wait()
+            self.record("input", input=kind, value=encode(value))
+            return value
+
+        if not self.replay_inputs or self.replay_inputs[0]["input"] != kind:
+            raise ReplayError(
+                f"Expected input {kind!r}, next logged input is "
+                f"{self.replay_inputs[0]['input'] if self.replay_inputs else None!r}"
+            )
+        event = self.replay_inputs.popleft()
+        self.record("input", input=kind, value=event["value"])
+        return decode(event["value"])
+
+    async def run(self):
+        """Run the game, and write out the event log when it ends."""
+        try:
+            await self.start()
+            if self._round_scores:
+                # scored outside of `execute_rounds`
+                await self._save_scores()
+        finally:
+            self.record("end", scores=normalize(self.state["scores"]))
+            self.events.flush()
 
     @staticmethod
-    def _read_file(path: str) -> List[str]:
+    async def _read_file(path: str) -> List[str]:
         """Utility method for reading in scraped files. Scraped files
-        are always assumed to be new-line seperated.
+        are always assumed to be new-line seperated. Read on the IO thread pool.
 
         :param path: Path to the file
 
-        :return: Content of the file
+        :return: Non-empty lines of the file
         """
-        data = None
-        with open(path, "r") as f:
-            data = f.read().split("\n")
-        return data
+        return [line for line in await fileio.read_lines(path) if line.strip()]
 
     @property
     def players(self) -> dict:
@@ -127,8 +289,13 @@ class EGameFactory:
         self._players = {u.id: u for (u, _) in players}
         self._num_players = len(self._players.keys())
         self._player_symbols = {u.id: s for (u, s) in players}
+        # new players are on the scoreboard from the start
+        for pid in self._players:
+            self.state["scores"].add(pid)
 
-    async def dm_players(self, content: dict, player_ids: list, ipipeline=None) -> dict:
+    async def dm_players(
+        self, content: dict, player_ids: list, ipipeline=None
+    ) -> Optional[PipelineResult]:
         """Convenience method to send a message to a list of players.
 
         :param content: Embed content to send.
@@ -137,11 +304,13 @@ class EGameFactory:
         :param ipipeline: Interaction pipeline
         :type ipipeline: :class:`interactive.InteractionPipeline`, Optional
 
-        :return: Reply dictionary if interaction present, else `None`."""
+        :return: Merged pipeline result if interaction present, else `None`."""
         unique_content = {pid: content for pid in player_ids}
         return await self.dm_players_unique(unique_content, ipipeline=ipipeline)
 
-    async def dm_players_unique(self, unique_content: dict, ipipeline=None) -> dict:
+    async def dm_players_unique(
+        self, unique_content: dict, ipipeline=None
+    ) -> Optional[PipelineResult]:
         """DM unique content to each player, indexed by player id.
 
         :param unique_content: Embed content to send to player, indexed by the
@@ -149,9 +318,14 @@ class EGameFactory:
         :param ipipeline: Interaction pipeline
         :type ipipeline: :class:`interactive.InteractionPipeline`, Optional
 
-        :return: Reply dictionary if interaction present, else `None`.
+        :return: Merged pipeline result if interaction present, else `None`.
         """
+        with METRICS.timer("ebot_dm_seconds", game=self.game_name):
+            return await self._dm_players_unique(unique_content, ipipeline)
 
+    async def _dm_players_unique(
+        self, unique_content: dict, ipipeline
+    ) -> Optional[PipelineResult]:
         tasks = []
         for pid, embed in unique_content.items():
             # get dm channel
@@ -162,7 +336,9 @@ class EGameFactory:
 
             if ipipeline:
                 self.logging.info(f"send_and_watch {dm_channel}")
-                t = ipipeline.send_and_watch(dm_channel, embed, timeout=31)
+                t = ipipeline.send_and_watch(
+                    dm_channel, embed, timeout=self.response_timeout
+                )
 
             else:
                 self.logging.info(f"send {dm_channel}")
@@ -172,23 +348,24 @@ class EGameFactory:
 
         response_list = await asyncio.gather(*tasks)
 
-        responses = dmerge(*response_list)
-        self.logging.info(responses)
-
         # unpack
         if ipipeline:
-            return responses["response"]
+            responses = PipelineResult.merge(*response_list)
+            self.logging.info("DM responses %s", Payload(responses))
+            return responses
         else:
-            return {}
+            return None
 
-    async def dm_all_players(self, content: dict, ipipeline=None) -> dict:
+    async def dm_all_players(
+        self, content: dict, ipipeline=None
+    ) -> Optional[PipelineResult]:
         """Convenience method to send a message to all players in the game.
 
         :param content: Embed content to send.
         :param ipipeline: Interaction pipeline
         :type ipipeline: :class:`interactive.InteractionPipeline`, Optional
 
-        :return: Reply dictionary if interaction present, else `None`.
+        :return: Merged pipeline result if interaction present, else `None`.
         """
         self.logging.info(f"DMing all players in {self.guild}")
         return await self.dm_players(content, self.players.keys(), ipipeline=ipipeline)
@@ -204,7 +381,8 @@ class EGameFactory:
         """
 
         text = f"{self.game_description}\n\nClick to join the game."
-        gather = GatherPlayersView(self.embed(text))
+        # not `self.rng`: joining is not replayed, and the symbols are logged
+        gather = GatherPlayersView(self.embed(text), timeout=self.player_gather_timeout)
         await gather.send_and_wait(self.channel)
 
         return gather.players
@@ -229,14 +407,9 @@ class EGameFactory:
 
     async def scoreboard(self):
         """TODO"""
-        self.logging.info(self.state)
-        tallied_scores = self.state["scores"]
-
-        scores = sorted(
-            [(pid, tallied_scores[pid]) for pid in self.players.keys()],
-            key=lambda i: i[1],
-            reverse=True,
-        )
+        self.logging.info("Game state %s", Payload(self.state))
+        # players who have left keep their score, but are not shown
+        scores = self.state["scores"].top_of(self.players)
         scoreboard = [
             f"{i + 1}. {self.players[t[0]]}: {t[1]}" for i, t in enumerate(scores)
         ]
@@ -260,33 +433,118 @@ class EGameFactory:
         # pylint: disable=unnecessary-ellipsis
         ...
 
-    # override
     async def scrape(self, interaction: discord.Interaction) -> str:
-        # pylint: disable=unused-argument
-        ...
+        """Scrape every channel in `scrape_channels` into its file, concurrently.
+        Progress is shown by editing the original response to `interaction`, which
+        should be deferred.
+
+        :return: Summary of the entries scraped and of the channels that failed, or
+            why nothing was scraped.
+        """
+        try:
+            channels = {
+                label: CHANNELS.get(interaction.guild, name)
+                for label, name in self.scrape_channels.items()
+            }
+        except ChannelNotFound as e:
+            self.logging.warning(f"Cannot scrape: {e}")
+            return f"{e} Create it, or check its name, and scrape again."
+
+        # channel name -> messages read so far
+        progress = {channel.name: 0 for channel in channels.values()}
+        scrapes = asyncio.gather(
+            *(
+                self._scrape_channel(
+                    interaction, channel, getattr(self, f"file_{label}"), progress
+                )
+                for label, channel in channels.items()
+            ),
+            # a failed channel does not stop the others
+            return_exceptions=True,
+        )
+
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {scrapes}, timeout=SCRAPE_PROGRESS_INTERVAL
+                )
+                if done:
+                    break
+                await self._report_progress(interaction, progress)
+        except asyncio.CancelledError:
+            scrapes.cancel()
+            raise
+
+        counts, failures = [], []
+        for (label, channel), result in zip(channels.items(), scrapes.result()):
+            if isinstance(result, Exception):
+                self.logging.error(
+                    f"Scraping {channel.name} in {interaction.guild.id} failed: "
+                    f"{result!r}"
+                )
+                failures.append(f"#{channel.name} ({result})")
+            else:
+                counts.append(f"{result} {label}")
+
+        summary = []
+        if counts:
+            summary.append(f"Scraped {_enumerate(counts)}.")
+        if failures:
+            summary.append(f"Could not scrape {_enumerate(failures)}.")
+        return " ".join(summary)
+
+    async def _report_progress(
+        self, interaction: discord.Interaction, progress: Dict[str, int]
+    ):
+        text = "Scraping...\n" + "\n".join(
+            f"#{channel}: {count} messages" for channel, count in progress.items()
+        )
+        try:
+            await interaction.edit_original_response(content=text)
+        except discord.HTTPException as e:
+            # progress is best effort
+            self.logging.warning(f"Could not show scrape progress {e}")
 
     async def _scrape_channel(
-        self, interaction: discord.Interaction, channel_name: str, file_name: str
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
+        file_name: str,
+        progress: Dict[str, int],
     ) -> int:
-        """TODO"""
-        channel = next(
-            filter(lambda c: c.name == channel_name, interaction.guild.channels)
-        )
+        """Scrape the messages of `channel` into `file_name`.
 
-        message_contents = []
+        :param progress: Number of messages read, indexed by channel name; updated
+            as messages are read.
 
-        async for message in channel.history(limit=SCRAPE_MAXIMUM):
-            try:
+        :return: Number of entries in the file.
+        :raises Exception: If reading the channel or writing the file fails; the file
+            is left unchanged.
+        """
+        channel_name = channel.name
+
+        # concurrent scrapes of the same file run one after the other
+        async with self._scrape_limits[self.guild.id], self._scrape_locks[file_name]:
+            message_contents = []
+
+            async for message in channel.history(limit=self.scrape_maximum):
+                progress[channel_name] += 1
+                if message.author.bot:
+                    continue
                 message_contents.append(replace_rules(message.content))
-            except Exception as e:
-                self.logging.error(
-                    f"Scraping error on {channel_name} in {interaction.guild.id}: {e}"
-                )
-                return f"Scraping error {e}."
 
-        with open(file_name, "w") as f:
-            f.write("\n".join(message_contents))
-        return len(message_contents)
+            try:
+                previous = await self._read_file(file_name)
+            except OSError:
+                previous = []
+            # normalized and deduplicated
+            stats = await corpus.write(file_name, message_contents)
+            # keep track of which prompts have been used
+            await promptschedule.remap(
+                file_name, previous, await self._read_file(file_name)
+            )
+        self.logging.info(f"Scraped {channel_name} in {interaction.guild.id}: {stats}")
+        return stats["kept"]
 
     async def gather_players(self) -> int:
         """Creates a player registration prompt, and returns the number of players
@@ -296,7 +554,12 @@ class EGameFactory:
         """
         self.logging.info("Calling gather players.")
 
-        players = await self._players_prompt()
+        players = await self._input(
+            "players",
+            self._players_prompt,
+            encode=lambda players: [[u.id, u.name, s] for (u, s) in players],
+            decode=lambda value: [(ReplayUser(i, name), s) for (i, name, s) in value],
+        )
         self.players = players
 
         self.logging.info(f"number of players {self._num_players}")
@@ -326,15 +589,18 @@ class EGameFactory:
                 ]
             )
         )
-        result = await ipl.send_and_watch(
-            self.channel,
-            self.embed(
-                "Finished a round! Vote below to continue the game, change players, or stop the game."
-            ),
-            timeout=31,
-        )
-        response = result.get("response", {})
-        buttons = response.get("choice", {})
+
+        async def _wait():
+            result = await ipl.send_and_watch(
+                self.channel,
+                self.embed(
+                    "Finished a round! Vote below to continue the game, change players, or stop the game."
+                ),
+                timeout=self.response_timeout,
+            )
+            return result.get(ChoiceInteraction.name)
+
+        buttons = await self._input("continue", _wait)
         votes_to_continue = buttons.get("checkmark", 0)
         votes_to_change_players = buttons.get("busts-in-silhouette", 0)
         votes_to_stop = buttons.get("stop-sign", 0)
@@ -375,6 +641,7 @@ class EGameFactory:
             async def wrapped_function(_self, *args, **kwargs):
                 for round_number in count(1):
                     await func(_self, *args, **kwargs)
+                    await _self._save_scores()
                     # check if max rounds exceeded
                     if max_rounds and round_number >= max_rounds:
                         break
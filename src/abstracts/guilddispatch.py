@@ -1,3 +1,4 @@
+import io
 import logging
 import asyncio
 from collections import namedtuple
@@ -6,6 +7,10 @@ from typing import Callable
 import discord
 from discord.ext import commands
 
+from utils.guildconfig import GUILD_CONFIG
+from utils.logs import log_context
+from utils.metrics import METRICS
+
 # data type for storing factories
 FactoryTask = namedtuple("FactoryTask", ("instance", "future"))
 
@@ -44,6 +49,17 @@ class GuildDispatch(commands.Cog):
         # class internals
         self.lookup = {}  # lookup game states by guild id
 
+        GUILD_CONFIG.subscribe(self._on_config_change)
+
+    async def cog_unload(self):
+        GUILD_CONFIG.unsubscribe(self._on_config_change)
+
+    def _on_config_change(self, gid: int, name: str, value):
+        """Apply changed settings to the game running on guild `gid`, if any."""
+        if gid in self.lookup:
+            self.logging.info(f"Setting {name} changed to {value} for running game")
+            self.lookup[gid].instance.configure(GUILD_CONFIG.overrides(gid), live=True)
+
     def embed(self, text: str) -> discord.Embed:
         """TODO"""
         return discord.Embed(
@@ -89,13 +105,15 @@ class GuildDispatch(commands.Cog):
         return factory(context)
 
     def _launch_threadsafe(self, instance) -> FactoryTask:
-        """Run the `start` method of `instance` in a thread using `asyncio.run_coroutine_threadsafe`.
+        """Run the `run` method of `instance` in a thread using `asyncio.run_coroutine_threadsafe`.
 
         :return: `FactoryTask` of `instance` and `future`, where the future contains the running threadsafe
             event loop.
         """
         loop = asyncio.get_event_loop()
-        future = asyncio.run_coroutine_threadsafe(instance.start(), loop)
+        # the game task inherits the logging context
+        with log_context(guild_id=instance.guild.id, session_id=instance.session_id):
+            future = asyncio.run_coroutine_threadsafe(instance.run(), loop)
 
         return FactoryTask(instance, future)
 
@@ -148,6 +166,10 @@ class GuildDispatch(commands.Cog):
         """Cog command entry function, to be called from the derived class. Handles command
         and contexts.
         """
+        with METRICS.timer("ebot_command_seconds", command=f"{factory.__name__}.{cmd}"):
+            return await self._dispatch(interaction, cmd, factory)
+
+    async def _dispatch(self, interaction: discord.Interaction, cmd: str, factory):
         self.logging.info(
             f"entry called for {factory} with {cmd} from guild {interaction.guild.name}"
         )
@@ -206,11 +228,23 @@ class GuildDispatch(commands.Cog):
             raise error
 
     def _debug_embed(self, text: str) -> str:
+        loop_monitor = getattr(self.bot, "loop_monitor", None)
+        lag = loop_monitor.summary() if loop_monitor else "Not monitored."
+        metrics = METRICS.summary() if METRICS.enabled else "Metrics disabled."
+        # embed descriptions are limited to 4096 characters
+        metrics = metrics[: 3800 - len(text) - len(lag)]
         return discord.Embed(
-            title="GuildDispatch Debug", description=f"Lookup table:\n```\n{text}\n```"
+            title="GuildDispatch Debug",
+            description=f"Lookup table:\n```\n{text}\n```\n"
+            f"Event loop:\n```\n{lag}\n```\n"
+            f"Latencies:\n```\n{metrics}\n```",
         )
 
     @commands.command(name="dispatch")
     async def debug(self, context, cmd):
         if cmd == "debug":
-            await context.send(embed=self._debug_embed(str(self.lookup)))
+            # full metrics in the prometheus text format
+            export = discord.File(
+                io.BytesIO(METRICS.export().encode()), filename="metrics.txt"
+            )
+            await context.send(embed=self._debug_embed(str(self.lookup)), file=export)
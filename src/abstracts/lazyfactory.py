@@ -0,0 +1,67 @@
+import importlib
+import logging
+import time
+from typing import List
+
+from discord.app_commands import Choice
+
+logger = logging.getLogger(__name__)
+
+
+def command_choices(has_scrape: bool) -> List[Choice]:
+    """Slash command choices for a game, see
+    :func:`abstracts.egamefactory.EGameFactory.choices`."""
+    command_names = ["start", "stop", "scrape" if has_scrape else None]
+    return [Choice(name=name, value=name) for name in command_names if name is not None]
+
+
+class LazyFactory:
+    """Stand-in for an :class:`abstracts.EGameFactory` subclass, which defers
+    importing the game module until the first command is dispatched to it.
+
+    Attributes other than `has_scrape` are forwarded to the game class, and calling
+    the instance creates a game instance.
+
+    :param module: Module name of the game, e.g. `games.elash`.
+    :param name: Class name of the game in `module`.
+    :param has_scrape: Whether the game supports scraping; must match the game class.
+    """
+
+    def __init__(self, module: str, name: str, has_scrape: bool = False):
+        self.module = module
+        self.name = name
+        self.__name__ = name
+        self.has_scrape = has_scrape
+        # seconds spent importing `module`, once loaded
+        self.import_time = None
+        self._factory = None
+
+    def load(self):
+        """Import and return the game class."""
+        if self._factory is None:
+            start = time.perf_counter()
+            self._factory = getattr(importlib.import_module(self.module), self.name)
+            self.import_time = time.perf_counter() - start
+            logger.info(
+                f"Imported {self.module}.{self.name} in {self.import_time * 1000:.1f}ms"
+            )
+
+            if bool(self._factory.has_scrape) != self.has_scrape:
+                logger.warning(f"{self} has_scrape does not match the game class")
+
+        return self._factory
+
+    def choices(self) -> List[Choice]:
+        return command_choices(self.has_scrape)
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        # only called for attributes not found on the instance
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyFactory {self.module}.{self.name}>"
@@ -0,0 +1,175 @@
+"""
+Headless replay of logged game sessions.
+
+A game is replayed by constructing it with the logged session id, so that its
+random choices are the same, and feeding it the logged player inputs in place of
+discord interactions. Messages go to in-memory stand-ins for discord objects, and
+all sleeps return immediately, so a replay runs at full speed.
+
+The events recorded by the replay are compared to the log; any difference means
+the game no longer behaves as it did when the session was played.
+"""
+
+import asyncio
+import collections
+import importlib
+import itertools
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from utils.eventlog import EventLog, normalize
+
+
+class ReplayError(Exception):
+    """The game asked for an input the log does not have."""
+
+
+class ReplayMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, channel: "ReplayChannel", content=None, embed=None):
+        self.id = next(self._ids)
+        self.channel = channel
+        self.content = content
+        self.embeds = [embed] if embed is not None else []
+
+    async def edit(self, content=None, embed=None, **kwargs):
+        # pylint: disable=unused-argument
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embeds = [embed]
+        return self
+
+    async def delete(self, **kwargs):
+        pass
+
+    async def add_reaction(self, emoji):
+        pass
+
+
+class ReplayChannel:
+    def __init__(self):
+        self.messages: List[ReplayMessage] = []
+
+    async def send(self, content=None, embed=None, **kwargs) -> ReplayMessage:
+        # pylint: disable=unused-argument
+        message = ReplayMessage(self, content, embed)
+        self.messages.append(message)
+        return message
+
+
+class ReplayUser:
+    def __init__(self, uid: int, name: str):
+        self.id = uid
+        self.name = name
+        self.bot = False
+        self.dm_channel = ReplayChannel()
+
+    @property
+    def mention(self) -> str:
+        return f"@{self.name}"
+
+    async def create_dm(self) -> ReplayChannel:
+        return self.dm_channel
+
+    def __str__(self):
+        return self.name
+
+
+class ReplayGuild:
+    def __init__(self, gid: int):
+        self.id = gid
+        self.channels = []
+
+
+class ReplayInteraction:
+    def __init__(self, gid: int):
+        self.guild = ReplayGuild(gid)
+        self.channel = ReplayChannel()
+
+
+@dataclass
+class ReplayResult:
+    """Outcome of :func:`replay`.
+
+    :param game: Qualified name of the game class.
+    :param session_id: Session that was replayed.
+    :param seconds: Wall time of the replay.
+    :param events: Events recorded by the replay.
+    :param divergence: Description of the first difference to the log, if any.
+    """
+
+    game: str
+    session_id: str
+    seconds: float
+    events: List[dict]
+    divergence: Optional[str]
+
+
+def _comparable(event: dict) -> dict:
+    return normalize({k: v for k, v in event.items() if k != "t"})
+
+
+def _compare(logged: List[dict], replayed: List[dict]) -> Optional[str]:
+    for i, (expected, actual) in enumerate(itertools.zip_longest(logged, replayed)):
+        if actual is None:
+            return f"Event {i}: replay ended, log continues with {expected}"
+        if expected is None:
+            return f"Event {i}: replay continued with {actual}"
+        if _comparable(expected) != _comparable(actual):
+            return f"Event {i}: logged {expected}, replayed {actual}"
+    return None
+
+
+async def _no_sleep(*args, **kwargs):
+    # pylint: disable=unused-argument
+    return None
+
+
+async def replay(events: List[dict]) -> ReplayResult:
+    """Replay the session logged in `events`, as from
+    :func:`utils.eventlog.read_events`.
+
+    Patches `asyncio.sleep` for the duration, so must not be run alongside
+    anything else on the event loop, e.g. the bot.
+
+    :raises ReplayError: If `events` does not start with a session event.
+    """
+    if not events or events[0]["kind"] != "session":
+        raise ReplayError("Log does not start with a session event")
+    header = events[0]
+
+    module, name = header["game"].rsplit(".", 1)
+    factory = getattr(importlib.import_module(module), name)
+
+    game = factory(ReplayInteraction(header["guild_id"]), header["session_id"])
+    # keep the replay out of the session logs
+    game.events = EventLog()
+    game.leaderboard = None
+    # the settings of the guild at the time
+    game.configure(header.get("config", {}))
+    game.replay_inputs = collections.deque(
+        event for event in events if event["kind"] == "input"
+    )
+
+    start = time.perf_counter()
+    error = None
+    sleep, asyncio.sleep = asyncio.sleep, _no_sleep
+    try:
+        await game.gather_players()
+        await game.run()
+    except ReplayError as e:
+        error = str(e)
+    finally:
+        asyncio.sleep = sleep
+    seconds = time.perf_counter() - start
+
+    return ReplayResult(
+        game=header["game"],
+        session_id=header["session_id"],
+        seconds=seconds,
+        events=game.events.events,
+        divergence=error or _compare(events[1:], game.events.events),
+    )
@@ -3,6 +3,8 @@ import re
 
 from discord.ext import commands
 
+from utils.metrics import METRICS
+
 
 EMOJIS = ["\U0001F621", "\U0001F92C", "\U0001F624", "\U0001F47F", "\U0001F329"]
 
@@ -16,6 +18,7 @@ class Angery(commands.Cog):
         return re.search(r"^angery$", content, re.IGNORECASE) is not None
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         if message.author.bot:
             # skip bots
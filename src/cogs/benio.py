@@ -4,6 +4,8 @@ import os
 from discord.ext import commands
 
 from econfig import PATH_EXTENSION
+from utils import fileio
+from utils.metrics import METRICS
 
 _ID = 462721725520543764
 FILE = os.path.join(PATH_EXTENSION, "data/benmessages.txt")
@@ -15,10 +17,10 @@ class BenIO(commands.Cog):
         self.logging = logging.getLogger(__name__)
 
     def _append_message(self, content):
-        with open(FILE, "a") as f:
-            f.write(f"\n\n{content}")
+        fileio.write_behind(FILE, f"\n\n{content}", mode="a")
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         # self.logging.info(f"{message.author.name}, {message.author.id}")
         if message.author.id == _ID:
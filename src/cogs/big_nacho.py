@@ -3,6 +3,8 @@ import re
 
 from discord.ext import commands
 
+from utils.metrics import METRICS
+
 
 URI = "http://e-doritos.com/img/dorito.png"
 
@@ -16,6 +18,7 @@ class BigNacho(commands.Cog):
         return re.search(r"the big nacho", content, re.IGNORECASE) is not None
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         if message.author.bot:
             # skip bots
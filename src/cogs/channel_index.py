@@ -0,0 +1,35 @@
+import discord
+from discord.ext import commands
+
+from utils.channelindex import CHANNELS
+
+
+class ChannelIndexer(commands.Cog):
+    """Keeps :data:`utils.channelindex.CHANNELS` up to date."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        CHANNELS.add(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        CHANNELS.remove(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        if before.name != after.name or before.position != after.position:
+            CHANNELS.update(before, after)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        CHANNELS.forget(guild)
+
+
+async def setup(bot):
+    await bot.add_cog(ChannelIndexer(bot))
+    return
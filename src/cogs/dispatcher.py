@@ -1,16 +1,30 @@
+import asyncio
+
 import discord
 from discord import app_commands
 
-from games.elash import ELash
-from games.ecards import ECards
-from games.ridethebus import RideTheBus
-
-from abstracts import GuildDispatch
+from abstracts import GuildDispatch, LazyFactory
+from utils.guildconfig import GUILD_CONFIG
+from utils.leaderboard import LEADERBOARD, Standing
 
 COG_HELP = """
     TODO
 """
 
+# game modules are imported on the first command
+ELash = LazyFactory("games.elash", "ELash", has_scrape=True)
+ECards = LazyFactory("games.ecards", "ECards", has_scrape=True)
+RideTheBus = LazyFactory("games.ridethebus", "RideTheBus", has_scrape=False)
+
+for factory in (ELash, ECards, RideTheBus):
+    GUILD_CONFIG.register_game(factory.name, factory)
+
+# games that record scores; Ride the Bus hands out drinks instead
+GAME_CHOICES = [
+    app_commands.Choice(name=factory.name, value=factory.name)
+    for factory in (ELash, ECards)
+]
+
 
 class EGameDispatch(GuildDispatch):
     cog_help = COG_HELP
@@ -34,6 +48,46 @@ class EGameDispatch(GuildDispatch):
     async def ridethebus(self, interaction: discord.Interaction, cmd: str):
         await self._entry(interaction, cmd, RideTheBus)
 
+    @app_commands.command(name="leaderboard")
+    @app_commands.guild_only()
+    @app_commands.choices(game=GAME_CHOICES)
+    async def leaderboard(self, interaction: discord.Interaction, game: str):
+        gid = interaction.guild.id
+        standings = await LEADERBOARD.top(gid, game)
+        if not standings:
+            return await interaction.response.send_message(
+                embed=self.embed(f"No scores recorded for {game} yet.")
+            )
+
+        # names may need fetching
+        await interaction.response.defer()
+        names = await asyncio.gather(*(self._name(s) for s in standings))
+        lines = [
+            f"{s.rank}. **{name}**: {s.score} ({s.rounds} rounds)"
+            for s, name in zip(standings, names)
+        ]
+        if interaction.user.id not in (s.player_id for s in standings):
+            own = await LEADERBOARD.standing(gid, game, interaction.user.id)
+            if own:
+                lines.append(
+                    f"...\n{own.rank}. **{interaction.user.name}**: {own.score}"
+                )
+
+        await interaction.followup.send(
+            embed=discord.Embed(
+                title=f"{game} leaderboard",
+                description="\n".join(lines),
+                colour=discord.Colour.gold(),
+            )
+        )
+
+    async def _name(self, standing: Standing) -> str:
+        """Current name of a player, or the name they last played under."""
+        try:
+            return (await self.bot.users_lru.get(standing.player_id)).name
+        except discord.HTTPException:
+            return standing.name
+
     # @app_commands.command(name="test")
     # async def test(self, interaction: discord.Interaction):
     #     ...
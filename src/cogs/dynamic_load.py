@@ -1,16 +1,24 @@
+import asyncio
+import datetime
 import logging
+import os
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from econfig import PATH_EXTENSION
+from utils.profiler import StackSampler
+
 COG_HELP = """TODO: help"""
 
+PROFILE_MAX_SECONDS = 120
+
 
 async def _entry_autocomplete(
     interaction: discord.Interaction, current: str
 ):  # pylint: disable=unused-argument
-    basic_options = ["all", "list", "guildtree", "globaltree"]
+    basic_options = ["all", "list", "timings", "guildtree", "globaltree"]
     return [
         app_commands.Choice(name=item, value=item)
         for item in basic_options
@@ -23,6 +31,8 @@ class DynamicLoad(commands.Cog):
         self.bot = bot
         self.logging = logging.getLogger(__name__)
 
+        self._sampler = None
+
     async def _reload_all_cogs(self) -> list:
         self.logging.info("Reloading cogs...")
 
@@ -70,6 +80,12 @@ class DynamicLoad(commands.Cog):
         ret = "\n".join(f"- {i}" for i in input_list)
         return f"```\n{ret}\n```"
 
+    def _fmt_cog_timings(self, timings: dict) -> str:
+        return self._fmt_cog_list(
+            f"{cog}: {seconds * 1000:.1f}ms"
+            for cog, seconds in sorted(timings.items(), key=lambda i: -i[1])
+        )
+
     @commands.hybrid_command(name="dloader")
     @app_commands.autocomplete(cog_name=_entry_autocomplete)
     async def entry(self, context, cog_name: str):
@@ -84,6 +100,10 @@ class DynamicLoad(commands.Cog):
             resp = self._fmt_cog_list(self.bot.extensions.keys())
             await context.send(f"Cogs currently loaded:\n{resp}")
 
+        elif cog_name == "timings":
+            resp = self._fmt_cog_timings(self.bot.cog_timings)
+            await context.send(f"Startup load time per cog:\n{resp}")
+
         elif cog_name == "guildtree":
             if context.message.author.id in self.bot.admin_users:
                 self.bot.tree.copy_global_to(guild=context.guild)
@@ -115,6 +135,40 @@ class DynamicLoad(commands.Cog):
             self.logging.info(resp)
             await context.send(resp)
 
+    @commands.hybrid_command(name="profile")
+    async def profile(self, context, seconds: int = 10):
+        """Sample the event loop for `seconds`, writing flamegraph-ready stacks
+        under `PATH_EXTENSION`."""
+        if context.author.id not in self.bot.admin_users:
+            self.logging.info(f"User {context.author.id} tried to run the profiler")
+            return await context.send("You don't have permission to do that :(")
+
+        if self._sampler is not None:
+            return await context.send("Profiler is already running.")
+
+        seconds = max(1, min(seconds, PROFILE_MAX_SECONDS))
+        self.logging.info(f"Profiling event loop for {seconds}s")
+        await context.send(f"Profiling for {seconds}s...")
+
+        loop = asyncio.get_running_loop()
+        self._sampler = StackSampler(loop)
+        self._sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            result = await self._sampler.stop()
+            self._sampler = None
+
+        timestamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path_prefix = os.path.join(
+            PATH_EXTENSION, "data/profiles", f"profile_{timestamp}"
+        )
+        paths = await loop.run_in_executor(None, result.write, path_prefix)
+        self.logging.info(f"Profile written to {paths}")
+
+        files = "\n".join(f"- {os.path.basename(path)}" for path in paths)
+        await context.send(f"```\n{result.summary()}\n```\nWritten:\n```\n{files}\n```")
+
     async def cog_command_error(self, context, error):
         # pylint: disable=arguments-renamed
         if isinstance(error, commands.errors.MissingRequiredArgument):
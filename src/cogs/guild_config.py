@@ -0,0 +1,75 @@
+import logging
+from typing import Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.guildconfig import GUILD_CONFIG, SETTINGS, ConfigError
+
+
+class GuildConfigCog(commands.Cog):
+    """Lets guild managers change game settings, see :mod:`utils.guildconfig`."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.logging = logging.getLogger(__name__)
+
+    async def cog_load(self):
+        await GUILD_CONFIG.load()
+
+    def embed(self, text: str) -> discord.Embed:
+        return discord.Embed(
+            title="Settings", description=text, colour=discord.Colour.dark_teal()
+        )
+
+    def _describe(self, gid: int) -> str:
+        overrides = GUILD_CONFIG.overrides(gid)
+        lines = [
+            f"**{name}**: {setting.description} ({setting.minimum} to {setting.maximum})"
+            for name, setting in SETTINGS.items()
+        ]
+        changed = [f"{name} = {value}" for name, value in overrides.items()]
+        return (
+            "\n".join(lines)
+            + "\n\nChanged in this server:\n"
+            + ("\n".join(changed) if changed else "Nothing, all defaults.")
+            + "\n\nPrefix a setting with a game, e.g. `ECards.hand_size`, to change"
+            " it for that game only. Give no value to reset a setting."
+        )
+
+    @app_commands.command(name="config")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(
+        name="Setting, optionally prefixed by a game, e.g. ECards.hand_size",
+        value="New value; leave empty to reset to the default",
+    )
+    async def config(
+        self,
+        interaction: discord.Interaction,
+        name: Optional[str] = None,
+        value: Optional[int] = None,
+    ):
+        gid = interaction.guild.id
+        if name is None:
+            text = self._describe(gid)
+        else:
+            try:
+                await GUILD_CONFIG.set(gid, name, value)
+            except ConfigError as e:
+                text = str(e)
+            else:
+                self.logging.info(f"Setting {name} set to {value} on {gid}")
+                text = (
+                    f"Reset {name} to the default."
+                    if value is None
+                    else f"Set {name} to {value}."
+                )
+
+        await interaction.response.send_message(embed=self.embed(text), ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(GuildConfigCog(bot))
+    return
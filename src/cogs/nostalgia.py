@@ -1,10 +1,14 @@
 import logging
 import random
-import pathlib
+import os
 
 import discord
 from discord.ext import commands
 
+from econfig import PATH_EXTENSION
+from utils import fileio, promptschedule
+from utils.metrics import METRICS
+
 
 class Nostalgia(commands.Cog):
     PROMPTS = [
@@ -19,8 +23,12 @@ class Nostalgia(commands.Cog):
         self.logging = logging.getLogger(__name__)
 
         self.wordlist = {}
+        self.wordlist_versions = {}
+        # memories are not repeated until all have been used
+        self.schedules = {}
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message: discord.Message) -> None:
         if message.author.bot:
             # skip bots
@@ -30,18 +38,25 @@ class Nostalgia(commands.Cog):
             if random.randint(1, 30) == 22:
                 self.logging.info("nostalgia invoked!")
                 gid = message.guild.id
-                if gid in self.wordlist:
-                    wordlist = self.wordlist[gid]
-                else:
-                    file = pathlib.Path("data/elash_safeties_{gid}.txt".format(gid=gid))
-                    if not file.exists():
-                        self.logging.warning("file %s does not exist.", file.name)
+                path = os.path.join(
+                    PATH_EXTENSION, "data/elash_safeties_{gid}.txt".format(gid=gid)
+                )
+                # reload if the file has been scraped since it was cached
+                version = fileio.version(path)
+                if self.wordlist_versions.get(gid, None) != version:
+                    try:
+                        lines = await fileio.read_lines(path)
+                    except FileNotFoundError:
+                        self.logging.warning("file %s does not exist.", path)
                         return
-                    lines = file.read_text("utf-8").split("\n")
                     self.wordlist[gid] = [item for item in lines if item]
-                    wordlist = self.wordlist[gid]
+                    self.wordlist_versions[gid] = version
+                    self.schedules[gid] = await promptschedule.load(
+                        path, self.wordlist[gid]
+                    )
 
-                memory = random.choice(wordlist)
+                memory = self.schedules[gid].draw()
+                self.schedules[gid].save()
                 prompt = random.choice(self.PROMPTS)
                 msg = f"{prompt} {memory}"
                 await message.reply(msg)
@@ -6,6 +6,8 @@ import os
 from discord.ext import commands
 
 from econfig import PATH_EXTENSION
+from utils import fileio
+from utils.metrics import METRICS
 
 
 class PopeImage(commands.Cog):
@@ -15,13 +17,17 @@ class PopeImage(commands.Cog):
 
         self.pope_uris = []
 
-        with open(os.path.join(PATH_EXTENSION, "data/popelist.txt"), "r") as f:
-            self.pope_uris = list(filter(lambda i: i != "", f.read().split("\n")))
+    async def cog_load(self):
+        lines = await fileio.read_lines(
+            os.path.join(PATH_EXTENSION, "data/popelist.txt")
+        )
+        self.pope_uris = list(filter(lambda i: i != "", lines))
 
     def _has_pope(self, content: str) -> bool:
         return re.search(r"pope", content, re.IGNORECASE) is not None
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         if message.author.bot:
             # skip bots
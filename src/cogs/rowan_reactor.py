@@ -2,6 +2,8 @@ import logging
 
 from discord.ext import commands
 
+from utils.metrics import METRICS
+
 _ID = 691729794462908487
 EMOJI = "<:thee:817130256808673283>"
 
@@ -12,6 +14,7 @@ class RowanReactor(commands.Cog):
         self.logging = logging.getLogger(__name__)
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         if message.author.id == _ID:
             await message.add_reaction(EMOJI)
@@ -4,6 +4,8 @@ import re
 
 from discord.ext import commands
 
+from utils.metrics import METRICS
+
 
 COG_HELP = """ No help available for this cog. """
 
@@ -34,6 +36,7 @@ class VideoThanks(commands.Cog):
         return re.search(r"www\.youtube\.com", content) is not None
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         if message.author.bot:
             # skip bot messages
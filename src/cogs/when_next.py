@@ -4,11 +4,6 @@ import datetime
 import discord
 from discord.ext import commands
 
-from interactive import (
-    InteractionPipeline,
-    ChoiceInteraction,
-)
-
 DATE_FORMAT = "%d/%m/%y"
 
 COG_HELP = """
@@ -48,6 +43,9 @@ class WhenNext(commands.Cog):
                 valid_days.append(from_date.strftime(DATE_FORMAT))
             from_date = from_date + datetime.timedelta(days=1)
         if valid_days:
+            # pylint: disable=import-outside-toplevel
+            from interactive import InteractionPipeline, ChoiceInteraction
+
             ipl = InteractionPipeline(ChoiceInteraction(*valid_days))
             await ipl.send_and_watch(
                 context.channel,
@@ -2,6 +2,8 @@ import logging
 
 from discord.ext import commands
 
+from utils.metrics import METRICS
+
 COG_HELP = """ No help available for this cog. """
 
 EMOJIS = ["\U0001F47F", "\U0001F6D1", "\U000026EA", "\U00002626"]
@@ -44,6 +46,7 @@ class XtianServer(commands.Cog):
         return False
 
     @commands.Cog.listener()
+    @METRICS.timed("ebot_listener_seconds", listener=f"{__name__}.on_message")
     async def on_message(self, message):
         if message.author.bot:
             # skip bot messages
@@ -1,37 +1,150 @@
 import logging
 import pkgutil
+import time
+from functools import wraps
 
 import discord
 from discord.ext import commands
 
 import cogs
+from econfig import (
+    LOOP_LAG_THRESHOLD,
+    LOW_MEMORY,
+    LOW_MEMORY_MAX_MESSAGES,
+    USER_CACHE_SIZE,
+)
+from utils import fileio
+from utils.leaderboard import LEADERBOARD
+from utils.looplag import LoopLagMonitor
+from utils.metrics import METRICS
+from utils.shards import ShardMonitor, format_shard_ids
+from utils.usercache import UserCache
+
+
+def low_memory_options() -> dict:
+    """Client options that only subscribe to the gateway events, and keep the
+    caches, that the cogs and games use.
+
+    Cogs read messages, and games read the players from interactions; reactions are
+    read from freshly fetched messages, so reaction events are not needed. No
+    members are cached beyond the bot itself, and users are looked up through
+    :attr:`EBot.users_lru` instead.
+    """
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.dm_messages = True
+    intents.message_content = True
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "max_messages": LOW_MEMORY_MAX_MESSAGES,
+        "chunk_guilds_at_startup": False,
+    }
 
 
 class EBot(commands.Bot):
     """TODO"""
 
-    def __init__(self, admin_users: list[int]):
-        # pylint: disable=assigning-non-slot
-        intents = discord.Intents.default()
-        intents.message_content = True
+    def __init__(self, admin_users: list[int], low_memory: bool = LOW_MEMORY, **kwargs):
+        """
+        :param low_memory: Use :func:`low_memory_options`, rather than the default
+            intents and caches.
+        :param kwargs: Passed on to the client, e.g. `shard_count` and `shard_ids`.
+        """
+        if low_memory:
+            options = low_memory_options()
+        else:
+            # pylint: disable=assigning-non-slot
+            intents = discord.Intents.default()
+            intents.message_content = True
+            options = {"intents": intents}
         super().__init__(
             command_prefix=".e ",
             activity=discord.Game(name="Loading..."),
-            intents=intents,
+            **options,
+            **kwargs,
         )
         self.logging = logging.getLogger(__name__)
         self.admin_users = admin_users
 
+        # cog name -> seconds spent importing and calling `setup`
+        self.cog_timings = {}
+        self._cogs_loaded = False
+
+        self.loop_monitor = LoopLagMonitor(threshold=LOOP_LAG_THRESHOLD)
+        self.shard_monitor = ShardMonitor(self)
+        self.users_lru = UserCache(self, USER_CACHE_SIZE)
+
+        self._instrument_http()
+
+    def _instrument_http(self):
+        """Record the latency of every REST call, by route, in `METRICS`."""
+        request = self.http.request
+
+        @wraps(request)
+        async def timed_request(route, **kwargs):
+            with METRICS.timer(
+                "ebot_rest_seconds", method=route.method, path=route.path
+            ):
+                return await request(route, **kwargs)
+
+        self.http.request = timed_request
+
+    async def invoke(self, ctx):
+        """Times prefix and hybrid commands; see `abstracts.GuildDispatch` for the
+        game slash commands."""
+        name = ctx.command.qualified_name if ctx.command else "unknown"
+        with METRICS.timer("ebot_command_seconds", command=name):
+            await super().invoke(ctx)
+
+    async def _load_cog(self, name: str):
+        start = time.perf_counter()
+        try:
+            await self.load_extension(name)
+        except Exception as e:
+            self.logging.error(f"{name} failed to load: raised exception: {e}")
+        else:
+            self.cog_timings[name] = time.perf_counter() - start
+            self.logging.info(
+                f"{name} loaded as extensions in {self.cog_timings[name] * 1000:.1f}ms"
+            )
+
     async def load_all_available_cogs(self):
-        """TODO"""
+        """Load every module in :mod:`cogs` as an extension, one after another.
+        Only runs once per bot instance; use the `dloader` command to reload cogs.
+
+        Load times per cog, each its own import and `setup` only, are stored in
+        `self.cog_timings`.
+        """
+        if self._cogs_loaded:
+            return
+        self._cogs_loaded = True
+
         self.logging.info("Loading cogs...")
+        start = time.perf_counter()
+        # sequentially: extensions import synchronously, so gathering the loads
+        # would not overlap them, and each timing would include the others
         for i in pkgutil.walk_packages(cogs.__path__, cogs.__name__ + "."):
-            name = i.name
-            try:
-                await self.load_extension(name)
-                self.logging.info(f"{name} loaded as extensions")
-            except Exception as e:
-                self.logging.error(f"{name} failed to load: raised exception: {e}")
+            await self._load_cog(i.name)
+        self.logging.info(
+            f"Loaded {len(self.cog_timings)} cogs in "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms"
+        )
+
+    async def setup_hook(self):
+        """Called once by discord.py before connecting to the gateway, so that cogs
+        are not reloaded when `on_ready` fires again after a reconnect."""
+        self.loop_monitor.start()
+        self.shard_monitor.start()
+        await self.load_all_available_cogs()
+
+    async def close(self):
+        await self.loop_monitor.stop()
+        self.shard_monitor.stop()
+        await fileio.flush()
+        await LEADERBOARD.close()
+        await super().close()
 
     def log_infos(self):
         """Write information about the bot to logs.
@@ -39,17 +152,21 @@ class EBot(commands.Bot):
         Currently logs:
             - connected guild name and guild id
         """
+        if self.shard_count:
+            self.logging.info(
+                f"Running shards {format_shard_ids(self.shard_ids or [self.shard_id])}"
+                f" of {self.shard_count}"
+            )
         for g in self.guilds:
-            self.logging.info(f"Active on guild {g} (id={g.id})")
+            self.logging.info(f"Active on guild {g} (id={g.id}, shard={g.shard_id})")
 
     async def on_ready(self):
         """TODO"""
-        await self.load_all_available_cogs()
         await self.wait_until_ready()
         await self.change_presence(
             activity=discord.Activity(
                 type=discord.ActivityType.watching,
-                name="you. \U0001F441\U0001F444\U0001F441",
+                name="you. \U0001f441\U0001f444\U0001f441",
             )
         )
 
@@ -58,9 +175,20 @@ class EBot(commands.Bot):
     async def on_command_error(self, context, error):
         """TODO"""
         # pylint: disable=arguments-differ
+        METRICS.inc("ebot_command_errors_total", error=error.__class__.__name__)
         if isinstance(error, commands.CommandNotFound):
             self.logging.info(f"Call to unknown command {error}")
             await context.send(error)
         else:
             self.logging.error("Error occured in command: %s", error)
             await context.send(error)
+
+
+class ShardedEBot(EBot, commands.AutoShardedBot):
+    """:class:`EBot` running several shards over one gateway connection each, in
+    this process.
+
+    Without `shard_count`, the number of shards recommended by discord is used, and
+    all of them are run. With `shard_count` and `shard_ids`, only the given shards
+    are run, so that the shards can be spread over processes, see `launcher.py`.
+    """
@@ -1,4 +1,22 @@
 PATH_EXTENSION = "."
 PLAYER_GATHER_TIMEOUT = 16
 SCRAPE_MAXIMUM = 1000
+# channels of a guild scraped at once
+SCRAPE_CONCURRENCY = 2
+# seconds between progress updates while scraping
+SCRAPE_PROGRESS_INTERVAL = 2
+# Jaccard similarity of word shingles at which scraped entries are near duplicates
+CORPUS_NEAR_DUPLICATE_THRESHOLD = 0.9
 TEST_BOT_ENABLED = False
+METRICS_ENABLED = True
+# fraction of sub-warning log records kept, indexed by logger name prefix
+LOG_SAMPLING = {}
+LOG_STRUCTURED = False
+# seconds the event loop may block before the blocking code is recorded
+LOOP_LAG_THRESHOLD = 0.1
+# only request the gateway intents, and keep the caches, that cogs and games use
+LOW_MEMORY = False
+# messages kept in the client's message cache with `LOW_MEMORY`
+LOW_MEMORY_MAX_MESSAGES = 100
+# users kept by `EBot.users_lru`
+USER_CACHE_SIZE = 256
@@ -0,0 +1,181 @@
+"""
+Outcome engine for Ride the Bus, over cards encoded as their index in
+:data:`utils.frenchdeck.CARDS`.
+
+Answers are judged with table lookups, singly or in batches, and the odds of each
+answer are computed exactly from the value and suit histogram of the cards not yet
+in the player's hand.
+
+Hands are matched against pyramid rows in round two as value histograms.
+"""
+
+import functools
+from typing import Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from utils.frenchdeck import CARDS, CARD_SUITS, CARD_VALUES
+
+# questions, in the order they are asked
+RED_OR_BLACK = "red_or_black"
+HIGHER_OR_LOWER = "higher_or_lower"
+INBETWEEN = "inbetween"
+GUESS_SUIT = "guess_suit"
+QUESTIONS = (RED_OR_BLACK, HIGHER_OR_LOWER, INBETWEEN, GUESS_SUIT)
+
+ANSWERS: Dict[str, Tuple[str, ...]] = {
+    RED_OR_BLACK: ("red", "black"),
+    HIGHER_OR_LOWER: ("higher", "lower"),
+    INBETWEEN: ("inbetween", "outside"),
+    GUESS_SUIT: ("hearts", "spades", "diamonds", "clubs"),
+}
+# other accepted spellings of answers
+ALIASES = {"broccoli": "clubs"}
+
+_SUIT_ANSWERS = {"hearts": "H", "spades": "S", "diamonds": "D", "clubs": "C"}
+
+# lookup tables indexed by card index
+VALUE: Tuple[int, ...] = tuple(card.value for card in CARDS)
+IS_BLACK: Tuple[bool, ...] = tuple(card.is_black for card in CARDS)
+SUIT: Tuple[str, ...] = tuple(card.suit for card in CARDS)
+
+# number of cards needed in hand before each question can be judged
+HAND_REQUIRED = {RED_OR_BLACK: 0, HIGHER_OR_LOWER: 1, INBETWEEN: 2, GUESS_SUIT: 0}
+
+
+def choices(question: str) -> List[str]:
+    """All answers accepted for `question`, aliases included."""
+    answers = ANSWERS[question]
+    return [*answers, *(k for k, v in ALIASES.items() if v in answers)]
+
+
+def _bounds(hand: Sequence[int]) -> Tuple[int, int]:
+    a, b = VALUE[hand[-2]], VALUE[hand[-1]]
+    return (a, b) if a <= b else (b, a)
+
+
+def judge(question: str, answer: str, hand: Sequence[int], card: int) -> bool:
+    """Whether `answer` is correct for `card`, given the cards already in `hand`.
+
+    - higher or lower: compared to the last card in hand; equal counts as higher.
+    - inbetween or outside: compared to the last two cards in hand; inbetween is
+      strictly between their values, everything else is outside.
+
+    Unrecognised answers are never correct.
+    """
+    answer = ALIASES.get(answer, answer)
+    if question == RED_OR_BLACK:
+        return (answer == "black" and IS_BLACK[card]) or (
+            answer == "red" and not IS_BLACK[card]
+        )
+    if question == HIGHER_OR_LOWER:
+        if not hand:
+            return False
+        last = VALUE[hand[-1]]
+        return (answer == "higher" and VALUE[card] >= last) or (
+            answer == "lower" and VALUE[card] < last
+        )
+    if question == INBETWEEN:
+        if len(hand) < 2:
+            return False
+        low, high = _bounds(hand)
+        inside = low < VALUE[card] < high
+        return (answer == "inbetween" and inside) or (
+            answer == "outside" and not inside
+        )
+    if question == GUESS_SUIT:
+        return _SUIT_ANSWERS.get(answer, None) == SUIT[card]
+    raise ValueError(f"Unknown question {question!r}")
+
+
+def judge_batch(
+    question: str,
+    answers: Sequence[str],
+    hands: Sequence[Sequence[int]],
+    cards: Sequence[int],
+) -> List[bool]:
+    """:func:`judge` for many players at once."""
+    return [
+        judge(question, answer, hand, card)
+        for answer, hand, card in zip(answers, hands, cards)
+    ]
+
+
+def _remaining(hand: Sequence[int]) -> Tuple[List[int], Dict[str, int], int]:
+    """Value histogram, suit histogram and size of the deck without `hand`."""
+    values = [0] + [len(CARD_SUITS)] * len(CARD_VALUES)
+    suits = {suit: len(CARD_VALUES) for suit in CARD_SUITS}
+    for card in set(hand):
+        values[VALUE[card]] -= 1
+        suits[SUIT[card]] -= 1
+    return values, suits, len(CARDS) - len(set(hand))
+
+
+@functools.lru_cache(maxsize=4096)
+def _odds(question: str, hand: Tuple[int, ...]) -> Tuple[Tuple[str, float], ...]:
+    values, suits, total = _remaining(hand)
+
+    if question == RED_OR_BLACK:
+        black = suits["C"] + suits["S"]
+        counts = {"red": total - black, "black": black}
+    elif question == HIGHER_OR_LOWER:
+        last = VALUE[hand[-1]]
+        higher = sum(values[last:])
+        counts = {"higher": higher, "lower": total - higher}
+    elif question == INBETWEEN:
+        low, high = _bounds(hand)
+        inside = sum(values[low + 1 : high])
+        counts = {"inbetween": inside, "outside": total - inside}
+    elif question == GUESS_SUIT:
+        counts = {answer: suits[suit] for answer, suit in _SUIT_ANSWERS.items()}
+    else:
+        raise ValueError(f"Unknown question {question!r}")
+
+    return tuple((answer, counts[answer] / total) for answer in ANSWERS[question])
+
+
+def odds(question: str, hand: Sequence[int]) -> Dict[str, float]:
+    """Probability of each answer to `question` being correct, for a card drawn
+    from a full deck less the cards in `hand`.
+
+    Only the cards in hand are known to a player, so the probabilities are exact
+    from their point of view.
+    """
+    if len(hand) < HAND_REQUIRED[question]:
+        return {answer: 0.0 for answer in ANSWERS[question]}
+    return dict(_odds(question, tuple(hand)))
+
+
+def best_answer(question: str, hand: Sequence[int]) -> str:
+    """Answer most likely to be correct; ties go to the first listed answer."""
+    probabilities = odds(question, hand)
+    return max(ANSWERS[question], key=lambda answer: probabilities[answer])
+
+
+def value_histogram(cards: Iterable[int]) -> List[int]:
+    """Number of cards of each value, indexed by value."""
+    histogram = [0] * (len(CARD_VALUES) + 1)
+    for card in cards:
+        histogram[VALUE[card]] += 1
+    return histogram
+
+
+def row_values(row: Iterable[int]) -> FrozenSet[int]:
+    """Distinct values of the cards in a pyramid row."""
+    return frozenset(VALUE[card] for card in row)
+
+
+def match_row(histogram: List[int], values: FrozenSet[int]) -> int:
+    """Remove every card from the hand `histogram` matching a pyramid row.
+
+    Cards match by value only, regardless of suit, and each card in hand matches
+    at most once however many cards of its value are in the row.
+
+    :param histogram: Hand, as from :func:`value_histogram`; updated in place.
+    :param values: Row, as from :func:`row_values`.
+
+    :return: Number of cards removed from the hand.
+    """
+    matched = 0
+    for value in values:
+        matched += histogram[value]
+        histogram[value] = 0
+    return matched
@@ -1,6 +1,6 @@
 import asyncio
 import random
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import discord
 
@@ -38,11 +38,13 @@ class ECards(EGameFactory):
     file_prompts = "data/elash_prompts_{gid}.txt"
     file_safeties = "data/elash_safeties_{gid}.txt"
 
-    channel_prompts = "elash-prompts"
-    channel_safeties = "elash-safeties"
+    # scraped into `file_prompts` and `file_safeties`
+    scrape_channels = {"prompts": "elash-prompts", "safeties": "elash-safeties"}
 
-    def __init__(self, interaction: discord.Interaction):
-        super().__init__(interaction, __name__)
+    def __init__(
+        self, interaction: discord.Interaction, session_id: Optional[str] = None
+    ):
+        super().__init__(interaction, __name__, session_id)
 
         # instance property of all prompts
         self.prompts = None
@@ -57,7 +59,8 @@ class ECards(EGameFactory):
 
         # check if prompts
         if self.prompts is self.safeties is None:
-            # info message
+            # read ahead while the info message is sent
+            self._prefetch_files()
             self.logging.info(f"Reading prompts and safety files for {self.guild.id}.")
             await self.channel.send(
                 embed=self.embed("Reading prompts and safety files...")
@@ -65,8 +68,8 @@ class ECards(EGameFactory):
 
             # read files
             try:
-                self.prompts = self._read_file(self.file_prompts)
-                self.safeties = self._read_file(self.file_safeties)
+                self.prompts = await self._read_file(self.file_prompts)
+                self.safeties = await self._read_file(self.file_safeties)
             except Exception as e:
                 self.logging.error(f"Error reading files {e}")
                 # early exit
@@ -79,8 +82,8 @@ class ECards(EGameFactory):
             )
 
         # create deck orders
-        prompt_deck = random.sample(self.prompts, len(self.prompts))
-        answer_deck = random.sample(self.safeties, len(self.safeties))
+        prompt_deck = self.rng.sample(self.prompts, len(self.prompts))
+        answer_deck = self.rng.sample(self.safeties, len(self.safeties))
 
         # create starting hands
         hands = {
@@ -105,12 +108,12 @@ class ECards(EGameFactory):
                 f"new ecards round with leader player {self.players[pid]}"
             )
             await self.execute_round(pid, prompt_deck.pop(), hands)
-            ECards.refill_hands(hands, answer_deck)
+            ECards.refill_hands(hands, answer_deck, self.hand_size)
             await asyncio.sleep(self.wait_duration)
         return await self.scoreboard()
 
     @staticmethod
-    def refill_hands(hands: dict, answer_deck: list):
+    def refill_hands(hands: dict, answer_deck: list, hand_size: int = hand_size):
         """
         Refills the players' hands from a deck of answers after a round.
         Objects are passed by reference and modifications made in place, hence no need to return.
@@ -118,9 +121,10 @@ class ECards(EGameFactory):
 
         :param hands: a dictionary mapping player index to player hand
         :param answer_deck: a deck of answer cards to fill hands with
+        :param hand_size: the number of cards to fill each hand to
         """
         for key in hands:
-            while len(hands[key]) < ECards.hand_size:
+            while len(hands[key]) < hand_size:
                 hands[key].append(answer_deck.pop())
 
     async def execute_round(self, leader: int, prompt: str, hands: dict):
@@ -146,19 +150,29 @@ class ECards(EGameFactory):
             prompt,
             leader,
             hands,
+            # players draw inside the view, which is not replayed
+            rng=random.Random(self.rng.random()),
             delete_after=True,
-            timeout=31,
+            timeout=self.response_timeout,
         )
-        await view.send_and_wait(self.channel)
+
+        async def _wait():
+            await view.send_and_wait(self.channel)
+            return view.responses
 
         # get replies
-        replies: Dict[int, Tuple[int, bool]] = view.responses
+        replies: Dict[int, Tuple[int, bool]] = await self._input(
+            "cards",
+            _wait,
+            encode=lambda replies: [[pid, *reply] for pid, reply in replies.items()],
+            decode=lambda value: {pid: (index, redraw) for pid, index, redraw in value},
+        )
         if (
             TestBotUser.test_bot_id in self.players
             and TestBotUser.test_bot_id != leader
         ):
             replies[TestBotUser.test_bot_id] = (
-                random.choice(
+                self.rng.choice(
                     range(len(hands[TestBotUser.test_bot_id]))
                 ),
                 False
@@ -179,9 +193,11 @@ class ECards(EGameFactory):
                 self.logging.info(f"player {pid} chose to redraw")
                 hands[pid].clear()
 
+        self.record("played", leader=leader, prompt=prompt, cards=cards_played)
+
         # shuffle responses to list
         shuffled_responses = [(v, k) for (k, v) in cards_played.items()]
-        random.shuffle(shuffled_responses)
+        self.rng.shuffle(shuffled_responses)
 
         if len(shuffled_responses) == 0:
             # No-one played a card - skip the round
@@ -223,13 +239,21 @@ class ECards(EGameFactory):
                 leader,
                 {pid: shuffled_responses for pid in self.players},
                 delete_after=True,
-                timeout=31,
+                timeout=self.response_timeout,
             )
-            await winner_view.send_and_wait(self.channel)
 
-            winner_replies: Dict[int, Tuple[str, int]] = winner_view.responses
+            async def _wait_winner():
+                await winner_view.send_and_wait(self.channel)
+                return winner_view.responses
+
+            winner_replies: Dict[int, Tuple[str, int]] = await self._input(
+                "winner",
+                _wait_winner,
+                encode=lambda replies: [[pid, *reply] for pid, reply in replies.items()],
+                decode=lambda value: {pid: (card, wpid) for pid, card, wpid in value},
+            )
             if TestBotUser.test_bot_id == leader:
-                winner_replies[TestBotUser.test_bot_id] = random.choice(
+                winner_replies[TestBotUser.test_bot_id] = self.rng.choice(
                     shuffled_responses
                 )
 
@@ -260,15 +284,3 @@ class ECards(EGameFactory):
 
             # update scoreboard
             return self._add_score(winning_pid, 1)
-
-    async def scrape(self, interaction: discord.Interaction) -> str:
-        """TODO"""
-
-        num_prompts = await self._scrape_channel(
-            interaction, self.channel_prompts, self.file_prompts
-        )
-        num_safeties = await self._scrape_channel(
-            interaction, self.channel_safeties, self.file_safeties
-        )
-
-        return f"Scraped {num_prompts} prompts, and {num_safeties} safeties."
@@ -2,11 +2,14 @@ import itertools
 import random
 import collections
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import discord
 
 from abstracts import EGameFactory
+from abstracts.replay import ReplayMessage
+from utils import promptschedule
+from utils.logs import Payload
 
 from interactive import (
     LashGetPromptView,
@@ -14,7 +17,7 @@ from interactive import (
 )
 
 
-def randomize_prompts(prompts: list) -> list:
+def randomize_prompts(prompts: list, rng: random.Random = random) -> list:
     """Utility method for creating a random list of prompt pairs:
         (round 1, round 2)
     are the items of the list, such that each prompt appears exactly once per round.
@@ -26,7 +29,7 @@ def randomize_prompts(prompts: list) -> list:
     next(p_cycle)  # exhaust first element
     for i, j in zip(prompts, p_cycle):
         output.append((i, j))
-    random.shuffle(output)
+    rng.shuffle(output)
 
     return output
 
@@ -45,21 +48,26 @@ class ELash(EGameFactory):
     file_prompts = "data/elash_prompts_{gid}.txt"
     file_safeties = "data/elash_safeties_{gid}.txt"
 
-    channel_prompts = "elash-prompts"
-    channel_safeties = "elash-safeties"
+    # scraped into `file_prompts` and `file_safeties`
+    scrape_channels = {"prompts": "elash-prompts", "safeties": "elash-safeties"}
 
-    def __init__(self, interaction: discord.Interaction):
-        super().__init__(interaction, __name__)
+    def __init__(
+        self, interaction: discord.Interaction, session_id: Optional[str] = None
+    ):
+        super().__init__(interaction, __name__, session_id)
 
         self.prompts = None
         self.safeties = None
+        # draws prompts without repeats, across games
+        self.prompt_schedule: promptschedule.Schedule = None
 
     async def start(self):
         """Main entry"""
 
         # check if prompts
         if self.prompts is self.safeties is None:
-            # info message
+            # read ahead while the info message is sent
+            self._prefetch_files()
             self.logging.info(f"Reading prompts and safety files for {self.guild.id}.")
             await self.channel.send(
                 embed=self.embed("Reading prompts and safety files...")
@@ -67,8 +75,8 @@ class ELash(EGameFactory):
 
             # read files
             try:
-                self.prompts = self._read_file(self.file_prompts)
-                self.safeties = self._read_file(self.file_safeties)
+                self.prompts = await self._read_file(self.file_prompts)
+                self.safeties = await self._read_file(self.file_safeties)
             except Exception as e:
                 self.logging.error(f"Error reading files {e}")
                 # early exit
@@ -80,6 +88,17 @@ class ELash(EGameFactory):
                 f"Read in {len(self.prompts)} prompts and {len(self.safeties)} safeties."
             )
 
+        # usage of the prompts in earlier games is an input, so that replays draw
+        # the same prompts
+        self.prompt_schedule = await self._input(
+            "prompt_schedule",
+            lambda: promptschedule.load(self.file_prompts, self.prompts),
+            encode=promptschedule.Schedule.state,
+            decode=lambda state: promptschedule.Schedule.from_state(
+                self.prompts, state
+            ),
+        )
+
         # do a round
         return await self.execute_round()
 
@@ -95,14 +114,18 @@ class ELash(EGameFactory):
         - for each vote tally, presenting the scores
         """
         # get prompts for round
-        prompts = {i: random.choice(self.prompts) for i in range(self._num_players)}
-        ordering = randomize_prompts(prompts.keys())
+        prompts = {
+            i: self.prompt_schedule.draw(self.rng) for i in range(self._num_players)
+        }
+        self.prompt_schedule.save()
+        ordering = randomize_prompts(prompts.keys(), self.rng)
 
         # need an immutable reference
         pids = self.players.keys()
 
         # give each player an ordering of prompts
         pidmap = {pid: ordering[i] for i, pid in enumerate(pids)}
+        self.record("prompts", prompts=prompts, ordering=pidmap)
 
         # prompts to players (requires two rounds so even number of answers)
         # create a data structure to hold the results
@@ -112,7 +135,7 @@ class ELash(EGameFactory):
         for game_round in range(2):
             # generate unique content to send to players
             unique_content = {
-                pid: (prompts[order[game_round]], random.choice(self.safeties))
+                pid: (prompts[order[game_round]], self.rng.choice(self.safeties))
                 for pid, order in pidmap.items()
             }
 
@@ -124,17 +147,27 @@ class ELash(EGameFactory):
                 delete_after=True,
                 timeout=self.prompt_duration,
             )
-            await view.send_and_wait(self.channel)
+
+            async def _wait():
+                await view.send_and_wait(self.channel)
+                return view.responses
 
             # get replies
-            replies: Dict[int, Tuple[str, bool]] = view.responses
+            replies: Dict[int, Tuple[str, bool]] = await self._input(
+                "replies",
+                _wait,
+                encode=lambda replies: [
+                    [pid, *reply] for pid, reply in replies.items()
+                ],
+                decode=lambda value: {pid: (r, safety) for pid, r, safety in value},
+            )
 
             for pid in pids:
                 reply, safety = replies.get(pid, (unique_content[pid][1], True))
                 p_num = pidmap[pid][game_round]
                 answers[p_num][pid] = (reply, safety)
 
-        self.logging.info(answers)
+        self.logging.info("Answers %s", Payload(answers))
 
         # present / vote on answers
         for index, solutions in answers.items():
@@ -206,25 +239,23 @@ class ELash(EGameFactory):
         poll = PollView(
             list(self.players.keys()), embed, labels, timeout=self.prompt_duration
         )
-        await poll.send_and_wait(self.channel)
+
+        async def _wait():
+            await poll.send_and_wait(self.channel)
+            return poll.votes, poll.message
+
+        votes, message = await self._input(
+            "votes",
+            _wait,
+            encode=lambda response: response[0],
+            decode=lambda votes: (votes, ReplayMessage(self.channel, embed=embed)),
+        )
 
         # get the results
         result = sorted(
-            ((v, pids[i], i) for (i, v) in enumerate(poll.votes)),
+            ((v, pids[i], i) for (i, v) in enumerate(votes)),
             key=lambda i: i[0],
             reverse=True,
         )
 
-        return poll.message, result
-
-    async def scrape(self, interaction: discord.Interaction) -> str:
-        """TODO"""
-
-        num_prompts = await self._scrape_channel(
-            interaction, self.channel_prompts, self.file_prompts
-        )
-        num_safeties = await self._scrape_channel(
-            interaction, self.channel_safeties, self.file_safeties
-        )
-
-        return f"Scraped {num_prompts} prompts, and {num_safeties} safeties."
+        return message, result
@@ -2,19 +2,31 @@ import asyncio
 
 from collections import defaultdict, namedtuple
 import itertools
-from typing import Callable, List, Union, Tuple
+from typing import Callable, Dict, List, Optional, Union, Tuple
 
 import discord
 
 from abstracts import EGameFactory
+from abstracts.replay import ReplayMessage
+from utils import TestBotUser
+from utils.logs import Payload
 
-from utils.frenchdeck import FrenchDeck, Card
+from utils.frenchdeck import FrenchDeck, Card, FACE_DOWN_ROWS, render_rows
 from interactive import InteractionPipeline, MessageChoiceInteraction
+from games import busengine
 
-RideTheBusQuestion = namedtuple("RideTheBusQuestion", ["choices", "prompt", "handle"])
+RideTheBusQuestion = namedtuple(
+    "RideTheBusQuestion", ["kind", "choices", "prompt", "handle"]
+)
 
 
 class CardPyramid:
+    """Pyramid of cards, dealt face down and uncovered row by row from the bottom.
+
+    Renders are cached: each row is rendered once per number of cards uncovered in
+    it, and the whole pyramid once per position.
+    """
+
     def __init__(self, deck: FrenchDeck, base=4):
         self.base = base
         # index 0 is bottom row
@@ -24,32 +36,54 @@ class CardPyramid:
         self.current_row = 1  # start indexing at 1
         self._current_pos = 0
 
+        # (row index, cards uncovered) -> rendered row
+        self._row_cache: Dict[Tuple[int, int], str] = {}
+        # position the cached renders were made at, see `_position`
+        self._rendered: Tuple[Tuple[int, int], str] = (None, "")
+        self._sparse: Tuple[Tuple[int, int], str] = (None, "")
+
     def __contains__(self, card: Card) -> bool:
         """Returns true is `card` in the currently active row of the pyramid."""
         return card in self._cards[self.current_row - 1]
 
+    def row(self) -> List[Card]:
+        """Cards in the currently active row of the pyramid."""
+        return self._cards[self.current_row - 1]
+
+    def _position(self) -> Tuple[int, int]:
+        return (self.current_row, self._current_pos)
+
+    def _uncovered(self, i: int) -> int:
+        """Number of cards uncovered in row index `i`."""
+        if i < self.current_row - 1:
+            # rows below
+            return len(self._cards[i])
+        if i == self.current_row - 1:
+            return self._current_pos
+        # rows above
+        return 0
+
+    def _render_row(self, i: int) -> str:
+        key = (i, self._uncovered(i))
+        if key not in self._row_cache:
+            uncovered = key[1]
+            self._row_cache[key] = render_rows(
+                [
+                    card.rows if j < uncovered else FACE_DOWN_ROWS
+                    for (j, card) in enumerate(self._cards[i])
+                ]
+            )
+        return self._row_cache[key]
+
     def __str__(self) -> str:
         """Pretty prints the pyramid"""
-        # rows above current line
-        lines = [
-            [FrenchDeck.face_down() for _ in range(self.base - i)]
-            for i in reversed(range(self.current_row, self.base))
-        ]
-        # current line
-        lines.append(
-            [
-                str(card) if i < self._current_pos else FrenchDeck.face_down()
-                for (i, card) in enumerate(self._cards[self.current_row - 1])
-            ]
-        )
-
-        # rows below
-        # pylint: disable=expression-not-assigned
-        [lines.append(self._cards[i]) for i in reversed(range(self.current_row - 1))]
-
-        lines = map(lambda i: FrenchDeck.to_string(*i), lines)
-
-        return "\n".join(lines)
+        position = self._position()
+        if self._rendered[0] != position:
+            self._rendered = (
+                position,
+                "\n".join(self._render_row(i) for i in reversed(range(self.base))),
+            )
+        return self._rendered[1]
 
     def current(self) -> Union[Card, None]:
         if self._current_pos <= 0:
@@ -85,24 +119,18 @@ class CardPyramid:
 
     def sparse(self) -> str:
         """Sparse string of the pyramid"""
-        rep = [
-            "." * (self.base - i) for i in reversed(range(self.current_row, self.base))
-        ]
-
-        num = self._current_pos
-        rep.append("#" * num + "." * ((self.base - self.current_row) - num + 1))
-        # pylint: disable=expression-not-assigned
-        [
-            rep.append("#" * (self.base - i))
-            for i in reversed(range(self.current_row - 1))
-        ]
-
-        return "\n".join(rep)
+        position = self._position()
+        if self._sparse[0] != position:
+            rep = []
+            for i in reversed(range(self.base)):
+                uncovered = self._uncovered(i)
+                rep.append("#" * uncovered + "." * (len(self._cards[i]) - uncovered))
+            self._sparse = (position, "\n".join(rep))
+        return self._sparse[1]
 
     def __iter__(self):
-        self._current_pos = 0
-        self.current_row = 1
-        yield from itertools.chain(*self._cards)
+        """Iterates over all cards, bottom row first. Does not change the position."""
+        return itertools.chain(*self._cards)
 
 
 class RideTheBus(EGameFactory):
@@ -114,8 +142,10 @@ class RideTheBus(EGameFactory):
     cog_help = "TODO"
     has_scrape = False
 
-    def __init__(self, interaction: discord.Interaction):
-        super().__init__(interaction, __name__)
+    def __init__(
+        self, interaction: discord.Interaction, session_id: Optional[str] = None
+    ):
+        super().__init__(interaction, __name__, session_id)
         self.has_scrape = False
 
         # map player id to the cards they currently have
@@ -132,7 +162,7 @@ class RideTheBus(EGameFactory):
         self.deck = None
 
     async def start(self):
-        self.deck = FrenchDeck()
+        self.deck = FrenchDeck(self.rng)
 
         # get immutable ordering
         pids = list(self.players.keys())
@@ -151,6 +181,7 @@ class RideTheBus(EGameFactory):
         )
 
         pyramid = CardPyramid(self.deck)
+        self.record("pyramid", cards=[card.index for card in pyramid])
 
         def get_msg_body():
             return "\n```css\n{}```\n\n".format(pyramid)
@@ -193,6 +224,7 @@ class RideTheBus(EGameFactory):
         self.logging.info("Starting phase 2")
 
         pyramid = CardPyramid(self.deck)
+        self.record("pyramid", cards=[card.index for card in pyramid])
 
         def get_msg_body():
             return "\n```css\n{}```\n\n".format(pyramid) + "\n".join(
@@ -206,6 +238,11 @@ class RideTheBus(EGameFactory):
 
         await asyncio.sleep(self.wait_duration)
 
+        # hands as value histograms, matched against each row by value
+        histograms = {
+            pid: busengine.value_histogram(self._hand_indices(pid)) for pid in pids
+        }
+
         # as many rounds as base of pyramid
         for round_num in range(pyramid.base):
             self.logging.info("Round two: row %d of %d", round_num + 1, pyramid.base)
@@ -220,14 +257,15 @@ class RideTheBus(EGameFactory):
             # check who scored this round
             scores = defaultdict(int)
 
+            values = busengine.row_values(card.index for card in pyramid.row())
             for pid in pids:
-                # create copy of hand
-                hand = self.hands[pid][:]
-
-                # pylint: disable=expression-not-assigned
-                [self.hands[pid].remove(c) for c in hand if c in pyramid]
-                # count removed
-                scores[pid] = len(hand) - len(self.hands[pid])
+                scores[pid] = busengine.match_row(histograms[pid], values)
+                if scores[pid]:
+                    # drop the matched cards from the displayed hand
+                    self.hands[pid] = [
+                        card for card in self.hands[pid] if histograms[pid][card.value]
+                    ]
+            self.record("row_matched", row=round_num, scores=scores)
 
             await asyncio.sleep(self.wait_duration)
 
@@ -250,8 +288,10 @@ class RideTheBus(EGameFactory):
             # scale wait time for number of players
             await asyncio.sleep(len(self.players) * self.wait_duration)
 
-        # announce who is riding the bus: sorry first person in list ://
-        br_pid = min(self.hands.items(), key=lambda i: i[1])[0]
+        # announce who is riding the bus: most cards left, and on a tie, sorry
+        # first person in list ://
+        br_pid = max(pids, key=lambda pid: sum(histograms[pid]))
+        self.record("bus_rider", pid=br_pid)
 
         await self.channel.send(
             embed=self.embed(
@@ -296,22 +336,44 @@ class RideTheBus(EGameFactory):
             "Posing %s to player %s.", question.choices, self.players[pid]
         )
 
-        ipl = InteractionPipeline(MessageChoiceInteraction(pid, question.choices))
-
         # get user response to question
-        prompt = prompt_prefix + self._make_prompt(pid, question.prompt)
-        response = await ipl.send_and_watch(
-            self.channel,
-            self.embed(prompt + self._hand_to_string(pid, prefix="Your hand:\n")),
-            edit_message=edit_message,
+        prompt = (
+            prompt_prefix
+            + self._make_prompt(pid, question.prompt)
+            + self._odds_to_string(pid, question.kind)
         )
+        embed = self.embed(prompt + self._hand_to_string(pid, prefix="Your hand:\n"))
+
+        if pid == TestBotUser.test_bot_id:
+            # the test bot plays the odds without waiting for the timeout
+            answer = busengine.best_answer(question.kind, self._hand_indices(pid))
+            if edit_message:
+                message = edit_message
+                await message.edit(embed=embed)
+            else:
+                message = await self.channel.send(embed=embed)
+        else:
+            ipl = InteractionPipeline(MessageChoiceInteraction(pid, question.choices))
 
-        self.logging.info("Response: %s", response)
+            async def _wait():
+                response = await ipl.send_and_watch(
+                    self.channel, embed, edit_message=edit_message
+                )
+                self.logging.info("Response: %s", response)
+                return (
+                    response.get(MessageChoiceInteraction.name).get(pid, ""),
+                    response.message,
+                )
 
-        if "messagechoice" in response["response"]:
-            answer = response["response"]["messagechoice"].get(pid, "")
-        else:
-            answer = ""
+            answer, message = await self._input(
+                "answer",
+                _wait,
+                encode=lambda response: response[0],
+                decode=lambda answer: (
+                    answer,
+                    edit_message or ReplayMessage(self.channel, embed=embed),
+                ),
+            )
 
         # get result of question
         colour, outcome = question.handle(pid, answer, card, amount=1 * modifier)
@@ -324,70 +386,62 @@ class RideTheBus(EGameFactory):
         )
 
         # update message with result
-        await response["message"].edit(embed=self.embed(result, colour=colour))
+        await message.edit(embed=self.embed(result, colour=colour))
 
     @property
     def _red_or_black(self) -> RideTheBusQuestion:
-        return RideTheBusQuestion(
-            choices=["red", "black"],
-            prompt="**Red** or **Black**?",
-            handle=self._make_handler(
-                lambda hand, answer, card: (answer == "black" and card.is_black)
-                or (answer == "red" and not card.is_black)
-            ),
-        )
+        return self._make_question(busengine.RED_OR_BLACK, "**Red** or **Black**?")
 
     @property
     def _higher_or_lower(self) -> RideTheBusQuestion:
-        return RideTheBusQuestion(
-            choices=["higher", "lower"],
-            prompt="**Higher** or **Lower**?",
-            handle=self._make_handler(
-                lambda hand, answer, card: (answer == "higher" and card >= hand[-1])
-                or (answer == "lower" and card < hand[-1])
-            ),
+        return self._make_question(
+            busengine.HIGHER_OR_LOWER, "**Higher** or **Lower**?"
         )
 
     @property
     def _inbetween(self) -> RideTheBusQuestion:
-        return RideTheBusQuestion(
-            choices=["inbetween", "outside"],
-            prompt="**Inbetween** or **Outside**?",
-            handle=self._make_handler(
-                lambda hand, answer, card: (
-                    answer == "inbetween" and card.is_inbetween(hand[-2:-1])
-                )
-                or (answer == "outside" and not card.is_inbetween(hand[-2:-1]))
-            ),
-        )
+        return self._make_question(busengine.INBETWEEN, "**Inbetween** or **Outside**?")
 
     @property
     def _guess_suit(self) -> RideTheBusQuestion:
+        return self._make_question(
+            busengine.GUESS_SUIT,
+            "Guess the suit: **Hearts**, **Diamonds**, **Clubs**, or **Spades**?",
+        )
+
+    def _make_question(self, kind: str, prompt: str) -> RideTheBusQuestion:
         return RideTheBusQuestion(
-            choices=["hearts", "spades", "diamonds", "clubs", "broccoli"],
-            prompt="Guess the suit: **Hearts**, **Diamonds**, **Clubs**, or **Spades**?",
-            handle=self._make_handler(
-                lambda hand, answer, card: (answer == "spades" and card.suit == "S")
-                or (answer == "hearts" and card.suit == "H")
-                or (answer == "diamonds" and card.suit == "D")
-                or (answer in ["clubs", "broccoli"] and card.suit == "C")
-            ),
+            kind=kind,
+            choices=busengine.choices(kind),
+            prompt=prompt,
+            handle=self._make_handler(kind),
         )
 
-    def _make_handler(
-        self, func: Callable[[List[Card], str, Card], bool]
-    ) -> Callable[[int, str, Card], str]:
+    def _make_handler(self, kind: str) -> Callable[[int, str, Card], str]:
         def handler(
             pid: int, answer: str, card: Card, amount=1
         ) -> Tuple[discord.Colour, str]:
             hand = self.hands[pid]
-            self.logging.info("pid %d gave answer '%s'", pid, answer)
-            if hand:
-                self.logging.info("card < hand[-1] %s", card < hand[-1])
-                self.logging.info("card > hand[-1] %s", card > hand[-1])
 
             # check outcome
-            if func(hand, answer, card):
+            correct = busengine.judge(kind, answer, self._hand_indices(pid), card.index)
+            self.record(
+                "answered",
+                pid=pid,
+                question=kind,
+                answer=answer,
+                card=card.index,
+                correct=correct,
+            )
+            self.logging.debug(
+                "pid %d gave answer '%s' for %s against %s: %s",
+                pid,
+                answer,
+                Payload(card),
+                Payload(hand[-2:]),
+                correct,
+            )
+            if correct:
                 ret = (
                     discord.Colour.green(),
                     f"You are Correct! **Hand out {amount} drink{'s' if amount > 1 else ''}.**",
@@ -403,14 +457,25 @@ class RideTheBus(EGameFactory):
                     f"You didn't provide a suitable answer. **Drink {amount} sip{'s' if amount > 1 else ''}!**",
                 )
 
-            self.logging.info("Returning string '%s'", ret[1])
-
             # add card to hand
             self.hands[pid].append(card)
             return ret
 
         return handler
 
+    def _hand_indices(self, pid: int) -> List[int]:
+        return [card.index for card in self.hands[pid]]
+
+    def _odds_to_string(self, pid: int, kind: str) -> str:
+        if len(self.hands[pid]) < busengine.HAND_REQUIRED[kind]:
+            return ""
+        odds = busengine.odds(kind, self._hand_indices(pid))
+        return (
+            "Odds: "
+            + ", ".join(f"{answer} {p * 100:.0f}%" for answer, p in odds.items())
+            + "\n"
+        )
+
     def _make_prompt(self, pid: int, question: str) -> str:
         return f"@{self.players[pid].name}: {question}\n"
 
@@ -1,3 +1,4 @@
+from interactive.monitor import MonitorResult, PipelineResult
 from interactive.pipeline import InteractionPipeline
 from interactive.replies import ReplyInteraction
 from interactive.buttons import ButtonInteraction
@@ -1,7 +1,8 @@
 import logging
+from typing import Optional
 
 from utils.lookups import EMOJI_FORWARD, EMOJI_BACKWARD
-from interactive.monitor import Monitor
+from interactive.monitor import Monitor, MonitorResult
 
 
 class ButtonInteraction(Monitor):
@@ -27,23 +28,20 @@ class ButtonInteraction(Monitor):
         for emoji in self.emojis:
             await message.add_reaction(emoji)
 
-    async def monitor(self, message) -> dict:
-        selections = filter(
-            lambda x: x[1] > 1,
-            (
-                (EMOJI_BACKWARD[i.emoji], i.count)
-                for i in message.reactions
-                if i.emoji in self.emojis
-            ),
-        )
+    async def monitor(self, message) -> Optional[MonitorResult]:
+        # subtract 1 for bot
+        selections = {
+            EMOJI_BACKWARD[i.emoji]: i.count - 1
+            for i in message.reactions
+            if i.emoji in self.emojis and i.count > 1
+        }
         if selections:
             # hot branch
             if self.callback:
                 self.callback(message)
 
-            # subtract 1 for bot
-            return {i[0]: i[1] - 1 for i in selections}
+            return self.result(selections)
 
         else:
             # cold branch
-            return {}
+            return None
@@ -50,10 +50,19 @@ class CardsPrompt(discord.ui.View):
 
 
 class SafetyCardsPrompt(CardsPrompt):
-    def __init__(self, resolve_text: str, hand: List[str], safety: str, **kwargs):
+    def __init__(
+        self,
+        resolve_text: str,
+        hand: List[str],
+        safety: str,
+        rng: random.Random = random,
+        **kwargs,
+    ):
+        # pylint: disable=too-many-arguments
         super().__init__(resolve_text, hand, **kwargs)
         self.hand = hand
         self.redraw = False
+        self._rng = rng
 
         safety_button = discord.ui.Button(
             label="Play safety",
@@ -72,7 +81,7 @@ class SafetyCardsPrompt(CardsPrompt):
         self.add_item(redraw_button)
 
     async def on_redraw_press(self, interaction: discord.Interaction):
-        index = random.choice(range(len(self.hand)))
+        index = self._rng.choice(range(len(self.hand)))
         self.display_response = self.hand[index]
         self.result = index
         self.redraw = True
@@ -82,13 +91,14 @@ class SafetyCardsPrompt(CardsPrompt):
 
 class CardsGetPromptView(UserUniqueView[List[str], Tuple[int, bool]]):
     def __init__(
-        self, embed, title: str, prompt: str, leader: int, content: Dict[int, List[str]], **kwargs
+        self, embed, title: str, prompt: str, leader: int, content: Dict[int, List[str]], rng: random.Random = random, **kwargs
     ):
         # pylint: disable=too-many-arguments
         super().__init__(embed, "Select card", content, **kwargs)
         self.title = title
         self.leader = leader
         self.prompt = prompt
+        self._rng = rng
 
     def get_repeat_interaction_message(self, uid) -> str:
         if uid == self.leader:
@@ -112,7 +122,7 @@ class CardsGetPromptView(UserUniqueView[List[str], Tuple[int, bool]]):
         hand = user_data
         visible_hand = hand[:-1]
         safety = hand[-1]
-        prompt = SafetyCardsPrompt("Result selected", visible_hand, safety, timeout=self.time)
+        prompt = SafetyCardsPrompt("Result selected", visible_hand, safety, rng=self._rng, timeout=self.time)
         message_content = f"**{self.prompt}**\nSelect a card!\n" + "\n".join(
             f"{EMOJI_FORWARD[index + 1]}: {card}" for index, card in enumerate(visible_hand)
         )
@@ -1,7 +1,8 @@
 import logging
+from typing import Optional
 
 from utils.lookups import EMOJI_FORWARD, EMOJI_BACKWARD
-from interactive.monitor import Monitor
+from interactive.monitor import Monitor, MonitorResult
 
 
 class ChoiceInteraction(Monitor):
@@ -37,7 +38,7 @@ class ChoiceInteraction(Monitor):
 
         return embed
 
-    async def monitor(self, message) -> dict:
+    async def monitor(self, message) -> Optional[MonitorResult]:
         if self.max_votes:
             count = sum(
                 map(
@@ -46,18 +47,20 @@ class ChoiceInteraction(Monitor):
                 )
             )
             if count >= self.max_votes:
-                return {self.name: count}
+                return self.result({self.name: count})
 
-        return {}
+        return None
 
     async def post_format(self, message):
         for emoji in self.emojis:
             await message.add_reaction(emoji)
 
-    async def finalize(self, message):
+    async def finalize(self, message) -> Optional[MonitorResult]:
         # subtract 1 for bot
-        return {
-            EMOJI_BACKWARD[i.emoji]: i.count - 1
-            for i in message.reactions
-            if i.emoji in self.emojis
-        }
+        return self.result(
+            {
+                EMOJI_BACKWARD[i.emoji]: i.count - 1
+                for i in message.reactions
+                if i.emoji in self.emojis
+            }
+        )
@@ -1,18 +1,24 @@
+import random
+
 import discord
 
 from interactive.timedview import TimedView
 
 from econfig import PLAYER_GATHER_TIMEOUT, TEST_BOT_ENABLED
-from utils import random_emoji, async_context_wrap, TestBotUser
+from utils import random_emoji, async_context_wrap, EmojiPool, TestBotUser
 from utils.lookups import EMOJI_FORWARD
 
 
 class GatherPlayersView(TimedView):
-    def __init__(self, embed):
-        super().__init__(embed, timeout=PLAYER_GATHER_TIMEOUT)
+    def __init__(
+        self, embed, rng: random.Random = random, timeout=PLAYER_GATHER_TIMEOUT
+    ):
+        super().__init__(embed, timeout=timeout)
         self.players = []
+        # no two players share a symbol
         if TEST_BOT_ENABLED:
             self.players.append((TestBotUser(), EMOJI_FORWARD["robot"]))
+        self._symbols = EmojiPool(rng, reserved=(s for (_, s) in self.players))
         self.text: str = embed.description
 
         btn = discord.ui.Button(
@@ -48,7 +54,7 @@ class GatherPlayersView(TimedView):
 
     async def button_callback(self, interaction: discord.Interaction):
         # append user
-        self.players.append((interaction.user, random_emoji()))
+        self.players.append((interaction.user, self._symbols.draw()))
         await self._update_player_list()
         # keep listening for more events
         await interaction.response.defer()
@@ -1,8 +1,8 @@
 import logging
-
+from typing import Optional
 
 from utils.lookups import EMOJI_FORWARD
-from interactive.monitor import Monitor
+from interactive.monitor import Monitor, MonitorResult
 
 
 class MessageInteraction(Monitor):
@@ -17,7 +17,7 @@ class MessageInteraction(Monitor):
         embed.set_footer(text=f"Message this DM to submit an answer.\n{footer_text}")
         return embed
 
-    async def monitor(self, original, message) -> dict:
+    async def monitor(self, original, message) -> Optional[MonitorResult]:
         # pylint: disable=arguments-differ
 
         self.logging.info(
@@ -26,4 +26,4 @@ class MessageInteraction(Monitor):
 
         await message.add_reaction(EMOJI_FORWARD["checkmark"])
 
-        return {message.author.id: message}
+        return self.result({message.author.id: message})
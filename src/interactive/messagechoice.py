@@ -1,9 +1,9 @@
 import logging
 import re
-from typing import List
+from typing import List, Optional
 
 from utils.lookups import EMOJI_FORWARD
-from interactive.monitor import Monitor
+from interactive.monitor import Monitor, MonitorResult
 
 
 class MessageChoiceInteraction(Monitor):
@@ -23,7 +23,7 @@ class MessageChoiceInteraction(Monitor):
         )
         return embed
 
-    async def monitor(self, original, message) -> dict:
+    async def monitor(self, original, message) -> Optional[MonitorResult]:
         # pylint: disable=arguments-differ,unused-argument
 
         if message.author.id == self.target_pid:
@@ -37,8 +37,8 @@ class MessageChoiceInteraction(Monitor):
                 # emoji react
                 await message.add_reaction(EMOJI_FORWARD["checkmark"])
 
-                return {
-                    message.author.id: matches[0].lower()
-                }  # always return first match
+                return self.result(
+                    {message.author.id: matches[0].lower()}
+                )  # always return first match
 
-        return {}
+        return None
@@ -1,5 +1,71 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
 import discord
 
+from utils import dmerge
+
+
+@dataclass
+class MonitorResult:
+    """Result of a single :class:`Monitor` stage.
+
+    :param name: The `name` of the monitor which produced the result.
+    :param value: The monitor specific payload, e.g. reaction counts or replies
+        indexed by user id.
+    """
+
+    __slots__ = ("name", "value")
+
+    name: str
+    value: dict
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+
+@dataclass
+class PipelineResult:
+    """Aggregate of all :class:`MonitorResult` instances produced whilst watching
+    a message with :class:`interactive.InteractionPipeline`.
+
+    :param message: The watched message, or `None` if the result is a merge over
+        several messages.
+    :param results: Monitor results indexed by monitor name.
+    """
+
+    __slots__ = ("message", "results")
+
+    message: Optional[discord.Message]
+    results: Dict[str, MonitorResult]
+
+    def add(self, result: Optional[MonitorResult]):
+        """Store `result`, overwriting any prior result from the same monitor.
+        Empty results are ignored."""
+        if result:
+            self.results[result.name] = result
+
+    def get(self, name: str) -> dict:
+        """Payload of the monitor called `name`, or an empty dictionary if the
+        monitor produced no result."""
+        result = self.results.get(name, None)
+        return result.value if result else {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.results
+
+    @classmethod
+    def merge(cls, *pipeline_results: "PipelineResult") -> "PipelineResult":
+        """Deep merge the payloads of several pipeline results, e.g. for the same
+        pipeline sent to multiple channels."""
+        names = {name for pr in pipeline_results for name in pr.results.keys()}
+        merged = cls(None, {})
+        for name in names:
+            merged.add(
+                MonitorResult(name, dmerge(*(pr.get(name) for pr in pipeline_results)))
+            )
+        return merged
+
 
 class Monitor:
     name = ""
@@ -11,6 +77,13 @@ class Monitor:
         else:
             return ""
 
+    def result(self, value: dict) -> Optional[MonitorResult]:
+        """Wrap `value` in a :class:`MonitorResult` for this monitor. Returns `None`
+        for empty values, so that nothing is allocated on quiet ticks."""
+        if value:
+            return MonitorResult(self.name, value)
+        return None
+
     def reset(self):
         # pylint: disable=unused-argument
         ...
@@ -22,10 +95,10 @@ class Monitor:
         # pylint: disable=unused-argument
         ...
 
-    async def monitor(self, message) -> dict:
+    async def monitor(self, message) -> Optional[MonitorResult]:
         # pylint: disable=unused-argument
-        return {}
+        return None
 
-    async def finalize(self, message) -> dict:
+    async def finalize(self, message) -> Optional[MonitorResult]:
         # pylint: disable=unused-argument
-        ...
+        return None
@@ -1,9 +1,11 @@
 import logging
-from typing import Union
+from typing import Optional, Union
 
 import discord
 
 from utils import Clock
+from utils.metrics import METRICS
+from interactive.monitor import MonitorResult, PipelineResult
 
 
 class InteractionPipeline:
@@ -25,7 +27,7 @@ class InteractionPipeline:
         embed: discord.Embed,
         timeout: int = 16,
         edit_message: Union[None, discord.Message] = None,
-    ) -> dict:
+    ) -> PipelineResult:
         # apply formats to embed and reset pipeline state
         for p in self.pipeline:
             p.reset()
@@ -43,9 +45,7 @@ class InteractionPipeline:
             await p.post_format(message)
 
         # watch the message
-        message, result = await self._watch(message, timeout)
-
-        return {"message": message, "response": result}
+        return await self._watch(message, timeout)
 
     def _closure_capture(self, message):
         em = message.embeds[-1]
@@ -60,7 +60,7 @@ class InteractionPipeline:
             em.set_footer(text=footer_text + text)
             await message.edit(embed=em)
 
-        async def callback(rt) -> dict:
+        async def tick(rt) -> Optional[MonitorResult]:
             # update info
             await update_footer(f"\nTime Remaining: {rt}s")
 
@@ -77,7 +77,7 @@ class InteractionPipeline:
                         if ret:
                             # early exit + reset footer
                             await update_footer("")
-                            return {p.name: ret}
+                            return ret
 
             if observing:
                 # can't reassign to capture, so temp variable
@@ -90,27 +90,36 @@ class InteractionPipeline:
                     if ret:
                         # early exit + reset footer
                         await update_footer("")
-                        return {p.name: ret}
+                        return ret
 
             # return falsey
-            return {}
+            return None
+
+        async def callback(rt) -> Optional[MonitorResult]:
+            with METRICS.timer("ebot_pipeline_tick_seconds"):
+                return await tick(rt)
 
         return callback
 
-    async def _watch(self, message, timeout: int) -> tuple:
-        clock = Clock(timeout, self._closure_capture(message))
+    async def _watch(self, message, timeout: int) -> PipelineResult:
+        monitors = ",".join(p.name for p in self.pipeline)
+        with METRICS.timer("ebot_pipeline_seconds", monitors=monitors):
+            return await self._watch_message(message, timeout)
+
+    async def _watch_message(self, message, timeout: int) -> PipelineResult:
+        clock = Clock(timeout, self._closure_capture(message), default_return=False)
 
         self.logging.info(f"Monitoring for {timeout}s")
 
-        result = await clock.start()
+        early_exit = await clock.start()
 
         # update message reference
         message = await message.channel.fetch_message(message.id)
+        result = PipelineResult(message, {})
+        result.add(early_exit)
 
         for p in self.pipeline:
-            p_result = await p.finalize(message)
-
-            if p_result:
-                result[p.name] = p_result
+            # finalized results take precedence
+            result.add(await p.finalize(message))
 
-        return message, result
+        return result
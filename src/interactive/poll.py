@@ -1,9 +1,9 @@
 import logging
-from typing import List
+from typing import List, Optional
 
 import discord
 from interactive.timedview import TimedView
-from interactive.monitor import Monitor
+from interactive.monitor import Monitor, MonitorResult
 
 from utils.lookups import EMOJI_FORWARD, EMOJI_BACKWARD, random_emoji
 from utils import async_context_wrap
@@ -111,10 +111,12 @@ class PollInteraction(Monitor):
         for emoji in self.emojis:
             await message.add_reaction(emoji)
 
-    async def finalize(self, message):
+    async def finalize(self, message) -> Optional[MonitorResult]:
         # subtract 1 for bot
-        return {
-            EMOJI_BACKWARD[i.emoji]: i.count - 1
-            for i in message.reactions
-            if i.emoji in self.emojis
-        }
+        return self.result(
+            {
+                EMOJI_BACKWARD[i.emoji]: i.count - 1
+                for i in message.reactions
+                if i.emoji in self.emojis
+            }
+        )
@@ -1,7 +1,8 @@
 import logging
+from typing import Optional
 
 from utils.lookups import EMOJI_FORWARD
-from interactive.monitor import Monitor
+from interactive.monitor import Monitor, MonitorResult
 
 
 class ReplyInteraction(Monitor):
@@ -20,7 +21,7 @@ class ReplyInteraction(Monitor):
         embed.set_footer(text=f"Reply to this message.\n{footer_text}")
         return embed
 
-    async def monitor(self, original, message) -> dict:
+    async def monitor(self, original, message) -> Optional[MonitorResult]:
         # pylint: disable=arguments-differ
         if (
             message.reference
@@ -35,7 +36,7 @@ class ReplyInteraction(Monitor):
 
             await message.add_reaction(EMOJI_FORWARD["checkmark"])
 
-        return {}
+        return None
 
-    async def finalize(self, message):
-        return {i.author.id: i for i in self.replies}
+    async def finalize(self, message) -> Optional[MonitorResult]:
+        return self.result({i.author.id: i for i in self.replies})
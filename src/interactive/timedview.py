@@ -3,6 +3,8 @@ import logging
 
 import discord
 
+from utils.metrics import METRICS
+
 logger = logging.Logger(__name__)
 
 
@@ -22,6 +24,12 @@ class TimedView(discord.ui.View):
         self.message: discord.Message = None
 
     async def send_and_wait(self, channel: discord.TextChannel):
+        view_name = self.__class__.__name__
+        METRICS.inc("ebot_views_total", view=view_name)
+        with METRICS.timer("ebot_view_seconds", view=view_name):
+            await self._send_and_wait(channel)
+
+    async def _send_and_wait(self, channel: discord.TextChannel):
         self.embed.set_footer(text=self.TIME_FMT.format(self.time))
         self.message = await channel.send(embed=self.embed, view=self)
 
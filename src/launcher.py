@@ -0,0 +1,81 @@
+"""
+Runs the bot sharded over several processes, so that it can use several cores.
+
+The shards are spread evenly over the processes, and each process runs the bot
+with `SHARD_COUNT` and `SHARD_IDS` set, see `__main__.py`. Guilds are assigned to
+shards by discord, so each process holds the state of its own guilds only.
+```bash
+python src/launcher.py --processes 4 --shard-count 16
+```
+Stopping the launcher stops all of the processes; if any process exits, the others
+are stopped too.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List
+
+from utils.shards import format_shard_ids
+
+SRC = os.path.dirname(os.path.abspath(__file__))
+
+
+def spread(shard_count: int, processes: int) -> List[List[int]]:
+    """Shard ids of each process, as contiguous runs of near equal length."""
+    per, extra = divmod(shard_count, processes)
+    groups, first = [], 0
+    for i in range(processes):
+        size = per + (1 if i < extra else 0)
+        groups.append(list(range(first, first + size)))
+        first += size
+    return [g for g in groups if g]
+
+
+def launch(shard_count: int, processes: int) -> int:
+    children = []
+    for shard_ids in spread(shard_count, processes):
+        env = dict(
+            os.environ,
+            SHARD_COUNT=str(shard_count),
+            SHARD_IDS=format_shard_ids(shard_ids),
+        )
+        print(f"Starting shards {env['SHARD_IDS']} of {shard_count}", flush=True)
+        children.append(subprocess.Popen([sys.executable, SRC], env=env))
+
+    def _stop(*_):
+        for child in children:
+            if child.poll() is None:
+                child.terminate()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    try:
+        while all(child.poll() is None for child in children):
+            time.sleep(1)
+    finally:
+        _stop()
+        codes = [child.wait() for child in children]
+    return max(abs(code) for code in codes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes to run, defaults to one per core.",
+    )
+    parser.add_argument(
+        "--shard-count",
+        type=int,
+        default=None,
+        help="Total number of shards, defaults to one per process. Should be at"
+        " least the number discord recommends for the bot.",
+    )
+    args = parser.parse_args()
+    sys.exit(launch(args.shard_count or args.processes, args.processes))
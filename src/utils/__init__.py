@@ -1,5 +1,15 @@
 from utils.clock import Clock
 from utils.merge import dmerge
-from utils.lookups import random_emoji
+from utils.metrics import METRICS
 from utils.misc import async_context_wrap
 from utils.testbotuser import TestBotUser
+
+
+def __getattr__(name):
+    # `lookups` holds the emoji table, so only import it when it is used
+    # pylint: disable=import-outside-toplevel
+    if name in ("random_emoji", "EmojiPool"):
+        from utils import lookups
+
+        return getattr(lookups, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,83 @@
+"""
+Index of the channels of each guild by name.
+
+The index of a guild is built from `guild.channels` on its first lookup, and kept
+up to date from the channel create, delete, and update gateway events by the
+:mod:`cogs.channel_index` cog.
+"""
+
+from typing import Dict, List
+
+import discord
+
+
+class ChannelNotFound(LookupError):
+    """No channel of the given name in the guild."""
+
+    def __init__(self, guild: discord.Guild, name: str):
+        super().__init__(f"There is no channel named #{name} in {guild.name}.")
+        self.guild = guild
+        self.name = name
+
+
+class ChannelIndex:
+    """Channels by guild id and name. Names are not unique within a guild; lookups
+    return the first of the channels of a name by position."""
+
+    def __init__(self):
+        self._guilds: Dict[int, Dict[str, List[discord.abc.GuildChannel]]] = {}
+
+    def _build(self, guild: discord.Guild) -> Dict[str, List[discord.abc.GuildChannel]]:
+        index = {}
+        for channel in guild.channels:
+            index.setdefault(channel.name, []).append(channel)
+        for channels in index.values():
+            channels.sort(key=lambda c: c.position)
+        self._guilds[guild.id] = index
+        return index
+
+    def get(self, guild: discord.Guild, name: str) -> discord.abc.GuildChannel:
+        """The channel named `name` in `guild`.
+
+        :raises ChannelNotFound: If there is no such channel.
+        """
+        index = self._guilds.get(guild.id, None)
+        if index is None or name not in index:
+            # a miss may be an event not seen, e.g. before the cog loaded
+            index = self._build(guild)
+        channels = index.get(name, None)
+        if not channels:
+            raise ChannelNotFound(guild, name)
+        return channels[0]
+
+    def add(self, channel: discord.abc.GuildChannel):
+        index = self._guilds.get(channel.guild.id, None)
+        if index is None:
+            # built with the channel on first lookup
+            return
+        channels = index.setdefault(channel.name, [])
+        channels.append(channel)
+        channels.sort(key=lambda c: c.position)
+
+    def remove(self, channel: discord.abc.GuildChannel, name: str = None):
+        """Remove `channel`, indexed under `name` if it has since been renamed."""
+        index = self._guilds.get(channel.guild.id, None)
+        if index is None:
+            return
+        name = channel.name if name is None else name
+        channels = [c for c in index.get(name, []) if c.id != channel.id]
+        if channels:
+            index[name] = channels
+        else:
+            index.pop(name, None)
+
+    def update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        self.remove(after, before.name)
+        self.add(after)
+
+    def forget(self, guild: discord.Guild):
+        """Drop the index of `guild`, e.g. when the bot leaves it."""
+        self._guilds.pop(guild.id, None)
+
+
+CHANNELS = ChannelIndex()
@@ -0,0 +1,194 @@
+"""
+Ingestion of scraped corpora, such as prompts and safeties.
+
+Scraped messages are normalized, empties dropped, and duplicates removed: exact
+duplicates by a hash of their normalized text, near duplicates (such as a repeated
+or missing filler word in a long entry) by MinHash locality sensitive hashing over
+word shingles, confirmed with their exact Jaccard similarity. Entries differing by
+a word that changes their meaning are kept: one changed word breaks every shingle
+it is part of, so entries of up to about 40 words stay below the threshold, see
+`econfig.CORPUS_NEAR_DUPLICATE_THRESHOLD`.
+
+Each corpus file has a compact index next to it, `<file>.index.json`, with the
+ingestion statistics and the MinHash signature of every entry kept, so that
+rescraping a channel only computes signatures for new messages.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import struct
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils import fileio
+
+import econfig
+
+# 2: word shingles, rather than character shingles
+INDEX_VERSION = 2
+
+# words per shingle
+SHINGLE_SIZE = 2
+# MinHash signature length, as `BANDS` bands of `ROWS` values; entries with a
+# Jaccard similarity above roughly (1 / BANDS) ** (1 / ROWS) ~ 0.6 become candidates
+BANDS = 8
+ROWS = 4
+
+_MERSENNE = (1 << 61) - 1
+_MASK = (1 << 32) - 1
+# fixed so that signatures are stable across runs and can be cached in the index
+_PERMUTATIONS = [
+    (
+        int.from_bytes(hashlib.blake2b(b"a%d" % i, digest_size=8).digest(), "big")
+        % (_MERSENNE - 1)
+        + 1,
+        int.from_bytes(hashlib.blake2b(b"b%d" % i, digest_size=8).digest(), "big")
+        % _MERSENNE,
+    )
+    for i in range(BANDS * ROWS)
+]
+_SIGNATURE = struct.Struct(f">{BANDS * ROWS}I")
+
+_WHITESPACE = re.compile(r"\s+")
+_NOT_WORD = re.compile(r"[\W_]+")
+
+Signature = Tuple[int, ...]
+
+
+def normalize(text: str) -> str:
+    """`text` stripped, with runs of whitespace, including new lines, collapsed to
+    a single space; corpus files hold one entry per line."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _comparable(text: str) -> str:
+    """Form of normalized `text` that duplicates are compared by: case folded,
+    with punctuation removed."""
+    return _NOT_WORD.sub(" ", text.casefold()).strip()
+
+
+def entry_hash(comparable: str) -> str:
+    return hashlib.blake2b(comparable.encode(), digest_size=8).hexdigest()
+
+
+def shingles(comparable: str) -> Set[str]:
+    words = comparable.split(" ")
+    if len(words) <= SHINGLE_SIZE:
+        return {comparable}
+    return {
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def minhash(shingle_set: Iterable[str]) -> Signature:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingle_set
+    ]
+    return tuple(
+        min(((a * h + b) % _MERSENNE) & _MASK for h in hashes) for a, b in _PERMUTATIONS
+    )
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b)
+
+
+def _encode_signature(signature: Signature) -> str:
+    return base64.b64encode(_SIGNATURE.pack(*signature)).decode()
+
+
+def _decode_signature(encoded: str) -> Signature:
+    return _SIGNATURE.unpack(base64.b64decode(encoded))
+
+
+def ingest(
+    texts: Iterable[str],
+    previous: Optional[dict] = None,
+    threshold: Optional[float] = None,
+) -> Tuple[List[str], dict]:
+    """Normalize and deduplicate `texts`, keeping the first of any duplicates.
+    Blocking; run with :func:`utils.fileio.run` for large corpora.
+
+    :param texts: Scraped entries, e.g. message contents.
+    :param previous: Index of an earlier ingestion of the same corpus, whose
+        signatures are reused.
+    :param threshold: Jaccard similarity of shingles at or above which entries
+        are near duplicates; defaults to `econfig.CORPUS_NEAR_DUPLICATE_THRESHOLD`.
+
+    :return: Entries kept, and the index of the corpus.
+    """
+    if threshold is None:
+        threshold = econfig.CORPUS_NEAR_DUPLICATE_THRESHOLD
+    cached: Dict[str, str] = {}
+    if previous and previous.get("version") == INDEX_VERSION:
+        cached = previous.get("signatures", {})
+
+    stats = {"scraped": 0, "empty": 0, "duplicate": 0, "near_duplicate": 0}
+    kept: List[str] = []
+    signatures: Dict[str, str] = {}
+    kept_shingles: List[Set[str]] = []
+    # (band, band values) -> indices of kept entries
+    buckets: Dict[Tuple[int, Signature], List[int]] = {}
+
+    for text in texts:
+        stats["scraped"] += 1
+        entry = normalize(text)
+        comparable = _comparable(entry)
+        if not comparable:
+            stats["empty"] += 1
+            continue
+
+        key = entry_hash(comparable)
+        if key in signatures:
+            stats["duplicate"] += 1
+            continue
+
+        shingle_set = shingles(comparable)
+        if key in cached:
+            signature = _decode_signature(cached[key])
+        else:
+            signature = minhash(shingle_set)
+
+        bands = [
+            (band, signature[band * ROWS : (band + 1) * ROWS]) for band in range(BANDS)
+        ]
+        candidates = {i for band in bands for i in buckets.get(band, ())}
+        if any(jaccard(shingle_set, kept_shingles[i]) >= threshold for i in candidates):
+            stats["near_duplicate"] += 1
+            continue
+
+        for band in bands:
+            buckets.setdefault(band, []).append(len(kept))
+        kept.append(entry)
+        kept_shingles.append(shingle_set)
+        signatures[key] = _encode_signature(signature)
+
+    stats["kept"] = len(kept)
+    return kept, {"version": INDEX_VERSION, "stats": stats, "signatures": signatures}
+
+
+def index_path(path: str) -> str:
+    return f"{path}.index.json"
+
+
+async def load_index(path: str) -> Optional[dict]:
+    """Index of the corpus at `path`, or `None` if it has none or it is unreadable."""
+    try:
+        return json.loads(await fileio.read_text(index_path(path)))
+    except (OSError, ValueError):
+        return None
+
+
+async def write(path: str, texts: Iterable[str]) -> dict:
+    """Ingest `texts` and replace the corpus at `path`, and its index, with the
+    result.
+
+    :return: The ingestion statistics.
+    """
+    entries, index = await fileio.run(ingest, list(texts), await load_index(path))
+    await fileio.write_lines(path, entries)
+    await fileio.write_lines(index_path(path), [json.dumps(index)])
+    return index["stats"]
@@ -0,0 +1,76 @@
+"""
+Append-only event log of a game session.
+
+Events are dictionaries with a `kind`, the seconds `t` since the session started,
+and any JSON serialisable fields. They are written as line delimited JSON, in
+batches, through :func:`utils.fileio.write_behind`:
+```
+{"kind":"session","t":0.0,"game":"games.ridethebus.RideTheBus",...}
+{"kind":"input","t":4.2,"input":"players","value":[[1234,"name","🐙"]]}
+```
+"""
+
+import json
+import os
+import time
+from typing import List, Optional
+
+from utils import fileio
+
+import econfig
+
+
+def session_path(session_id: str) -> str:
+    """Default location of the log of session `session_id`."""
+    return os.path.join(econfig.PATH_EXTENSION, "data/sessions", f"{session_id}.jsonl")
+
+
+def normalize(value):
+    """`value` as it reads back from a log, e.g. with tuples as lists."""
+    return json.loads(json.dumps(value))
+
+
+def read_events(path: str) -> List[dict]:
+    """All events in the log at `path`. Blocking."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class EventLog:
+    """Records the events of a session, in memory and optionally to disk.
+
+    :param path: File to append events to, or `None` to only keep them in memory.
+    :param buffer_size: Number of events to buffer before writing.
+    """
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = 32):
+        self.path = path
+        self.buffer_size = buffer_size
+
+        self.events: List[dict] = []
+        self._buffer: List[str] = []
+        self._start = time.monotonic()
+
+    def record(self, kind: str, **fields) -> dict:
+        """Record an event of `kind`; `fields` must be JSON serialisable."""
+        event = {"kind": kind, "t": round(time.monotonic() - self._start, 3), **fields}
+        self.events.append(event)
+
+        if self.path:
+            self._buffer.append(
+                json.dumps(
+                    event, separators=(",", ":"), ensure_ascii=False, default=str
+                )
+                + "\n"
+            )
+            if len(self._buffer) >= self.buffer_size:
+                self.flush()
+        return event
+
+    def flush(self):
+        """Queue writing the buffered events. Must be called from the event loop."""
+        if self._buffer:
+            fileio.write_behind(
+                self.path, "".join(self._buffer), mode="a", makedirs=True
+            )
+            self._buffer = []
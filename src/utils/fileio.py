@@ -0,0 +1,184 @@
+"""
+Non-blocking access to the bot's data files.
+
+All disk access is done on a small dedicated thread pool, so that reading corpora
+or writing scrapes never stalls the event loop (and with it, gateway events).
+
+- :func:`prefetch` starts reading a file ahead of time; the next :func:`read_text`
+  or :func:`read_lines` of the same path picks up the result.
+- :func:`write_behind` queues a write and returns immediately; :func:`flush` waits
+  for all queued writes.
+- :func:`write_lines` replaces a file atomically, so that readers and crashes never
+  see a partially written corpus.
+
+Writes to the same path are serialized, and applied in the order they were issued.
+Every completed write bumps the :func:`version` of the path, which in-memory caches
+can compare against to know when to reload.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import logging
+import os
+import tempfile
+from typing import Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="ebot-io"
+)
+
+# path -> future of the file content, consumed by the next read
+_prefetched: Dict[str, asyncio.Future] = {}
+# path -> lock held while writing; created lazily inside the running loop
+_write_locks: Dict[str, asyncio.Lock] = collections.defaultdict(asyncio.Lock)
+# path -> number of writes completed through this module
+_versions: Dict[str, int] = collections.defaultdict(int)
+# write behind tasks not yet completed
+_pending_writes: Set[asyncio.Future] = set()
+
+# read once, as the umask can only be read by setting it, which is not thread safe
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _key(path: str) -> str:
+    return os.path.abspath(path)
+
+
+def _read(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _write(path: str, content: str, mode: str, makedirs: bool = False):
+    if makedirs:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, mode, encoding="utf-8") as f:
+        f.write(content)
+
+
+def _mode_of(path: str) -> int:
+    """Permissions of `path`, or those a new file would be created with."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _write_atomic(path: str, lines: List[str]):
+    """Write to a temporary file in the same directory, flush it to disk, then
+    rename it over `path`. The file keeps the permissions of the file it replaces."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            # `mkstemp` creates the file readable by the owner only
+            os.chmod(tmp_path, _mode_of(path))
+            # join on the pool, as scraped corpora can be large
+            f.write("\n".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    try:
+        # persist the rename itself
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # not possible on all platforms
+        return
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+async def run(func, *args):
+    """Run the blocking `func(*args)` on the IO thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_POOL, func, *args)
+
+
+def version(path: str) -> int:
+    """Number of writes to `path` completed since startup."""
+    return _versions.get(_key(path), 0)
+
+
+def prefetch(path: str):
+    """Start reading `path` in the background, if not already being read."""
+    key = _key(path)
+    if key not in _prefetched:
+        _prefetched[key] = asyncio.get_running_loop().run_in_executor(
+            _POOL, _read, path
+        )
+
+
+async def read_text(path: str) -> str:
+    """Content of `path`, using a prefetched read if there is one.
+
+    :raises OSError: If the file cannot be read.
+    """
+    future = _prefetched.pop(_key(path), None)
+    if future is None:
+        return await run(_read, path)
+    return await future
+
+
+async def read_lines(path: str) -> List[str]:
+    """Content of `path` split on new lines."""
+    return (await read_text(path)).split("\n")
+
+
+async def _locked_write(path: str, func, *args):
+    key = _key(path)
+    async with _write_locks[key]:
+        # prefetched content would be stale
+        _prefetched.pop(key, None)
+        await run(func, *args)
+        _versions[key] += 1
+
+
+async def write_text(path: str, content: str, mode: str = "w", makedirs=False):
+    """Write `content` to `path`, after any writes already queued for `path`.
+
+    :param makedirs: Create the parent directories of `path` if missing.
+    """
+    await _locked_write(path, _write, path, content, mode, makedirs)
+
+
+async def write_lines(path: str, lines: List[str]):
+    """Atomically replace `path` with `lines`, new line separated."""
+    await _locked_write(path, _write_atomic, path, lines)
+
+
+def write_behind(
+    path: str, content: str, mode: str = "w", makedirs=False
+) -> asyncio.Future:
+    """Queue writing `content` to `path` and return without waiting.
+
+    :return: Future of the write, which can be awaited if needed.
+    """
+
+    async def _write_behind():
+        try:
+            await write_text(path, content, mode, makedirs)
+        except OSError as e:
+            logger.error("Write to %s failed: %s", path, e)
+            raise
+
+    # tasks start, and so queue on the lock, in the order they are created
+    task = asyncio.ensure_future(_write_behind())
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return task
+
+
+async def flush():
+    """Wait for all queued writes to complete."""
+    await asyncio.gather(*_pending_writes, return_exceptions=True)
@@ -1,20 +1,22 @@
 """
 Helper class for standard 52 french deck playing cards.
+
+Every card is created once at import, together with its rendering, and decks are
+shuffled lists of these shared instances. Each card is identified by a small
+integer `index`, see :data:`CARDS`.
 """
 
 import itertools
-import functools
 import random
-from dataclasses import dataclass
-from typing import Generator, List, Union
+from typing import Generator, List, Sequence, Tuple, Union
 
-CARD_VALUES = range(0, 14)
+CARD_VALUES = range(1, 14)
 CARD_SUITS = ["D", "H", "C", "S"]
 
 BLANK_CARD = "+---+\n" + "|{} |\n" + "|{}|\n" + "+---+\n"
 
 CARD_VALUE_STRING = {i: f"{i:2d}" for i in CARD_VALUES}
-CARD_VALUE_STRING[0] = " A"  # needs space so that everything aligns in pprint
+CARD_VALUE_STRING[1] = " A"  # needs space so that everything aligns in pprint
 CARD_VALUE_STRING[11] = " J"
 CARD_VALUE_STRING[12] = " Q"
 CARD_VALUE_STRING[13] = " K"
@@ -25,17 +27,37 @@ CARD_SUIT_EMOJIS = {
     "S": " ♠ ",
 }
 
+# rendered lines of a card, top to bottom
+Rows = Tuple[str, ...]
+
+
+def _rows(rendered: str) -> Rows:
+    # drop the empty string after the trailing new line
+    return tuple(rendered.split("\n")[:-1])
+
 
 # typedef
-@dataclass
 class Card:
-    suit: str
-    value: int
-    is_black: bool
+    __slots__ = ("suit", "value", "is_black", "index", "_str", "rows")
+
+    def __init__(self, suit: str, value: int, is_black: bool):
+        self.suit = suit
+        self.value = value
+        self.is_black = is_black
+        self.index = CARD_SUITS.index(suit) * len(CARD_VALUES) + CARD_VALUES.index(
+            value
+        )
+
+        self._str = BLANK_CARD.format(CARD_VALUE_STRING[value], CARD_SUIT_EMOJIS[suit])
+        self.rows = _rows(self._str)
 
     def __str__(self) -> str:
-        return BLANK_CARD.format(
-            CARD_VALUE_STRING[self.value], CARD_SUIT_EMOJIS[self.suit]
+        return self._str
+
+    def __repr__(self) -> str:
+        return (
+            f"Card(suit={self.suit!r}, value={self.value!r}, "
+            f"is_black={self.is_black!r})"
         )
 
     def __lt__(self, other: "Card") -> bool:
@@ -58,20 +80,47 @@ class Card:
         return self < s[-1] and s[1] == self
 
 
-def _new_deck() -> Generator[Card, None, None]:
+# every card, ordered by `Card.index`
+CARDS: Tuple[Card, ...] = tuple(
+    Card(s, v, s in "CS") for (s, v) in itertools.product(CARD_SUITS, CARD_VALUES)
+)
+
+FACE_DOWN = BLANK_CARD.format("  ", "   ")
+FACE_DOWN_ROWS: Rows = _rows(FACE_DOWN)
+
+
+def _new_deck(rng: random.Random = random) -> Generator[Card, None, None]:
     """todo"""
-    # pylint: disable=simplifiable-if-expression
-    cards = [
-        Card(s, v, True if s in "CS" else False)
-        for (s, v) in itertools.product(CARD_SUITS, CARD_VALUES)
-    ]
-    random.shuffle(cards)
+    cards = list(CARDS)
+    rng.shuffle(cards)
     return (i for i in cards)
 
 
+def card_rows(card: Union[Card, str]) -> Rows:
+    """Rendered lines of a card, or of an already rendered card string."""
+    if isinstance(card, Card):
+        return card.rows
+    if card == FACE_DOWN:
+        return FACE_DOWN_ROWS
+    return _rows(card)
+
+
+def render_rows(rows: Sequence[Rows]) -> str:
+    """Render cards, given as their :attr:`Card.rows`, side by side."""
+    if not rows:
+        return ""
+    return "\n".join(map(" ".join, zip(*rows)))
+
+
 class FrenchDeck:
-    def __init__(self):
-        self._deck = _new_deck()
+    """Deck dealt in a random order, reshuffled when exhausted.
+
+    :param rng: Random source to shuffle with, defaults to the `random` module.
+    """
+
+    def __init__(self, rng: random.Random = random):
+        self._rng = rng
+        self._deck = _new_deck(rng)
 
     def deal(self) -> Card:
         """Deal the next card"""
@@ -79,21 +128,13 @@ class FrenchDeck:
         if card:
             return card
         else:
-            self._deck = _new_deck()
+            self._deck = _new_deck(self._rng)
             return self.deal()
 
     @staticmethod
     def to_string(*cards: Union[Card, str]) -> str:
-        lines = [str(i).split("\n") for i in cards]
-        if lines:
-            return "\n".join(
-                functools.reduce(
-                    lambda acc, c: [f"{acc[i]} {c[i]}" for i in range(len(c))], lines
-                )
-            ).strip()
-        else:
-            return ""
+        return render_rows([card_rows(card) for card in cards])
 
     @staticmethod
     def face_down() -> str:
-        return BLANK_CARD.format("  ", "   ")
+        return FACE_DOWN
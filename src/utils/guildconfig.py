@@ -0,0 +1,178 @@
+"""
+Settings that each guild can change, such as timeouts and round lengths.
+
+Settings are stored as overrides of the defaults, in a file per guild,
+`data/guild_config/<guild id>.json`, so that processes running different shards
+never write the same file. Each override is named either by the setting, for all
+games, or by the game class and setting, for one game:
+```
+{"wait_duration": 3, "ECards.hand_size": 8}
+```
+The overrides of a guild are held in memory as a plain dict, so reading one is a
+dict lookup. Game prefixes are checked against the games registered with
+:meth:`GuildConfig.register_game`. Games read their settings when created, see
+:meth:`abstracts.egamefactory.EGameFactory.configure`; other code can subscribe to
+changes with :meth:`GuildConfig.subscribe`.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from utils import fileio
+
+import econfig
+
+logger = logging.getLogger(__name__)
+
+
+class Setting(NamedTuple):
+    description: str
+    minimum: int
+    maximum: int
+    # whether a change applies to games already running, or only to new games
+    live: bool
+
+
+SETTINGS: Dict[str, Setting] = {
+    "wait_duration": Setting("Seconds to show results between steps.", 0, 60, True),
+    "prompt_duration": Setting(
+        "Seconds to answer an E Lash prompt or poll.", 5, 600, True
+    ),
+    "response_timeout": Setting("Seconds to choose cards or vote.", 5, 600, True),
+    "player_gather_timeout": Setting("Seconds to join a game.", 5, 600, True),
+    "hand_size": Setting("Cards in an E Cards hand.", 2, 10, False),
+    "scrape_maximum": Setting("Messages scraped per channel.", 1, 10000, True),
+}
+
+# guild id, setting name, new value or `None` if reset to the default
+Listener = Callable[[int, str, Optional[int]], None]
+
+# shared by guilds without overrides; never modified
+_EMPTY: Dict[str, int] = {}
+
+
+class ConfigError(ValueError):
+    """A setting name or value that is not allowed."""
+
+
+def setting_of(name: str) -> str:
+    """The setting of an override `name`, without a game prefix."""
+    return name.rsplit(".", 1)[-1]
+
+
+class GuildConfig:
+    """Per guild overrides of :data:`SETTINGS`.
+
+    :param path: Directory the overrides are kept in, one JSON file per guild.
+        Defaults to `data/guild_config` in `econfig.PATH_EXTENSION`, resolved on
+        first use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._guilds: Dict[int, Dict[str, int]] = {}
+        self._listeners = []
+        # game class name -> game class, or a stand-in forwarding its attributes
+        self._games: Dict[str, Any] = {}
+
+    def register_game(self, name: str, game: Any):
+        """Allow overrides prefixed by `name`, for the settings that `game` has as
+        class attributes; `game` may be a :class:`abstracts.LazyFactory`."""
+        self._games[name] = game
+
+    def _validate_prefix(self, name: str):
+        if "." not in name:
+            return
+        prefix, setting = name.rsplit(".", 1)
+        game = self._games.get(prefix, None)
+        if game is None:
+            raise ConfigError(
+                f"Unknown game {prefix}, expected one of {', '.join(self._games)}."
+            )
+        if not hasattr(game, setting):
+            raise ConfigError(f"{prefix} has no setting {setting}.")
+
+    def _path(self) -> str:
+        if self.path is None:
+            self.path = os.path.join(econfig.PATH_EXTENSION, "data", "guild_config")
+        return self.path
+
+    def _guild_path(self, guild_id: int) -> str:
+        return os.path.join(self._path(), f"{guild_id}.json")
+
+    @staticmethod
+    def _list(path: str) -> List[int]:
+        os.makedirs(path, exist_ok=True)
+        return [
+            int(name[: -len(".json")])
+            for name in os.listdir(path)
+            if name.endswith(".json") and name[: -len(".json")].isdigit()
+        ]
+
+    async def load(self):
+        """Read the overrides from disk, replacing those in memory."""
+        guilds = {}
+        for gid in await fileio.run(self._list, self._path()):
+            try:
+                guilds[gid] = json.loads(await fileio.read_text(self._guild_path(gid)))
+            except (OSError, ValueError) as e:
+                logger.error("Could not read guild config of %d: %s", gid, e)
+        self._guilds = {
+            gid: overrides for gid, overrides in guilds.items() if overrides
+        }
+
+    def overrides(self, guild_id: int) -> Dict[str, int]:
+        """Overrides of `guild_id`, by name; must not be modified."""
+        return self._guilds.get(guild_id, _EMPTY)
+
+    def get(self, guild_id: int, name: str, default: int) -> int:
+        """Value of setting `name`, which may be prefixed by a game class name, for
+        `guild_id`; falls back to the unprefixed setting, then to `default`."""
+        overrides = self._guilds.get(guild_id, _EMPTY)
+        if name in overrides:
+            return overrides[name]
+        return overrides.get(setting_of(name), default)
+
+    async def set(self, guild_id: int, name: str, value: Optional[int]):
+        """Override `name` for `guild_id`, or reset it to the default if `value` is
+        `None`. Notifies subscribers, then saves to disk.
+
+        :raises ConfigError: If `name` is not a setting, is prefixed by a game that is
+            not registered or does not have the setting, or `value` is out of range.
+        """
+        setting = SETTINGS.get(setting_of(name), None)
+        if setting is None:
+            raise ConfigError(
+                f"Unknown setting {name}, expected one of {', '.join(SETTINGS)}."
+            )
+        self._validate_prefix(name)
+        if value is not None and not setting.minimum <= value <= setting.maximum:
+            raise ConfigError(
+                f"{name} must be between {setting.minimum} and {setting.maximum}."
+            )
+
+        # replace rather than modify, so that readers never see a partial update
+        overrides = dict(self._guilds.get(guild_id, _EMPTY))
+        if value is None:
+            overrides.pop(name, None)
+        else:
+            overrides[name] = value
+        self._guilds[guild_id] = overrides
+
+        for listener in self._listeners:
+            listener(guild_id, name, value)
+
+        await fileio.run(os.makedirs, self._path(), 0o777, True)
+        await fileio.write_lines(self._guild_path(guild_id), [json.dumps(overrides)])
+
+    def subscribe(self, listener: Listener):
+        """Call `listener(guild_id, name, value)` on every change."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener):
+        self._listeners.remove(listener)
+
+
+GUILD_CONFIG = GuildConfig()
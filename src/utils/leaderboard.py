@@ -0,0 +1,185 @@
+"""
+Persistent leaderboard of game scores, across games and sessions.
+
+Scores are kept in an embedded SQLite database, in WAL mode so that reading the
+leaderboard never waits on a game saving its scores. Each row is the running total
+of one player in one game on one guild:
+```
+(guild_id, game, player_id) -> name, score, rounds
+```
+Games add their scores in one batch per round, with :meth:`Leaderboard.add_scores`.
+Top-N queries and ranks are answered from an index on the score, so cost grows with
+the number of players asked for, not with the number of players or rounds recorded.
+
+All database access happens on a single dedicated thread, which owns the
+connection; the coroutine methods can be called from the event loop.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import sqlite3
+from typing import Dict, List, NamedTuple, Optional
+
+import econfig
+
+logger = logging.getLogger(__name__)
+
+# seconds to wait for a lock held by another connection
+SQLITE_BUSY_TIMEOUT = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    guild_id INTEGER NOT NULL,
+    game TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, game, player_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (guild_id, game, score DESC);
+"""
+
+_ADD_SCORE = """
+INSERT INTO scores (guild_id, game, player_id, name, score, rounds)
+VALUES (?, ?, ?, ?, ?, 1)
+ON CONFLICT (guild_id, game, player_id) DO UPDATE SET
+    name = excluded.name,
+    score = score + excluded.score,
+    rounds = rounds + 1
+"""
+
+_TOP = """
+SELECT player_id, name, score, rounds FROM scores
+WHERE guild_id = ? AND game = ?
+ORDER BY score DESC, player_id
+LIMIT ?
+"""
+
+_PLAYER = """
+SELECT name, score, rounds FROM scores
+WHERE guild_id = ? AND game = ? AND player_id = ?
+"""
+
+_HIGHER = """
+SELECT COUNT(*) FROM scores WHERE guild_id = ? AND game = ? AND score > ?
+"""
+
+
+class Standing(NamedTuple):
+    """Position of a player on a leaderboard. Players with equal scores share
+    a rank."""
+
+    rank: int
+    player_id: int
+    name: str
+    score: int
+    rounds: int
+
+
+class Leaderboard:
+    """Store of cumulative scores, per guild, game, and player.
+
+    :param path: Database file, created if missing. Defaults to
+        `data/leaderboard.sqlite3` in `econfig.PATH_EXTENSION`, resolved on first
+        use.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ebot-leaderboard"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path is None:
+                self.path = os.path.join(
+                    econfig.PATH_EXTENSION, "data", "leaderboard.sqlite3"
+                )
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            # wait on the write lock when other processes, running other shards,
+            # are saving scores
+            connection = sqlite3.connect(self.path, timeout=SQLITE_BUSY_TIMEOUT)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # durable at checkpoints; a crash loses at most the last few rounds
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _add_scores(
+        self, guild_id: int, game: str, scores: Dict[int, int], names: Dict[int, str]
+    ):
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                _ADD_SCORE,
+                [
+                    (guild_id, game, pid, names.get(pid, str(pid)), score)
+                    for pid, score in scores.items()
+                ],
+            )
+
+    def _top(self, guild_id: int, game: str, n: int) -> List[Standing]:
+        rows = self._connect().execute(_TOP, (guild_id, game, n)).fetchall()
+
+        standings = []
+        for i, (pid, name, score, rounds) in enumerate(rows):
+            # equal scores share the rank of the first of them
+            rank = standings[-1].rank if i and score == rows[i - 1][2] else i + 1
+            standings.append(Standing(rank, pid, name, score, rounds))
+        return standings
+
+    def _standing(self, guild_id: int, game: str, player_id: int) -> Optional[Standing]:
+        connection = self._connect()
+        row = connection.execute(_PLAYER, (guild_id, game, player_id)).fetchone()
+        if row is None:
+            return None
+        name, score, rounds = row
+        (higher,) = connection.execute(_HIGHER, (guild_id, game, score)).fetchone()
+        return Standing(higher + 1, player_id, name, score, rounds)
+
+    async def add_scores(
+        self, guild_id: int, game: str, scores: Dict[int, int], names: Dict[int, str]
+    ):
+        """Add the scores of one round, in a single transaction. Every player in
+        `scores` is counted as having played the round.
+
+        :param scores: Score to add, indexed by player id.
+        :param names: Display name of the players, indexed by player id.
+        """
+        if scores:
+            await self._run(self._add_scores, guild_id, game, scores, names)
+
+    async def top(self, guild_id: int, game: str, n: int = 10) -> List[Standing]:
+        """The `n` players with the highest scores, highest first."""
+        return await self._run(self._top, guild_id, game, n)
+
+    async def standing(
+        self, guild_id: int, game: str, player_id: int
+    ) -> Optional[Standing]:
+        """Standing of a single player, or `None` if they have not played."""
+        return await self._run(self._standing, guild_id, game, player_id)
+
+    async def close(self):
+        """Close the connection, after any queued queries."""
+
+        def _close():
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+        await self._run(_close)
+
+
+LEADERBOARD = Leaderboard()
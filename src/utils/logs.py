@@ -0,0 +1,173 @@
+"""
+Logging pipeline which keeps formatting and stream/file writes off the event loop.
+
+Records are rendered to a message string on the calling thread (so that mutable
+arguments are captured as they were), then handed to a queue. A background
+:class:`logging.handlers.QueueListener` thread does the formatting and writing.
+
+Records are tagged with the `guild_id` and `session_id` of the game currently
+running in the calling task, see :func:`log_context`, and can be sampled per
+module with :class:`SamplingFilter`.
+"""
+
+import contextlib
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import reprlib
+from typing import Dict
+
+import discord
+
+import econfig
+
+# structured fields attached to every record emitted in the current task
+LOG_CONTEXT: contextvars.ContextVar = contextvars.ContextVar("log_context", default={})
+
+_CONTEXT_FIELDS = ("guild_id", "session_id")
+
+_payload_repr = reprlib.Repr()
+_payload_repr.maxlevel = 3
+_payload_repr.maxdict = 8
+_payload_repr.maxlist = 8
+_payload_repr.maxtuple = 8
+_payload_repr.maxstring = 80
+_payload_repr.maxother = 80
+
+
+class Payload:
+    """Wrap a large object passed as a logging argument, so that rendering it costs
+    a bounded amount of work regardless of its size:
+    ```py
+    self.logging.info("answers %s", Payload(answers))
+    ```
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return _payload_repr.repr(self.obj)
+
+    __repr__ = __str__
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Attach `fields` to every record logged in the current context. Tasks created
+    inside the `with` block inherit the fields."""
+    token = LOG_CONTEXT.set({**LOG_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        LOG_CONTEXT.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the fields of :data:`LOG_CONTEXT` onto each record. Must run on the
+    emitting thread, i.e. be attached to the queue handler."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = LOG_CONTEXT.get()
+        for field in _CONTEXT_FIELDS:
+            setattr(record, field, context.get(field, None))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of the records below `WARNING` from each module.
+
+    :param rates: Fraction of records to keep, indexed by logger name. The longest
+        matching prefix applies, e.g. `"games"` covers `"games.ridethebus"`.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._cache: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        if name not in self._cache:
+            matches = [
+                prefix
+                for prefix in self.rates.keys()
+                if name == prefix or name.startswith(prefix + ".")
+            ]
+            self._cache[name] = self.rates[max(matches, key=len)] if matches else 1.0
+        return self._cache[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class LoopSafeQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler which only renders the message on the calling thread, leaving
+    all formatting (timestamps, colours, JSON) to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # other handlers may still see the original record
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # tracebacks hold references to frames, render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as single line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in _CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+def setup_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Configure the root logger as `discord.utils.setup_logging` would, but with
+    the handlers moved behind a queue serviced by a background thread.
+
+    :return: The started listener; call `stop()` on shutdown to flush the queue.
+    """
+    kwargs = {"formatter": StructuredFormatter()} if econfig.LOG_STRUCTURED else {}
+    discord.utils.setup_logging(level=level, root=True, **kwargs)
+
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LoopSafeQueueHandler(log_queue)
+    if econfig.LOG_SAMPLING:
+        queue_handler.addFilter(SamplingFilter(econfig.LOG_SAMPLING))
+    queue_handler.addFilter(ContextFilter())
+
+    for handler in handlers:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
@@ -0,0 +1,176 @@
+"""
+Event loop lag monitor and slow callback detector.
+
+A heartbeat task sleeps for a fixed interval and measures how late it is woken,
+which is the scheduling delay every other task on the loop is currently seeing.
+
+A watchdog thread watches the heartbeat. If the loop stops beating for longer than
+the threshold, something is blocking it, and the watchdog captures the stack of the
+loop thread to record where.
+"""
+
+import asyncio
+import collections
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# frames from files under here are reported as the source of a stall
+_SRC_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class SlowCallback:
+    """A period in which the event loop was blocked.
+
+    :param started: `time.time()` at which the stall was detected.
+    :param duration: How long the loop was blocked, in seconds.
+    :param source: Innermost project frame, as `file:line in function`.
+    :param stack: The full stack of the loop thread, innermost last.
+    """
+
+    __slots__ = ("started", "duration", "source", "stack")
+
+    started: float
+    duration: float
+    source: str
+    stack: str
+
+
+def _describe(frame) -> str:
+    code = frame.f_code
+    if code.co_filename.startswith(_SRC_DIRECTORY):
+        path = os.path.relpath(code.co_filename, _SRC_DIRECTORY)
+    else:
+        path = os.path.basename(code.co_filename)
+    return f"{path}:{frame.f_lineno} in {code.co_name}"
+
+
+def _capture(frame) -> tuple:
+    """Source and stack description of `frame`."""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+
+    own = [f for f in frames if f.f_code.co_filename.startswith(_SRC_DIRECTORY)]
+    source = _describe(own[-1] if own else frames[-1])
+    stack = "\n".join(_describe(f) for f in frames)
+    return source, stack
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LoopLagMonitor:
+    """Continuously measures the scheduling delay of the running event loop.
+
+    :param interval: Seconds between heartbeats.
+    :param threshold: Seconds the loop may be blocked for before the blocking code
+        is recorded as a :class:`SlowCallback`.
+    :param history: Number of lag samples and slow callbacks kept.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1, history=1000):
+        self.interval = interval
+        self.threshold = threshold
+
+        self.lags: Deque[float] = collections.deque(maxlen=history)
+        self.slow_callbacks: Deque[SlowCallback] = collections.deque(maxlen=history)
+
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._thread_id = None
+        self._beat = time.monotonic()
+
+    def start(self):
+        """Start monitoring the running loop. Must be called from the loop thread."""
+        assert self._task is None
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="ebot-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        """Stop monitoring. Waits for the watchdog thread to finish in an executor,
+        so that the loop is not blocked meanwhile."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        self._stop.set()
+        await asyncio.get_running_loop().run_in_executor(None, self._watchdog.join)
+        self._watchdog = None
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+
+            self._beat = time.monotonic()
+            self.lags.append(lag)
+            METRICS.observe("ebot_loop_lag_seconds", lag)
+
+    def _watch(self):
+        stall: Optional[SlowCallback] = None
+        beat = self._beat
+        while not self._stop.wait(self.threshold / 2):
+            if self._beat != beat:
+                # loop is running again
+                if stall is not None:
+                    stall.duration = self._beat - beat - self.interval
+                    logger.warning(
+                        "Event loop blocked for %.3fs by %s",
+                        stall.duration,
+                        stall.source,
+                    )
+                    METRICS.inc("ebot_slow_callbacks_total", source=stall.source)
+                    stall = None
+                beat = self._beat
+                continue
+
+            blocked = time.monotonic() - beat - self.interval
+            if stall is None and blocked > self.threshold:
+                frame = sys._current_frames().get(self._thread_id, None)
+                if frame is None:
+                    continue
+                source, stack = _capture(frame)
+                stall = SlowCallback(time.time(), blocked, source, stack)
+                self.slow_callbacks.append(stall)
+
+    def percentiles(self) -> Dict[str, float]:
+        """Percentiles of the recent lag samples, in seconds."""
+        ordered = sorted(self.lags)
+        return {
+            "p50": _percentile(ordered, 0.5),
+            "p95": _percentile(ordered, 0.95),
+            "p99": _percentile(ordered, 0.99),
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+    def summary(self) -> str:
+        lag = ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in self.percentiles().items())
+        lines = [f"Loop lag: {lag}"]
+        for slow in list(self.slow_callbacks)[-5:]:
+            lines.append(f"{slow.duration * 1000:.0f}ms blocked by {slow.source}")
+        return "\n".join(lines)
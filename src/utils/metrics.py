@@ -0,0 +1,219 @@
+"""
+Lightweight latency histograms and counters for the bot's hot paths, exportable
+in the Prometheus text exposition format.
+
+Record with
+```py
+with METRICS.timer("ebot_rest_seconds", call="message.edit"):
+    await message.edit(embed=embed)
+
+METRICS.inc("ebot_views_total", view="PollView")
+```
+
+When `METRICS.enabled` is `False`, `timer` returns a shared no-op context manager
+and `inc` returns immediately, so instrumentation costs a single attribute check.
+"""
+
+import bisect
+import time
+from functools import wraps
+from typing import Callable, Dict, Iterator, Tuple
+
+import econfig
+
+# seconds; views and rounds run for tens of seconds, REST calls for milliseconds
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed bucket histogram of observed values.
+
+    :param buckets: Sorted upper bounds of the buckets; an implicit `+Inf` bucket
+        catches everything else.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """Yields `(upper bound, cumulative count)` pairs, ending with `+Inf`."""
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            yield (str(bound), total)
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the `q` quantile, as the upper bound of the bucket it falls
+        in. Values in the `+Inf` bucket are reported as the largest bound."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _fmt_labels(labels: Labels, **extra) -> str:
+    items = [*labels, *extra.items()]
+    if not items:
+        return ""
+    inner = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in items
+    )
+    return "{" + inner + "}"
+
+
+class MetricsRegistry:
+    """Collection of named, labelled histograms and counters.
+
+    :param enabled: Whether to record anything at all.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.counters: Dict[str, Dict[Labels, int]] = {}
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        series = self.histograms.setdefault(name, {})
+        key = _labels(labels)
+        if key not in series:
+            series[key] = Histogram()
+        return series[key]
+
+    def observe(self, name: str, value: float, **labels):
+        if self.enabled:
+            self.histogram(name, **labels).observe(value)
+
+    def timer(self, name: str, **labels):
+        """Context manager recording the time spent in its body, in seconds."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name, **labels))
+
+    def timed(self, name: str, **labels) -> Callable:
+        """Decorator version of :meth:`timer` for coroutine functions, e.g. cog
+        listeners."""
+
+        def decorator(func):
+            @wraps(func)
+            async def wrapped(*args, **kwargs):
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+                with self.timer(name, **labels):
+                    return await func(*args, **kwargs)
+
+            return wrapped
+
+        return decorator
+
+    def inc(self, name: str, value: int = 1, **labels):
+        if not self.enabled:
+            return
+        series = self.counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+    def reset(self):
+        self.histograms.clear()
+        self.counters.clear()
+
+    def export(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_fmt_labels(labels)} {value}")
+
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in sorted(series.items()):
+                for bound, count in hist.cumulative():
+                    lines.append(
+                        f"{name}_bucket{_fmt_labels(labels, le=bound)} {count}"
+                    )
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {hist.sum}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {hist.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Short human readable summary, one line per histogram series."""
+        lines = []
+        for name, series in sorted(self.histograms.items()):
+            for labels, hist in sorted(series.items()):
+                mean = hist.sum / hist.count if hist.count else 0.0
+                lines.append(
+                    f"{name}{_fmt_labels(labels)} n={hist.count} "
+                    f"mean={mean * 1000:.0f}ms p50<={hist.quantile(0.5) * 1000:.0f}ms "
+                    f"p99<={hist.quantile(0.99) * 1000:.0f}ms"
+                )
+        return "\n".join(lines)
+
+
+METRICS = MetricsRegistry(enabled=econfig.METRICS_ENABLED)
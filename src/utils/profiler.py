@@ -0,0 +1,200 @@
+"""
+Sampling profiler for the event loop thread.
+
+A background thread periodically captures the stack of the event loop thread, and
+less frequently the stacks at which every pending task is suspended. Output is in
+the folded stack format understood by `flamegraph.pl`, speedscope, etc.:
+
+    - `*.cpu.folded`: where the loop thread was running code
+    - `*.await.folded`: where tasks were blocked awaiting something
+
+The summary compares wall time, CPU time of the loop thread, and the fraction of
+samples in which the loop was idle waiting on the selector.
+"""
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Counter, List, Optional
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return (
+        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    )
+
+
+def _fold(frame) -> str:
+    """Folded stack of `frame`, root first."""
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _is_idle(frame) -> bool:
+    """Whether the loop thread is parked in the selector waiting for IO."""
+    code = frame.f_code
+    return code.co_filename.endswith("selectors.py") and code.co_name in (
+        "select",
+        "poll",
+    )
+
+
+def _thread_cpu_time(thread_id: int) -> Optional[float]:
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+    except (AttributeError, OSError):
+        # not available on this platform
+        return None
+
+
+@dataclass
+class ProfileResult:
+    wall_time: float
+    cpu_time: Optional[float]
+    samples: int
+    idle_samples: int
+    cpu_stacks: Counter[str] = field(default_factory=collections.Counter)
+    await_stacks: Counter[str] = field(default_factory=collections.Counter)
+
+    def summary(self) -> str:
+        busy = self.samples - self.idle_samples
+        cpu = f"{self.cpu_time:.2f}s" if self.cpu_time is not None else "unavailable"
+        lines = [
+            f"Wall time: {self.wall_time:.2f}s",
+            f"Loop thread CPU time: {cpu}",
+            f"Samples: {self.samples} ({busy} running, {self.idle_samples} idle)",
+        ]
+        if self.samples:
+            lines.append(f"Loop busy: {busy / self.samples * 100:.1f}%")
+        lines.append("Hottest stacks:")
+        lines += [
+            f"  {count:5d} {stack.split(';')[-1]}"
+            for stack, count in self.cpu_stacks.most_common(5)
+        ]
+        lines.append("Most awaited:")
+        lines += [
+            f"  {count:5d} {stack.split(';')[-1]}"
+            for stack, count in self.await_stacks.most_common(5)
+        ]
+        return "\n".join(lines)
+
+    def write(self, path_prefix: str) -> List[str]:
+        """Write folded stacks to `{path_prefix}.cpu.folded` and
+        `{path_prefix}.await.folded`, and the summary to `{path_prefix}.txt`.
+        Blocking, so run in an executor.
+
+        :return: Paths written.
+        """
+        os.makedirs(os.path.dirname(path_prefix), exist_ok=True)
+        paths = []
+        for suffix, stacks in [("cpu", self.cpu_stacks), ("await", self.await_stacks)]:
+            path = f"{path_prefix}.{suffix}.folded"
+            with open(path, "w") as f:
+                f.writelines(f"{stack} {count}\n" for stack, count in stacks.items())
+            paths.append(path)
+
+        path = f"{path_prefix}.txt"
+        with open(path, "w") as f:
+            f.write(self.summary() + "\n")
+        paths.append(path)
+        return paths
+
+
+class StackSampler:
+    """Samples the stacks of the thread running `loop`.
+
+    :param loop: Event loop to profile; must be running in its thread when
+        :meth:`start` is called from that thread.
+    :param interval: Seconds between loop thread samples.
+    :param task_every: Sample suspended tasks every `task_every` loop samples, as
+        walking every task is comparatively expensive.
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, interval: float = 0.005, task_every=10
+    ):
+        self.loop = loop
+        self.interval = interval
+        self.task_every = task_every
+
+        self._thread_id = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self._samples = 0
+        self._idle_samples = 0
+        self._cpu_stacks = collections.Counter()
+        self._await_stacks = collections.Counter()
+        self._start_wall = 0.0
+        self._start_cpu = None
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None
+
+    def start(self):
+        """Start sampling. Must be called from the loop thread."""
+        assert not self.running
+        self._thread_id = threading.get_ident()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = _thread_cpu_time(self._thread_id)
+        self._sampler = threading.Thread(
+            target=self._run, name="ebot-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    async def stop(self) -> ProfileResult:
+        """Stop sampling and collect the result. Waits for the sampler thread to
+        finish in an executor, so that the loop is not blocked meanwhile."""
+        self._stop.set()
+        await self.loop.run_in_executor(None, self._sampler.join)
+        self._sampler = None
+
+        end_cpu = _thread_cpu_time(self._thread_id)
+        cpu_time = (
+            end_cpu - self._start_cpu
+            if end_cpu is not None and self._start_cpu is not None
+            else None
+        )
+        return ProfileResult(
+            wall_time=time.perf_counter() - self._start_wall,
+            cpu_time=cpu_time,
+            samples=self._samples,
+            idle_samples=self._idle_samples,
+            cpu_stacks=self._cpu_stacks,
+            await_stacks=self._await_stacks,
+        )
+
+    def _sample_tasks(self):
+        try:
+            tasks = asyncio.all_tasks(self.loop)
+        except RuntimeError:
+            # task set changed under us; skip this sample
+            return
+        for task in tasks:
+            stack = task.get_stack()
+            if stack:
+                self._await_stacks[";".join(_frame_name(frame) for frame in stack)] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id, None)
+            if frame is None:
+                continue
+
+            self._samples += 1
+            if _is_idle(frame):
+                self._idle_samples += 1
+            else:
+                self._cpu_stacks[_fold(frame)] += 1
+
+            if self._samples % self.task_every == 0:
+                self._sample_tasks()
@@ -0,0 +1,146 @@
+"""
+Draws from a corpus without repeats, across rounds, games and restarts.
+
+Each corpus file, and so each guild, has a :class:`Schedule` which tracks the
+entries used in the current cycle as a bitset over their position in the file.
+Draws pick uniformly from the unused entries, so every entry is served once before
+any is repeated; once all have been used a new cycle starts.
+
+The bitset is persisted next to the corpus, in `<file>.schedule.json`, along with
+a fingerprint of the corpus it indexes. A schedule for a corpus that has since
+changed starts afresh, unless it was carried over with :func:`remap` when the
+corpus was rewritten.
+"""
+
+import base64
+import hashlib
+import json
+import random
+from typing import Dict, List, Optional
+
+from utils import fileio
+
+# corpus path -> state last saved, which may not be written to disk yet
+_states: Dict[str, dict] = {}
+
+
+def fingerprint(entries: List[str]) -> str:
+    return hashlib.blake2b("\n".join(entries).encode(), digest_size=8).hexdigest()
+
+
+def _bitset(size: int, positions) -> bytes:
+    bits = bytearray((size + 7) // 8)
+    for i in positions:
+        bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def schedule_path(path: str) -> str:
+    return f"{path}.schedule.json"
+
+
+class Schedule:
+    """Usage of the entries of one corpus in the current cycle.
+
+    :param entries: The corpus.
+    :param used: Bitset of used entries, bit `i` for `entries[i]`.
+    :param path: Corpus file to persist the schedule for, or `None` to keep it in
+        memory only.
+    """
+
+    def __init__(
+        self,
+        entries: List[str],
+        used: Optional[bytes] = None,
+        path: Optional[str] = None,
+    ):
+        self.entries = entries
+        self.path = path
+        self.fingerprint = fingerprint(entries)
+
+        self._used = bytearray((len(entries) + 7) // 8)
+        if used and len(used) == len(self._used):
+            self._used[:] = used
+        # positions of unused entries; ascending to start with, so that draws only
+        # depend on the state and the rng
+        # a schedule with every entry used starts its new cycle on the next draw,
+        # so that its usage can still be read, e.g. by `remap`
+        self._unused = [i for i in range(len(entries)) if not self.is_used(i)]
+
+    def is_used(self, i: int) -> bool:
+        return bool(self._used[i >> 3] & (1 << (i & 7)))
+
+    def _new_cycle(self):
+        self._used = bytearray(len(self._used))
+        self._unused = list(range(len(self.entries)))
+
+    def draw(self, rng: random.Random = random) -> str:
+        """An entry not yet used in this cycle, chosen with `rng`, which is marked
+        as used.
+
+        :raises IndexError: If the corpus is empty.
+        """
+        if not self._unused:
+            if not self.entries:
+                raise IndexError("Cannot draw from an empty corpus")
+            self._new_cycle()
+
+        # swap the choice to the end, so removing it is O(1)
+        j = rng.randrange(len(self._unused))
+        self._unused[j], self._unused[-1] = self._unused[-1], self._unused[j]
+        i = self._unused.pop()
+        self._used[i >> 3] |= 1 << (i & 7)
+        return self.entries[i]
+
+    def state(self) -> dict:
+        """JSON serialisable state of the schedule."""
+        return {
+            "fingerprint": self.fingerprint,
+            "used": base64.b64encode(bytes(self._used)).decode(),
+        }
+
+    @classmethod
+    def from_state(
+        cls, entries: List[str], state: dict, path: Optional[str] = None
+    ) -> "Schedule":
+        """Schedule of `entries` from its :meth:`state`; all entries are unused if
+        the state is of a different corpus."""
+        if state.get("fingerprint") != fingerprint(entries):
+            return cls(entries, path=path)
+        return cls(entries, base64.b64decode(state["used"]), path=path)
+
+    def save(self):
+        """Queue writing the schedule to disk."""
+        if self.path:
+            _states[self.path] = self.state()
+            fileio.write_behind(schedule_path(self.path), json.dumps(self.state()))
+
+
+async def _read_state(path: str) -> dict:
+    try:
+        return json.loads(await fileio.read_text(schedule_path(path)))
+    except (OSError, ValueError):
+        return {}
+
+
+async def load(path: str, entries: List[str]) -> Schedule:
+    """The schedule of the corpus at `path`, whose content is `entries`, as last
+    saved."""
+    state = _states.get(path, None)
+    if state is None:
+        state = await _read_state(path)
+    return Schedule.from_state(entries, state, path)
+
+
+async def remap(path: str, previous: List[str], entries: List[str]):
+    """Carry the usage of the corpus at `path` over from its `previous` content to
+    its new content `entries`, matching entries by text."""
+    old = await load(path, previous)
+    used = {entry for i, entry in enumerate(previous) if old.is_used(i)}
+
+    schedule = Schedule(
+        entries,
+        _bitset(len(entries), (i for i, e in enumerate(entries) if e in used)),
+        path,
+    )
+    schedule.save()
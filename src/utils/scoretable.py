@@ -0,0 +1,107 @@
+"""
+Scores of a game, kept in rank order as they change.
+"""
+
+import bisect
+import itertools
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class ScoreTable(dict):
+    """Mapping of player id to score, which also keeps the players sorted by score,
+    so that the top `k` can be read without sorting.
+
+    Updating a score moves one entry in a sorted list: a binary search, plus a
+    shift of the entries between its old and new position. Missing players have a
+    score of 0, as with a `defaultdict(int)`:
+    ```py
+    scores = ScoreTable()
+    scores[pid] += 1
+    scores.top(3)  # [(pid, 1)]
+    ```
+    Players with equal scores are ranked in the order they were first added.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # (-score, order, pid), ascending; i.e. highest score first
+        self._ranked: List[Tuple[int, int, Hashable]] = []
+        self._order: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+
+    def __missing__(self, pid: Hashable) -> int:
+        return 0
+
+    def __setitem__(self, pid: Hashable, score: int):
+        if pid in self._order:
+            del self._ranked[self._index(pid)]
+        else:
+            self._order[pid] = next(self._counter)
+        super().__setitem__(pid, score)
+        bisect.insort(self._ranked, (-score, self._order[pid], pid))
+
+    def __delitem__(self, pid: Hashable):
+        del self._ranked[self._index(pid)]
+        del self._order[pid]
+        super().__delitem__(pid)
+
+    def _index(self, pid: Hashable) -> int:
+        return bisect.bisect_left(self._ranked, (-self[pid], self._order[pid]))
+
+    def add(self, pid: Hashable, value: int = 0):
+        """Add `value` to the score of `pid`; with the default of 0, only makes
+        sure `pid` is ranked."""
+        self[pid] += value
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """The `k` highest scoring players and their scores, highest first; all
+        players if `k` is `None`."""
+        ranked = self._ranked if k is None else self._ranked[:k]
+        return [(pid, -negated) for negated, _, pid in ranked]
+
+    def top_of(self, pids: Iterable[Hashable]) -> List[Tuple[Hashable, int]]:
+        """Scores of the players `pids`, highest first, in the order of :meth:`top`;
+        players without a score are left out. Sorts only the `k` players given, so
+        costs O(k log k) however many other players the table holds."""
+        ranked = sorted(
+            (-self[pid], self._order[pid], pid) for pid in pids if pid in self._order
+        )
+        return [(pid, -negated) for negated, _, pid in ranked]
+
+    def rank(self, pid: Hashable) -> int:
+        """Position of `pid` in :meth:`top`, from 1."""
+        return self._index(pid) + 1
+
+    # dict methods that would bypass `__setitem__`
+    def setdefault(self, pid, default=0):
+        if pid not in self:
+            self[pid] = default
+        return self[pid]
+
+    def update(self, *args, **kwargs):
+        for pid, score in dict(*args, **kwargs).items():
+            self[pid] = score
+
+    def pop(self, pid, *default):
+        if pid not in self:
+            return super().pop(pid, *default)
+        score = self[pid]
+        del self[pid]
+        return score
+
+    def popitem(self) -> Tuple[Hashable, int]:
+        """Remove and return the lowest ranked player and their score.
+
+        :raises KeyError: If the table is empty.
+        """
+        if not self._ranked:
+            raise KeyError("popitem(): ScoreTable is empty")
+        negated, _, pid = self._ranked.pop()
+        del self._order[pid]
+        super().__delitem__(pid)
+        return pid, -negated
+
+    def clear(self):
+        super().clear()
+        self._ranked.clear()
+        self._order.clear()
@@ -0,0 +1,125 @@
+"""
+Helpers for running the bot sharded, over one or many processes.
+
+Guilds are assigned to shards by discord, as `(guild_id >> 22) % shard_count`, so
+the per-guild state of the bot (game lookups, caches, and the per-guild data files)
+is naturally partitioned: a process only ever sees the guilds of its own shards.
+
+:class:`ShardMonitor` records per-shard metrics:
+- `ebot_gateway_latency_seconds{shard}`: heartbeat latency, sampled periodically.
+- `ebot_shard_events_total{shard,event}`: messages and interactions received.
+- `ebot_shard_connections_total{shard,state}`: connects, disconnects and resumes.
+"""
+
+import asyncio
+import logging
+import math
+from typing import List, Optional
+
+import discord
+
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def shard_of(guild_id: int, shard_count: int) -> int:
+    """Shard that discord assigns the guild `guild_id` to."""
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(text: str) -> List[int]:
+    """Shard ids from a list of ids and inclusive ranges, e.g. `0-3,6`."""
+    ids = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            ids.extend(range(int(first), int(last) + 1))
+        else:
+            ids.append(int(part))
+    return sorted(set(ids))
+
+
+def format_shard_ids(ids: List[int]) -> str:
+    """Inverse of :func:`parse_shard_ids`, with runs written as ranges."""
+    parts = []
+    for i in sorted(ids):
+        if parts and parts[-1][1] == i - 1:
+            parts[-1][1] = i
+        else:
+            parts.append([i, i])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in parts)
+
+
+def _shard(guild: Optional[discord.Guild]) -> str:
+    return str(guild.shard_id) if guild is not None else "dm"
+
+
+class ShardMonitor:
+    """Records the per-shard metrics of `bot`, see the module documentation.
+
+    :param bot: A `discord.Client` or `discord.AutoShardedClient`.
+    :param interval: Seconds between latency samples.
+    """
+
+    def __init__(self, bot: discord.Client, interval: float = 15.0):
+        self.bot = bot
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        bot.add_listener(self.on_message)
+        bot.add_listener(self.on_interaction)
+        bot.add_listener(self.on_shard_connect)
+        bot.add_listener(self.on_shard_disconnect)
+        bot.add_listener(self.on_shard_resumed)
+
+    def latencies(self) -> List[tuple]:
+        """`(shard id, seconds)` of every shard of the bot."""
+        if hasattr(self.bot, "latencies"):
+            return self.bot.latencies
+        return [(self.bot.shard_id or 0, self.bot.latency)]
+
+    def sample(self):
+        for shard_id, latency in self.latencies():
+            # nan or inf before the first heartbeat
+            if math.isfinite(latency):
+                METRICS.observe("ebot_gateway_latency_seconds", latency, shard=shard_id)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sample()
+
+    def start(self):
+        if self._task is None and METRICS.enabled:
+            self._task = asyncio.ensure_future(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def on_message(self, message: discord.Message):
+        METRICS.inc(
+            "ebot_shard_events_total", shard=_shard(message.guild), event="message"
+        )
+
+    async def on_interaction(self, interaction: discord.Interaction):
+        METRICS.inc(
+            "ebot_shard_events_total",
+            shard=_shard(interaction.guild),
+            event="interaction",
+        )
+
+    async def on_shard_connect(self, shard_id: int):
+        METRICS.inc("ebot_shard_connections_total", shard=shard_id, state="connect")
+
+    async def on_shard_disconnect(self, shard_id: int):
+        logger.warning("Shard %d disconnected", shard_id)
+        METRICS.inc("ebot_shard_connections_total", shard=shard_id, state="disconnect")
+
+    async def on_shard_resumed(self, shard_id: int):
+        METRICS.inc("ebot_shard_connections_total", shard=shard_id, state="resume")
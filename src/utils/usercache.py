@@ -0,0 +1,85 @@
+"""
+Users fetched on demand, for when the client's own user cache is trimmed.
+
+With the member cache off, discord.py only keeps a user while something else, such
+as a cached message, still refers to it. :class:`UserCache` keeps the most recently
+seen or fetched users in a small LRU, so that looking up a player again does not
+cost a REST call. Users seen in interactions, i.e. those playing games, are added
+as they arrive.
+
+Lookups and fetches are counted in `ebot_user_cache_total{result}`, with `result`
+one of `hit` or `fetch`.
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import discord
+
+from utils.metrics import METRICS
+
+
+class UserCache:
+    """LRU of users, by id, in front of `bot.fetch_user`.
+
+    :param bot: The client to fetch users with.
+    :param size: Users to keep; the least recently used is dropped beyond this.
+    """
+
+    def __init__(self, bot: discord.Client, size: int):
+        self.bot = bot
+        self.size = size
+        self._users: "OrderedDict[int, discord.abc.User]" = OrderedDict()
+        # user id -> fetch in progress, shared by concurrent lookups
+        self._fetches: Dict[int, asyncio.Future] = {}
+
+        bot.add_listener(self.on_interaction)
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    def remember(self, user: discord.abc.User):
+        """Add or refresh `user`, dropping the least recently used beyond `size`."""
+        self._users[user.id] = user
+        self._users.move_to_end(user.id)
+        while len(self._users) > self.size:
+            self._users.popitem(last=False)
+
+    def peek(self, user_id: int) -> Optional[discord.abc.User]:
+        """The user `user_id` if it is cached here or by the client, without
+        fetching it."""
+        user = self._users.get(user_id, None)
+        if user is not None:
+            self._users.move_to_end(user_id)
+            return user
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            self.remember(user)
+        return user
+
+    async def get(self, user_id: int) -> discord.User:
+        """The user `user_id`, fetched if it is not cached.
+
+        :raises discord.NotFound: If there is no such user.
+        """
+        user = self.peek(user_id)
+        if user is not None:
+            METRICS.inc("ebot_user_cache_total", result="hit")
+            return user
+
+        fetch = self._fetches.get(user_id, None)
+        if fetch is None:
+            METRICS.inc("ebot_user_cache_total", result="fetch")
+            fetch = asyncio.ensure_future(self.bot.fetch_user(user_id))
+            self._fetches[user_id] = fetch
+            fetch.add_done_callback(lambda _: self._fetches.pop(user_id, None))
+        user = await asyncio.shield(fetch)
+        self.remember(user)
+        return user
+
+    def clear(self):
+        self._users.clear()
+
+    async def on_interaction(self, interaction: discord.Interaction):
+        self.remember(interaction.user)
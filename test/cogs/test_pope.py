@@ -30,10 +30,12 @@ def _self():
     return s
 
 
-def test_constructor():
+@pytest.mark.asyncio
+async def test_cog_load():
     """PopeImage needs to have read and populated `self.pope_uris`
-    on construction."""
+    when loaded."""
     p = PopeImage(None)
+    await p.cog_load()
 
     assert p.pope_uris == _POPEFILE_CONTENT
 
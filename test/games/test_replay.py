@@ -0,0 +1,42 @@
+import asyncio
+import collections
+from unittest.mock import AsyncMock
+
+import pytest
+
+from abstracts.replay import ReplayInteraction, replay
+from games.ridethebus import RideTheBus
+
+
+async def _play(answers):
+    """Play a session of Ride the Bus with one player giving `answers`."""
+    game = RideTheBus(ReplayInteraction(1), session_id="test-replay")
+    game.leaderboard = None
+    inputs = [{"input": "players", "value": [[5, "alice", "🐙"]]}]
+    inputs += [{"input": "answer", "value": answer} for answer in answers]
+    game.replay_inputs = collections.deque(inputs)
+
+    await game.gather_players()
+    await game.run()
+    return game.events.events
+
+
+@pytest.mark.asyncio
+async def test_replay_reproduces_session(monkeypatch):
+    """Replaying a session records the same events, and a changed input is caught
+    as a divergence."""
+    # only for this test, unlike the session wide `no_sleep`
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+    # 4 questions in round one, 4 for each of the 10 cards in round three
+    events = await _play(["red", "higher", "outside", "clubs"] * 11)
+    assert events[0]["kind"] == "session"
+    assert events[-1]["kind"] == "end"
+
+    result = await replay(events)
+    assert result.divergence is None
+    assert len(result.events) == len(events) - 1
+
+    # the first answer is fed to the game as logged, but judged differently
+    events[2]["value"] = "black"
+    result = await replay(events)
+    assert result.divergence.startswith("Event 2: logged {'kind': 'answered'")
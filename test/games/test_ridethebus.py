@@ -0,0 +1,106 @@
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.frenchdeck import CARDS, FrenchDeck
+
+from games import busengine
+from games.ridethebus import CardPyramid, RideTheBus
+
+
+def test_pyramid_iter_keeps_position():
+    """Iterating the pyramid yields every card without moving the position."""
+    pyramid = CardPyramid(FrenchDeck())
+    pyramid.advance()
+    pyramid.advance()
+
+    assert len(list(pyramid)) == 10
+    assert pyramid.sparse() == "\n".join([".", "..", "...", "##.."])
+
+
+def test_pyramid_renders_follow_position():
+    """Cached renders are replaced as the pyramid is uncovered, through to the
+    end of the pyramid."""
+    pyramid = CardPyramid(FrenchDeck())
+    face_down = str(pyramid)
+    assert str(pyramid) is face_down
+
+    pyramid.advance()
+    uncovered = str(pyramid)
+    assert uncovered != face_down
+    assert uncovered.split("\n")[:-4] == face_down.split("\n")[:-4]
+
+    while pyramid.advance():
+        ...
+    assert pyramid.sparse() == "\n".join(["#", "##", "###", "####"])
+    assert "|   |" not in str(pyramid)
+
+
+def test_odds_match_enumeration():
+    """Odds agree with judging every card the player has not seen."""
+    rng = random.Random(1)
+    for _ in range(200):
+        hand = rng.sample(range(len(CARDS)), rng.randint(2, 6))
+        remaining = [card for card in range(len(CARDS)) if card not in hand]
+
+        for question in busengine.QUESTIONS:
+            odds = busengine.odds(question, hand)
+            for answer in busengine.ANSWERS[question]:
+                wins = busengine.judge_batch(
+                    question,
+                    [answer] * len(remaining),
+                    [hand] * len(remaining),
+                    remaining,
+                )
+                assert odds[answer] == pytest.approx(sum(wins) / len(remaining))
+
+
+def test_judge_inbetween():
+    """Inbetween compares against the last two cards, exclusive of their values."""
+    three, seven = CARDS[2], CARDS[6]
+    hand = [three.index, seven.index]
+
+    assert busengine.judge(busengine.INBETWEEN, "inbetween", hand, CARDS[18].index)
+    assert busengine.judge(busengine.INBETWEEN, "outside", hand, CARDS[15].index)
+    assert busengine.judge(busengine.INBETWEEN, "outside", hand, CARDS[45].index)
+    assert not busengine.judge(busengine.INBETWEEN, "broccoli", hand, CARDS[18].index)
+    assert busengine.judge(busengine.GUESS_SUIT, "broccoli", hand, CARDS[26].index)
+
+
+def test_match_row_by_value():
+    """Histogram matching agrees with removing, one by one, every card in hand
+    whose value is in the row."""
+    rng = random.Random(2)
+    for _ in range(500):
+        cards = rng.sample(CARDS, rng.randint(0, 12))
+        hand, row = cards[: len(cards) // 2], cards[len(cards) // 2 :]
+
+        # reference: matching by `Card.__eq__`, which compares value only
+        expected = hand[:]
+        # pylint: disable=expression-not-assigned
+        [expected.remove(c) for c in hand if c in row]
+
+        histogram = busengine.value_histogram(card.index for card in hand)
+        score = busengine.match_row(
+            histogram, busengine.row_values(card.index for card in row)
+        )
+
+        assert score == len(hand) - len(expected)
+        assert histogram == busengine.value_histogram(card.index for card in expected)
+
+
+def test_session_seeds_rng():
+    """Games with the same session id make the same random choices."""
+    interaction = MagicMock()
+    first = RideTheBus(interaction, session_id="replay")
+    second = RideTheBus(interaction, session_id="replay")
+    other = RideTheBus(interaction)
+
+    def deal(game):
+        deck = FrenchDeck(game.rng)
+        return [deck.deal().index for _ in range(60)]
+
+    assert first.session_id == "replay"
+    assert deal(first) == deal(second)
+    assert deal(first) != deal(other)
@@ -0,0 +1,77 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from utils import fileio
+
+from games.elash import ELash
+
+
+def _channel(name: str, contents: list) -> MagicMock:
+    async def history(limit):
+        for content in contents[:limit]:
+            # let other scrapes interleave
+            await asyncio.sleep(0)
+            yield MagicMock(content=content, author=MagicMock(bot=False))
+
+    channel = MagicMock()
+    channel.name = name
+    channel.history = history
+    return channel
+
+
+@pytest.mark.asyncio
+async def test_scrape_channels():
+    """Every configured channel is scraped into its file."""
+    interaction = MagicMock()
+    interaction.guild.id = 1234
+    interaction.guild.channels = [
+        _channel("elash-prompts", ["a prompt", "another prompt", ""]),
+        _channel("elash-safeties", ["a safety"]),
+    ]
+    interaction.edit_original_response = AsyncMock()
+
+    game = ELash(interaction)
+    assert await game.scrape(interaction) == "Scraped 2 prompts, and 1 safeties."
+
+    assert await fileio.read_lines(game.file_prompts) == ["a prompt", "another prompt"]
+    assert await fileio.read_lines(game.file_safeties) == ["a safety"]
+
+
+@pytest.mark.asyncio
+async def test_scrape_missing_channel():
+    """A missing channel is reported, and nothing is scraped."""
+    interaction = MagicMock()
+    interaction.guild.id = 1235
+    interaction.guild.name = "guild"
+    interaction.guild.channels = [_channel("elash-prompts", ["a prompt"])]
+
+    game = ELash(interaction)
+    assert (await game.scrape(interaction)).startswith(
+        "There is no channel named #elash-safeties in guild."
+    )
+
+
+@pytest.mark.asyncio
+async def test_scrape_failed_channel():
+    """A channel that cannot be read is reported apart from the counts."""
+
+    async def forbidden(limit):
+        raise RuntimeError("Missing Access")
+        yield  # pylint: disable=unreachable
+
+    safeties = _channel("elash-safeties", [])
+    safeties.history = forbidden
+    interaction = MagicMock()
+    interaction.guild.id = 1236
+    interaction.guild.channels = [
+        _channel("elash-prompts", ["a prompt", "another prompt"]),
+        safeties,
+    ]
+    interaction.edit_original_response = AsyncMock()
+
+    game = ELash(interaction)
+    assert await game.scrape(interaction) == (
+        "Scraped 2 prompts. Could not scrape #elash-safeties (Missing Access)."
+    )
@@ -0,0 +1,74 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from interactive.choice import ChoiceInteraction
+from interactive.monitor import Monitor, MonitorResult, PipelineResult
+from interactive.pipeline import InteractionPipeline
+from utils.lookups import EMOJI_FORWARD
+
+
+class _NamedMonitor(Monitor):
+    name = "named"
+
+
+def test_result():
+    m = _NamedMonitor()
+
+    # empty values allocate nothing
+    assert m.result({}) is None
+
+    r = m.result({1: "a"})
+    assert r == MonitorResult("named", {1: "a"})
+    assert not hasattr(r, "__dict__")
+
+
+def test_pipeline_result():
+    pr = PipelineResult(None, {})
+    pr.add(None)
+    pr.add(MonitorResult("empty", {}))
+    assert pr.results == {}
+    assert pr.get("missing") == {}
+
+    pr.add(MonitorResult("choice", {"checkmark": 1}))
+    assert "choice" in pr
+    assert pr.get("choice") == {"checkmark": 1}
+
+    # later results overwrite
+    pr.add(MonitorResult("choice", {"checkmark": 2}))
+    assert pr.get("choice") == {"checkmark": 2}
+
+
+def test_pipeline_result_merge():
+    a = PipelineResult(None, {"message": MonitorResult("message", {1: "x"})})
+    b = PipelineResult(None, {"message": MonitorResult("message", {2: "y"})})
+
+    merged = PipelineResult.merge(a, b)
+    assert merged.message is None
+    assert merged.get("message") == {1: "x", 2: "y"}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_early_exit(monkeypatch):
+    """A monitor reaching its limit ends the watch early with its result."""
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+    message = MagicMock()
+    message.embeds = [discord.Embed()]
+    message.edit = AsyncMock()
+    message.add_reaction = AsyncMock()
+    message.reactions = [
+        SimpleNamespace(emoji=EMOJI_FORWARD[1], count=2),
+        SimpleNamespace(emoji=EMOJI_FORWARD[2], count=2),
+    ]
+    message.channel.send = AsyncMock(return_value=message)
+    message.channel.fetch_message = AsyncMock(return_value=message)
+
+    pipeline = InteractionPipeline(ChoiceInteraction("a", "b", max_votes=2))
+    result = await pipeline.send_and_watch(message.channel, discord.Embed(), 16)
+
+    # after one tick, not the full timeout
+    assert message.channel.fetch_message.await_count == 2
+    assert result.get("choice") == {1: 1, 2: 1}
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.channelindex import ChannelIndex, ChannelNotFound
+
+
+def _channel(guild, cid: int, name: str, position: int = 0) -> MagicMock:
+    channel = MagicMock(id=cid, guild=guild, position=position)
+    channel.name = name
+    return channel
+
+
+def test_lookup_follows_events():
+    guild = MagicMock(id=1)
+    guild.name = "guild"
+    general = _channel(guild, 10, "general")
+    guild.channels = [general]
+    index = ChannelIndex()
+
+    assert index.get(guild, "general") is general
+    with pytest.raises(ChannelNotFound, match="no channel named #prompts in guild"):
+        index.get(guild, "prompts")
+
+    prompts = _channel(guild, 11, "prompts")
+    index.add(prompts)
+    assert index.get(guild, "prompts") is prompts
+
+    renamed = _channel(guild, 11, "elash-prompts")
+    index.update(prompts, renamed)
+    assert index.get(guild, "elash-prompts") is renamed
+
+    index.remove(renamed)
+    guild.channels = [general]
+    with pytest.raises(ChannelNotFound):
+        index.get(guild, "elash-prompts")
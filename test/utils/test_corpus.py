@@ -0,0 +1,56 @@
+import pytest
+
+from utils import corpus, fileio
+
+
+def test_ingest_deduplicates():
+    """Empties, exact duplicates up to case and punctuation, and near duplicates
+    are dropped, keeping the first."""
+    wedding = "What is the worst thing you could say in a speech at a wedding?"
+    texts = [
+        "Why did the  chicken\ncross the road?",
+        "",
+        "   ",
+        "why did the chicken cross the road",
+        wedding,
+        wedding.replace("the worst", "the the worst"),
+    ]
+    kept, index = corpus.ingest(texts)
+
+    assert kept == ["Why did the chicken cross the road?", wedding]
+    assert index["stats"] == {
+        "scraped": 6,
+        "empty": 2,
+        "duplicate": 1,
+        "near_duplicate": 1,
+        "kept": 2,
+    }
+
+    # signatures from the index are reused, with the same result
+    assert corpus.ingest(texts, index) == (kept, index)
+
+
+def test_ingest_keeps_one_word_changes():
+    """Long prompts differing by a single key word are different prompts."""
+    prompt = (
+        "The worst thing you could ever say to your {} on the first day of a new job"
+    )
+    texts = [
+        prompt.format("boss"),
+        prompt.format("mum"),
+        prompt.format("grandmother"),
+        prompt.format("grandfather"),
+        "Why did the chicken cross the road?",
+        "Why did the chickens cross the road?",
+    ]
+    assert corpus.ingest(texts)[0] == texts
+
+
+@pytest.mark.asyncio
+async def test_write_corpus(tmp_file):
+    path = tmp_file("data", "corpus_prompts.txt")
+
+    stats = await corpus.write(path, ["a prompt", "A prompt!", "another prompt"])
+    assert stats["kept"] == 2
+    assert await fileio.read_lines(path) == ["a prompt", "another prompt"]
+    assert (await corpus.load_index(path))["stats"] == stats
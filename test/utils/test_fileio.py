@@ -0,0 +1,88 @@
+import os
+from unittest.mock import patch
+
+import pytest
+
+from utils import fileio
+
+
+@pytest.mark.asyncio
+async def test_write_read(tmp_file):
+    """Writes land on disk and read back split on new lines."""
+    path = tmp_file("data", "fileio_lines.txt")
+
+    await fileio.write_lines(path, ["a", "b", "c"])
+    assert await fileio.read_lines(path) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_ordered(tmp_file):
+    """Queued appends to the same file are applied in order."""
+    path = tmp_file("data", "fileio_append.txt")
+    await fileio.write_text(path, "")
+
+    for i in range(20):
+        fileio.write_behind(path, f"{i},", mode="a")
+    await fileio.flush()
+
+    with open(path, "r") as f:
+        assert f.read() == "".join(f"{i}," for i in range(20))
+
+
+@pytest.mark.asyncio
+async def test_prefetch_invalidated_by_write(tmp_file):
+    """A read ahead is used once, and dropped if the file is written to."""
+    path = tmp_file("data", "fileio_prefetch.txt")
+    await fileio.write_text(path, "old")
+
+    fileio.prefetch(path)
+    assert await fileio.read_text(path) == "old"
+
+    fileio.prefetch(path)
+    await fileio.write_text(path, "new")
+    assert await fileio.read_text(path) == "new"
+
+
+@pytest.mark.asyncio
+async def test_missing_file(tmp_file):
+    with pytest.raises(FileNotFoundError):
+        await fileio.read_text(os.path.join(os.path.dirname(tmp_file("x")), "nope"))
+
+
+@pytest.mark.asyncio
+async def test_write_lines_atomic(tmp_file):
+    """A failed replace leaves the previous content and no temporary files."""
+    path = tmp_file("data", "fileio_atomic.txt")
+    await fileio.write_lines(path, ["first"])
+    version = fileio.version(path)
+
+    with patch("os.replace", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            await fileio.write_lines(path, ["second"])
+
+    assert await fileio.read_lines(path) == ["first"]
+    assert fileio.version(path) == version
+    assert not [
+        name
+        for name in os.listdir(os.path.dirname(path))
+        if name.startswith(".fileio_atomic.txt")
+    ]
+
+    await fileio.write_lines(path, ["third"])
+    assert await fileio.read_lines(path) == ["third"]
+    assert fileio.version(path) == version + 1
+
+
+@pytest.mark.asyncio
+async def test_write_lines_keeps_mode(tmp_file):
+    """Rewrites keep the permissions of the file, and new files get the default."""
+    path = tmp_file("data", "fileio_mode.txt")
+    os.chmod(path, 0o644)
+    await fileio.write_lines(path, ["rewritten"])
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+    new = os.path.join(os.path.dirname(path), "fileio_mode_new.txt")
+    umask = os.umask(0)
+    os.umask(umask)
+    await fileio.write_lines(new, ["new"])
+    assert os.stat(new).st_mode & 0o777 == 0o666 & ~umask
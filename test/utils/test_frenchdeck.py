@@ -0,0 +1,39 @@
+from utils.frenchdeck import (
+    BLANK_CARD,
+    CARD_SUIT_EMOJIS,
+    CARD_VALUE_STRING,
+    CARDS,
+    FrenchDeck,
+)
+
+
+def test_deck_complete():
+    """A deck deals each of the 52 cards exactly once before reshuffling."""
+    deck = FrenchDeck()
+    dealt = [deck.deal() for _ in range(52)]
+
+    assert len(CARDS) == 52
+    assert sorted(card.index for card in dealt) == list(range(52))
+    assert all(CARDS[card.index] is card for card in dealt)
+
+
+def test_render_table():
+    """Precomputed renders match the card template."""
+    for card in CARDS:
+        assert str(card) == BLANK_CARD.format(
+            CARD_VALUE_STRING[card.value], CARD_SUIT_EMOJIS[card.suit]
+        )
+
+
+def test_to_string():
+    """Cards are rendered side by side, face down cards included."""
+    ace, two = CARDS[0], CARDS[1]
+    assert FrenchDeck.to_string() == ""
+    assert FrenchDeck.to_string(ace, FrenchDeck.face_down(), two) == "\n".join(
+        [
+            "+---+ +---+ +---+",
+            "| A | |   | | 2 |",
+            "|[♦]| |   | |[♦]|",
+            "+---+ +---+ +---+",
+        ]
+    )
@@ -0,0 +1,57 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils.guildconfig import ConfigError, GuildConfig
+
+from games.ecards import ECards
+
+
+@pytest.mark.asyncio
+async def test_overrides(tmp_path):
+    """Overrides are per guild, game scoped ones first, and persist."""
+    path = str(tmp_path / "guild_config")
+    config = GuildConfig(path)
+    config.register_game("ECards", ECards)
+    changes = []
+    config.subscribe(lambda *change: changes.append(change))
+
+    await config.set(1, "wait_duration", 2)
+    await config.set(1, "ECards.wait_duration", 3)
+    assert config.get(1, "ECards.wait_duration", 6) == 3
+    assert config.get(1, "ELash.wait_duration", 5) == 2
+    assert config.get(2, "ELash.wait_duration", 5) == 5
+    assert changes == [(1, "wait_duration", 2), (1, "ECards.wait_duration", 3)]
+
+    with pytest.raises(ConfigError):
+        await config.set(1, "hand_size", 100)
+    with pytest.raises(ConfigError):
+        await config.set(1, "colour", 1)
+    # unknown games, and settings the game does not have, are not stored
+    with pytest.raises(ConfigError):
+        await config.set(1, "ECard.hand_size", 4)
+    with pytest.raises(ConfigError):
+        await config.set(1, "ECards.prompt_duration", 30)
+    assert config.overrides(1) == {"wait_duration": 2, "ECards.wait_duration": 3}
+
+    await config.set(1, "wait_duration", None)
+    reloaded = GuildConfig(path)
+    await reloaded.load()
+    assert reloaded.overrides(1) == {"ECards.wait_duration": 3}
+
+
+def test_game_configure():
+    """Games take the overrides of their guild, or the class defaults."""
+    interaction = MagicMock()
+    interaction.guild.id = 1
+    game = ECards(interaction)
+
+    game.configure({"hand_size": 4, "ECards.response_timeout": 10})
+    assert (game.hand_size, game.response_timeout) == (4, 10)
+
+    # only settings that may change during a game are applied live
+    game.configure({"response_timeout": 20}, live=True)
+    assert (game.hand_size, game.response_timeout) == (4, 20)
+
+    game.configure({})
+    assert (game.hand_size, game.response_timeout) == (ECards.hand_size, 31)
@@ -0,0 +1,33 @@
+import pytest
+
+from utils.leaderboard import Leaderboard, Standing
+
+
+@pytest.mark.asyncio
+async def test_scores_accumulate_and_rank(tmp_file):
+    """Rounds add up per guild, game and player, and equal scores share a rank."""
+    board = Leaderboard(tmp_file("data", "leaderboard.sqlite3"))
+    names = {1: "alice", 2: "bob", 3: "carol"}
+
+    await board.add_scores(10, "ELash", {1: 3, 2: 1, 3: 0}, names)
+    await board.add_scores(10, "ELash", {1: 0, 2: 2, 3: 1}, names)
+    # other guilds and games are separate
+    await board.add_scores(11, "ELash", {1: 100}, names)
+    await board.add_scores(10, "ECards", {3: 100}, names)
+
+    assert await board.top(10, "ELash") == [
+        Standing(1, 1, "alice", 3, 2),
+        Standing(1, 2, "bob", 3, 2),
+        Standing(3, 3, "carol", 1, 2),
+    ]
+    assert len(await board.top(10, "ELash", n=2)) == 2
+
+    await board.add_scores(10, "ELash", {3: 5}, {3: "carol2"})
+    assert await board.standing(10, "ELash", 3) == Standing(1, 3, "carol2", 6, 3)
+    assert await board.standing(10, "ELash", 2) == Standing(2, 2, "bob", 3, 2)
+    assert await board.standing(10, "ELash", 4) is None
+
+    # scores persist across connections
+    await board.close()
+    assert await board.top(11, "ELash") == [Standing(1, 1, "alice", 100, 1)]
+    await board.close()
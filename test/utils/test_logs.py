@@ -0,0 +1,55 @@
+import logging
+import queue
+
+from utils.logs import (
+    ContextFilter,
+    LoopSafeQueueHandler,
+    Payload,
+    SamplingFilter,
+    log_context,
+)
+
+
+def _record(name="games.elash", level=logging.INFO, msg="%s", args=(1,)):
+    return logging.LogRecord(name, level, __file__, 0, msg, args, None)
+
+
+def test_payload_is_bounded():
+    big = {i: list(range(1000)) for i in range(1000)}
+    assert len(str(Payload(big))) < 500
+
+
+def test_context_filter():
+    f = ContextFilter()
+
+    r = _record()
+    f.filter(r)
+    assert r.guild_id is None and r.session_id is None
+
+    with log_context(guild_id=1, session_id="abc"):
+        r = _record()
+        f.filter(r)
+    assert (r.guild_id, r.session_id) == (1, "abc")
+
+
+def test_sampling_filter():
+    f = SamplingFilter({"games": 0.0, "games.elash": 1.0})
+
+    assert f.filter(_record("games.elash"))
+    assert not f.filter(_record("games.ridethebus"))
+    assert f.filter(_record("games.ridethebus", level=logging.WARNING))
+    assert f.filter(_record("gamesx"))
+
+
+def test_queue_handler_renders_message():
+    q = queue.SimpleQueue()
+    h = LoopSafeQueueHandler(q)
+
+    args = {"a": 1}
+    h.handle(_record(msg="state %s", args=(args,)))
+    # later mutations are not seen by the writer thread
+    args["b"] = 2
+
+    r = q.get_nowait()
+    assert r.msg == "state {'a': 1}"
+    assert r.args is None
@@ -0,0 +1,31 @@
+import random
+
+from utils.emojitable import EMOJI_TABLE
+from utils.lookups import EMOJI_FORWARD, EmojiPool, random_emoji
+
+
+def test_random_emoji():
+    rng = random.Random(1)
+    for _ in range(100):
+        assert random_emoji(rng) in EMOJI_TABLE
+
+
+def test_emoji_pool_unique():
+    pool = EmojiPool(random.Random(2))
+    drawn = [pool.draw() for _ in range(len(EMOJI_TABLE))]
+
+    # every emoji exactly once
+    assert sorted(drawn) == sorted(EMOJI_TABLE)
+
+    # exhausted pools still return emojis
+    assert pool.draw() in EMOJI_TABLE
+
+
+def test_emoji_pool_reserved():
+    """Reserved emojis, e.g. the test bot's symbol, are never drawn."""
+    robot = EMOJI_FORWARD["robot"]
+    assert robot in EMOJI_TABLE
+    pool = EmojiPool(random.Random(3), reserved=[robot])
+    drawn = [pool.draw() for _ in range(len(EMOJI_TABLE) - 1)]
+    assert robot not in drawn
+    assert sorted(drawn + [robot]) == sorted(EMOJI_TABLE)
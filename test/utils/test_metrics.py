@@ -0,0 +1,51 @@
+import pytest
+
+from utils.metrics import MetricsRegistry, Histogram
+
+
+def test_histogram():
+    h = Histogram(buckets=(0.1, 1.0))
+    for v in [0.05, 0.1, 0.5, 5.0]:
+        h.observe(v)
+
+    assert h.count == 4
+    assert h.sum == pytest.approx(5.65)
+    assert list(h.cumulative()) == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert h.quantile(0.5) == 0.1
+    assert h.quantile(0.75) == 1.0
+
+
+def test_disabled_registry_records_nothing():
+    m = MetricsRegistry(enabled=False)
+    with m.timer("test_seconds", a="b"):
+        ...
+    m.inc("test_total")
+    m.observe("test_seconds", 1.0)
+
+    assert m.histograms == {}
+    assert m.counters == {}
+
+
+@pytest.mark.asyncio
+async def test_timed():
+    m = MetricsRegistry()
+
+    @m.timed("test_seconds", listener="x")
+    async def listener(value):
+        return value
+
+    assert await listener(3) == 3
+    assert m.histogram("test_seconds", listener="x").count == 1
+
+
+def test_export():
+    m = MetricsRegistry()
+    m.inc("test_total", kind='a"b')
+    m.observe("test_seconds", 0.2, call="edit")
+
+    export = m.export()
+    assert '# TYPE test_total counter\ntest_total{kind="a\\"b"} 1\n' in export
+    assert "# TYPE test_seconds histogram\n" in export
+    assert 'test_seconds_bucket{call="edit",le="0.25"} 1\n' in export
+    assert 'test_seconds_bucket{call="edit",le="0.1"} 0\n' in export
+    assert 'test_seconds_count{call="edit"} 1\n' in export
@@ -0,0 +1,37 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from utils.profiler import StackSampler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_samples_loop_thread(tmp_path):
+    """Code running on the loop thread is sampled, and written as folded stacks."""
+    sampler = StackSampler(asyncio.get_running_loop(), interval=0.001)
+    sampler.start()
+    assert sampler.running
+    _busy(0.2)
+    result = await sampler.stop()
+    assert not sampler.running
+
+    assert result.samples > 0
+    assert any("_busy" in stack for stack in result.cpu_stacks)
+    assert "Loop busy" in result.summary()
+
+    paths = result.write(str(tmp_path / "profiles" / "profile"))
+    assert [os.path.basename(p) for p in paths] == [
+        "profile.cpu.folded",
+        "profile.await.folded",
+        "profile.txt",
+    ]
+    with open(paths[0]) as f:
+        assert all(line.rsplit(" ", 1)[1].strip().isdigit() for line in f)
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from utils import fileio, promptschedule
+from utils.promptschedule import Schedule
+
+
+def test_no_repeats_within_cycle():
+    """Every entry is drawn once before any repeats, and draws from a loaded
+    schedule depend only on the state and the rng."""
+    entries = [f"prompt {i}" for i in range(20)]
+    schedule = Schedule(entries)
+    rng = random.Random(0)
+
+    first = [schedule.draw(rng) for _ in range(12)]
+    assert len(set(first)) == 12
+
+    state = schedule.state()
+    restored = Schedule.from_state(entries, state)
+    rest = [restored.draw(random.Random(1)) for _ in range(8)]
+    restored = Schedule.from_state(entries, state)
+    assert [restored.draw(random.Random(1)) for _ in range(8)] == rest
+    assert sorted(first + rest) == sorted(entries)
+
+    # a new cycle
+    assert schedule.draw(rng) in entries
+    # a state of another corpus is ignored
+    assert Schedule.from_state(entries[1:], state).draw(rng) in entries
+
+
+@pytest.mark.asyncio
+async def test_persisted_and_remapped(tmp_file):
+    path = tmp_file("data", "schedule_prompts.txt")
+    entries = ["a", "b", "c", "d"]
+
+    schedule = await promptschedule.load(path, entries)
+    drawn = {schedule.draw(), schedule.draw()}
+    schedule.save()
+    await fileio.flush()
+
+    # restarted
+    promptschedule._states.clear()
+    schedule = await promptschedule.load(path, entries)
+    assert {schedule.draw(), schedule.draw()} == set(entries) - drawn
+    schedule.save()
+    await fileio.flush()
+
+    # rescraped: used entries stay used, new ones are unused
+    await promptschedule.remap(path, entries, ["e", *entries])
+    schedule = await promptschedule.load(path, ["e", *entries])
+    assert schedule.draw() == "e"
@@ -0,0 +1,48 @@
+import json
+import random
+
+import pytest
+
+from utils.scoretable import ScoreTable
+
+
+def test_top_matches_sorting():
+    """Rank order is kept through random updates, ties in order of first score."""
+    rng = random.Random(0)
+    scores = ScoreTable()
+    reference = {}
+
+    for _ in range(2000):
+        pid = rng.randrange(20)
+        value = rng.randint(-3, 5)
+        scores[pid] += value
+        reference[pid] = reference.get(pid, 0) + value
+
+        expected = sorted(reference.items(), key=lambda t: -t[1])
+        assert scores.top() == expected
+        assert scores.top(3) == expected[:3]
+        assert scores.rank(pid) == expected.index((pid, reference[pid])) + 1
+        some = rng.sample(sorted(reference), min(5, len(reference)))
+        assert scores.top_of(some) == [t for t in expected if t[0] in some]
+
+    assert scores == reference
+    assert json.loads(json.dumps(scores)) == {str(k): v for k, v in reference.items()}
+
+
+def test_removal():
+    scores = ScoreTable()
+    scores.update({1: 5, 2: 3})
+    scores.add(3)
+    assert scores.pop(1) == 5
+    del scores[3]
+    assert scores.top() == [(2, 3)]
+    assert scores[1] == 0 and 1 not in scores
+
+    scores.update({4: 1, 5: 7})
+    assert scores.popitem() == (4, 1)
+    assert scores.top() == [(5, 7), (2, 3)]
+    scores.popitem()
+    scores.popitem()
+    assert scores.top() == [] and not scores
+    with pytest.raises(KeyError):
+        scores.popitem()
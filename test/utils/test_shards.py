@@ -0,0 +1,27 @@
+from unittest.mock import MagicMock
+
+from utils.metrics import METRICS
+from utils.shards import ShardMonitor, format_shard_ids, parse_shard_ids, shard_of
+
+from launcher import spread
+
+
+def test_shard_ids():
+    """Shard id lists round trip, and are spread evenly over processes."""
+    assert parse_shard_ids("0-3, 6,5") == [0, 1, 2, 3, 5, 6]
+    assert format_shard_ids([6, 0, 1, 2, 3, 5]) == "0-3,5-6"
+    assert spread(10, 4) == [[0, 1, 2], [3, 4, 5], [6, 7], [8, 9]]
+    assert spread(2, 4) == [[0], [1]]
+    assert shard_of(41771983423143937, 4) == (41771983423143937 >> 22) % 4
+
+
+def test_latency_sample(monkeypatch):
+    """Latency is recorded per shard, skipping shards yet to heartbeat."""
+    observed = []
+    monkeypatch.setattr(
+        METRICS, "observe", lambda name, value, **labels: observed.append(labels)
+    )
+    bot = MagicMock()
+    bot.latencies = [(0, 0.1), (1, float("nan")), (2, 0.3)]
+    ShardMonitor(bot).sample()
+    assert observed == [{"shard": 0}, {"shard": 2}]
@@ -0,0 +1,33 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from utils.usercache import UserCache
+
+
+def _user(uid):
+    user = MagicMock()
+    user.id = uid
+    return user
+
+
+@pytest.mark.asyncio
+async def test_lru_fetch():
+    """Least recently used users are dropped, and concurrent misses fetch once."""
+    bot = MagicMock()
+    bot.get_user.return_value = None
+    bot.fetch_user = AsyncMock(side_effect=_user)
+    cache = UserCache(bot, size=2)
+
+    cache.remember(_user(1))
+    cache.remember(_user(2))
+    assert cache.peek(1).id == 1
+    cache.remember(_user(3))
+    assert cache.peek(2) is None
+    assert len(cache) == 2
+
+    users = await asyncio.gather(cache.get(2), cache.get(2), cache.get(1))
+    assert [u.id for u in users] == [2, 2, 1]
+    bot.fetch_user.assert_awaited_once_with(2)
+    assert cache.peek(3) is None